@@ -0,0 +1,92 @@
+"""Backfill bug embeddings for resolved historical bugs and rebuild the similar-bug index."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.engines.bug_model import iter_batches
+from src.engines.similar_bugs import (
+    EMBEDDING_DIM,
+    SIMILAR_BUGS_DIR,
+    build_similar_bug_index,
+    embed_bugs,
+    quantize,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Embed resolved historical bugs and build the similar-bug index")
+    parser.add_argument("--output", default=str(SIMILAR_BUGS_DIR), help="Index directory")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Bugs per embedding batch")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM, help="Embedding dimension")
+    parser.add_argument("--lists", type=int, default=None, help="Inverted lists (default: sqrt(rows) for large indexes)")
+    parser.add_argument("--full", action="store_true", help="Re-embed every bug instead of only new or updated ones")
+    args = parser.parse_args()
+
+    from src.database.embeddings import bulk_upsert_embeddings, get_embeddings
+    from src.database.historical_bugs import iter_resolved_bugs
+
+    model = f"hashed-tf-{args.dim}"
+    codes: List[np.ndarray] = []
+    scales: List[np.ndarray] = []
+    bug_ids: List[str] = []
+    resolved_by: List[Optional[str]] = []
+    embedded = 0
+
+    for batch in iter_batches(iter_resolved_bugs(args.batch_size), args.batch_size):
+        batch_ids = [bug["bug_id"] for bug in batch]
+        stored = {} if args.full else get_embeddings(batch_ids, model)
+        vectors = np.zeros((len(batch), args.dim), dtype=np.float32)
+
+        # Bugs updated after their stored embedding are embedded again
+        stale = []
+        for row, bug in enumerate(batch):
+            doc = stored.get(bug["bug_id"])
+            updated_at = bug.get("updated_at")
+            if doc and len(doc["vector"]) == args.dim and not (updated_at and updated_at > doc["updated_at"]):
+                vectors[row] = doc["vector"]
+            else:
+                stale.append(row)
+
+        if stale:
+            vectors[stale] = embed_bugs([batch[row] for row in stale], args.dim)
+            bulk_upsert_embeddings([
+                {"bug_id": batch_ids[row], "vector": vectors[row].tolist(), "model": model}
+                for row in stale
+            ])
+            embedded += len(stale)
+
+        batch_codes, batch_scales = quantize(vectors)
+        codes.append(batch_codes)
+        scales.append(batch_scales)
+        bug_ids.extend(batch_ids)
+        resolved_by.extend(bug.get("resolved_by") for bug in batch)
+        print(f"Processed {len(bug_ids)} bugs ({embedded} embedded)")
+
+    if not bug_ids:
+        print("No resolved historical bugs")
+        return 0
+
+    meta = build_similar_bug_index(
+        Path(args.output),
+        np.concatenate(codes),
+        np.concatenate(scales),
+        bug_ids,
+        resolved_by,
+        {"embedded": embedded},
+        args.lists,
+    )
+    print(f"Wrote index {meta['version']} to {args.output}: {meta['rows']} bugs in {meta['lists']} lists, "
+          f"{len(meta['members'])} resolvers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
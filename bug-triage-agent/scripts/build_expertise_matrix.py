@@ -0,0 +1,86 @@
+"""Build or incrementally update the member expertise matrix from resolved and triaged history."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.engines.bug_model import iter_batches
+from src.engines.expertise import (
+    EXPERTISE_DIR,
+    HistoryEvent,
+    load_expertise_matrix,
+    save_expertise_matrix,
+    update_expertise_arrays,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Materialize member x (category, module, language) expertise")
+    parser.add_argument("--output", default=str(EXPERTISE_DIR), help="Matrix directory")
+    parser.add_argument("--full", action="store_true", help="Rebuild from all history instead of only new records")
+    args = parser.parse_args()
+
+    from src.database.historical_bugs import get_historical_bug_ids, iter_resolver_history
+    from src.database.triage_history import iter_triage_assignments
+    from src.engines.assignment import extract_bug_module
+
+    output = Path(args.output)
+    base = None
+    if not args.full:
+        try:
+            base = load_expertise_matrix(output, with_assignments=True)
+        except OSError:
+            print("No existing matrix; building from all history")
+    watermarks: Dict[str, Optional[str]] = dict(base.watermarks) if base else {}
+    latest = dict(watermarks)
+    read = {"resolved": 0, "triaged": 0}
+    skipped = 0
+
+    def track(source: str, document_id: str) -> None:
+        # Hex ObjectIds have a fixed width, so they compare in insertion order
+        read[source] += 1
+        if latest.get(source) is None or document_id > latest[source]:
+            latest[source] = document_id
+
+    def events() -> Iterator[HistoryEvent]:
+        nonlocal skipped
+        # After the first build only records inserted after the last one read are new
+        for bug in iter_resolver_history(watermarks.get("resolved")):
+            track("resolved", bug["_id"])
+            yield bug["bug_id"], "resolved", bug["resolved_by"], {
+                "category": bug.get("category"), "module": bug.get("module"), "language": bug.get("language")
+            }, bug.get("resolution_time_hours")
+        # A resolved bug counts for its resolver only, not also for whoever it was assigned to
+        for batch in iter_batches(iter_triage_assignments(watermarks.get("triaged")), 500):
+            resolved = get_historical_bug_ids(list({doc["bug_id"] for doc in batch}))
+            for doc in batch:
+                track("triaged", doc["_id"])
+                if doc["bug_id"] in resolved:
+                    skipped += 1
+                    continue
+                raw_input = doc.get("raw_input") or {}
+                yield doc["bug_id"], "assigned", doc["assignment"]["member_id"], {
+                    "category": (doc.get("classification") or {}).get("category"),
+                    "module": extract_bug_module(raw_input),
+                    "language": doc.get("language"),
+                }, None
+
+    members, values, arrays, assignments = update_expertise_arrays(base, events())
+    if base and not any(read.values()):
+        print(f"Matrix {base.version} is up to date")
+        return 0
+
+    meta = save_expertise_matrix(output, members, values, arrays, assignments, latest)
+    print(f"Wrote expertise matrix {meta['version']} to {output}: {len(members)} members, "
+          f"{read['resolved']} resolved and {read['triaged'] - skipped} triaged bugs added "
+          f"({skipped} triaged bugs already resolved)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Build the path ownership index from a repository's CODEOWNERS and git history."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.ownership_ingest import (
+    GitOwnershipAccumulator,
+    build_ownership_entries,
+    find_codeowners,
+    iter_git_log,
+    parse_codeowners,
+    to_ownership_documents,
+)
+
+
+def load_identity_map(path: str | None) -> Dict[str, str]:
+    """Map emails/handles to member_ids from team_members and an optional JSON file."""
+    identity_map: Dict[str, str] = {}
+    try:
+        from src.database.team_members import get_all_team_members
+
+        for member in get_all_team_members():
+            identity_map[member["member_id"].lower()] = member["member_id"]
+            if member.get("email"):
+                identity_map[member["email"].lower()] = member["member_id"]
+    except Exception as exc:
+        print(f"Could not load team members for identity mapping: {exc}", file=sys.stderr)
+
+    if path:
+        with open(path, "r", encoding="utf-8") as handle:
+            for identity, member_id in json.load(handle).items():
+                identity_map[identity.lower()] = member_id
+    return identity_map
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest CODEOWNERS and git history into module_ownership")
+    parser.add_argument("--repo", required=True, help="Path to a local git repository")
+    parser.add_argument("--codeowners", help="CODEOWNERS file (default: auto-detect in the repository)")
+    parser.add_argument("--since", help="Only read history after this date (git log --since)")
+    parser.add_argument("--max-depth", type=int, default=3, help="Deepest directory level to index")
+    parser.add_argument("--min-commits", type=int, default=3, help="Minimum commits for a directory to be indexed")
+    parser.add_argument("--top-owners", type=int, default=5, help="Owners kept per directory")
+    parser.add_argument("--identity-map", help="JSON file mapping emails/handles to member_ids")
+    parser.add_argument("--skip-history", action="store_true", help="Use CODEOWNERS only")
+    parser.add_argument("--dry-run", action="store_true", help="Print documents instead of writing them")
+    args = parser.parse_args()
+
+    codeowners_path = Path(args.codeowners) if args.codeowners else find_codeowners(args.repo)
+    codeowners_rules = []
+    if codeowners_path:
+        with open(codeowners_path, "r", encoding="utf-8") as handle:
+            codeowners_rules = parse_codeowners(handle)
+        print(f"Parsed {len(codeowners_rules)} CODEOWNERS rules from {codeowners_path}")
+
+    accumulator = None
+    if not args.skip_history:
+        accumulator = GitOwnershipAccumulator(max_depth=args.max_depth)
+        for author, paths in iter_git_log(args.repo, since=args.since):
+            accumulator.add_commit(author, paths)
+        print(f"Read {accumulator.commits} commits touching {len(accumulator.counts)} directories")
+
+    entries = build_ownership_entries(
+        codeowners_rules,
+        accumulator,
+        load_identity_map(args.identity_map),
+        min_commits=args.min_commits,
+        top_owners=args.top_owners,
+    )
+    documents = to_ownership_documents(entries)
+
+    if args.dry_run:
+        print(json.dumps(documents, indent=2))
+        return 0
+
+    from src.database.module_ownership import bulk_upsert_modules, delete_stale_ingested_modules
+
+    # Each run replaces the previous one: its documents are written first, then
+    # prefixes and rules that are no longer produced are deleted
+    ingest_run = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+    written = bulk_upsert_modules([{**document, "ingest_run": ingest_run} for document in documents])
+    deleted = delete_stale_ingested_modules(ingest_run)
+    print(f"Wrote {written} of {len(documents)} ownership documents, deleted {deleted} stale ones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Publish classification rule packs as a new version in classification_rules."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.engines.rule_packs import LANGUAGE_RULE_PACKS, RuleSet, builtin_rule_packs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Publish a versioned set of classification rule packs")
+    parser.add_argument(
+        "--file",
+        help='JSON file with {"packs": {name: {"categories": ..., "types": ...}}, "languages": {...}} '
+             "(default: the built-in packs)",
+    )
+    parser.add_argument("--description", help="Change description stored with the version")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and print the rule set without storing it")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        packs = data["packs"]
+        languages = data.get("languages", LANGUAGE_RULE_PACKS)
+    else:
+        packs = builtin_rule_packs()
+        languages = LANGUAGE_RULE_PACKS
+
+    # Compile before storing so a bad regex never reaches running services
+    rule_set = RuleSet(0, packs, languages)
+    print(f"Compiled {len(rule_set.packs)} packs in {rule_set.compile_seconds * 1000:.1f} ms")
+
+    if args.dry_run:
+        print(json.dumps({"packs": packs, "languages": languages}, indent=2))
+        return 0
+
+    from src.database.classification_rules import publish_rule_set
+
+    version = publish_rule_set(packs, languages, description=args.description)
+    print(f"Published rule set version {version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
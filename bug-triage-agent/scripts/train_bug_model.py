@@ -0,0 +1,105 @@
+"""Train (or incrementally retrain) the bug category/type classifier from MongoDB."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.engines.bug_model import (
+    BUG_MODEL_DIR,
+    BUG_MODEL_FEATURES,
+    HEADS,
+    NaiveBayesCounts,
+    TrainingExample,
+    TrainingLedger,
+    fit_examples,
+    iter_batches,
+    load_model_counts,
+    load_training_ledger,
+    save_model,
+)
+
+
+# Triage decisions made by these tiers are not training labels: "model" would
+# feed the classifier its own predictions, "default" means there was no signal
+UNTRAINED_TIERS = ("model", "default")
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def iter_examples(trained_until: Dict[str, Any], batch_size: int) -> Iterator[Tuple[str, TrainingExample, Optional[datetime]]]:
+    """
+    Yield (source, example, timestamp) from historical_bugs, then triage_history.
+
+    Historical bugs are edited in place, so they carry their bug ID for the
+    training ledger; triage decisions are only ever inserted.
+    """
+    from src.database.historical_bugs import iter_labeled_bugs
+    from src.database.triage_history import iter_triage_labels
+
+    for bug in iter_labeled_bugs(parse_timestamp(trained_until.get("historical_bugs")), batch_size):
+        category = bug.get("category") if isinstance(bug.get("category"), str) else None
+        bug_type = (bug.get("type") or f"{category} Issue") if category else None
+        yield "historical_bugs", (bug["_id"], bug, category, bug_type), bug.get("updated_at")
+
+    for doc in iter_triage_labels(parse_timestamp(trained_until.get("triage_history")), batch_size, UNTRAINED_TIERS):
+        classification = doc["classification"]
+        category = classification["category"]
+        bug_type = classification.get("type") or f"{category} Issue"
+        yield "triage_history", (None, doc["raw_input"], category, bug_type), doc.get("timestamp")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Train the hashed-feature naive Bayes bug classifier")
+    parser.add_argument("--output", default=str(BUG_MODEL_DIR), help="Model directory")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per training batch")
+    parser.add_argument("--features", type=int, default=BUG_MODEL_FEATURES, help="Hashed feature space for a new model")
+    parser.add_argument("--full", action="store_true", help="Retrain from scratch instead of adding new documents")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    meta: Dict[str, Any] = {"documents": 0, "trained_until": {}}
+    heads = {head: NaiveBayesCounts(args.features) for head in HEADS}
+    ledger: TrainingLedger = {}
+    if not args.full:
+        try:
+            existing, existing_meta = load_model_counts(output)
+            # A model saved without a ledger cannot replace edited bugs' counts
+            ledger = load_training_ledger(output)
+            heads, meta = existing, existing_meta
+            print(f"Continuing model {meta['version']} ({meta['documents']} documents)")
+        except OSError:
+            print("No existing model with a training ledger; training from scratch")
+
+    trained_until = dict(meta.get("trained_until") or {})
+    added = removed = 0
+    for batch in iter_batches(iter_examples(trained_until, args.batch_size), args.batch_size):
+        fitted, withdrawn = fit_examples(heads, ledger, [example for _, example, _ in batch])
+        for source, _, timestamp in batch:
+            if timestamp:
+                trained_until[source] = max(trained_until.get(source) or "", timestamp.isoformat())
+        added += fitted
+        removed += withdrawn
+        print(f"Trained on {added} documents, replaced or withdrew {removed}")
+
+    if not added and not removed:
+        print("No new documents")
+        return 0
+
+    meta["documents"] = meta.get("documents", 0) + added - removed
+    meta["trained_until"] = trained_until
+    meta = save_model(output, heads, meta, ledger)
+    print(f"Wrote model {meta['version']} to {output}: {meta['documents']} documents, "
+          f"{len(heads['category'].classes)} categories, {len(heads['type'].classes)} types")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
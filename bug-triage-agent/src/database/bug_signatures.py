@@ -0,0 +1,70 @@
+"""Bug MinHash signature database operations"""
+
+from typing import List, Dict, Any, Iterator, Optional
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+import logging
+
+from src.database.connection import get_database
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+def get_bug_signatures_collection() -> Collection:
+    """Get bug_signatures collection"""
+    db = get_database()
+    return db.bug_signatures
+
+
+def iter_bug_signatures(since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Stream stored bug signatures, oldest first
+
+    Args:
+        since: Only signatures stored after this time
+        batch_size: Documents fetched per round trip
+
+    Yields:
+        Documents with bug_id, signature, canonical_bug_id, assignment and created_at
+    """
+    collection = get_bug_signatures_collection()
+    query: Dict[str, Any] = {"signature": {"$exists": True}}
+    if since:
+        query["created_at"] = {"$gt": since}
+
+    cursor = collection.find(
+        query,
+        {"_id": 0, "bug_id": 1, "signature": 1, "canonical_bug_id": 1, "assignment": 1, "created_at": 1}
+    ).sort("created_at", 1).batch_size(batch_size)
+    yield from cursor
+
+
+def bulk_upsert_bug_signatures(signature_docs: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """
+    Create or update many bug signatures with unordered bulk writes
+
+    Args:
+        signature_docs: Partial signature documents keyed by bug_id
+        batch_size: Number of operations per bulk write
+
+    Returns:
+        Number of documents inserted or modified
+    """
+    collection = get_bug_signatures_collection()
+
+    written = 0
+    now = datetime.utcnow()
+    for start in range(0, len(signature_docs), batch_size):
+        operations = [
+            UpdateOne(
+                {"bug_id": doc["bug_id"]},
+                {"$set": {**doc, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+                upsert=True
+            )
+            for doc in signature_docs[start:start + batch_size]
+        ]
+        result = collection.bulk_write(operations, ordered=False)
+        written += result.upserted_count + result.modified_count
+
+    return written
@@ -0,0 +1,68 @@
+"""Classification rule pack database operations"""
+
+from typing import Dict, Any, Optional
+from datetime import datetime
+from pymongo.collection import Collection
+import logging
+
+from src.database.connection import get_database
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+def get_classification_rules_collection() -> Collection:
+    """Get classification_rules collection"""
+    db = get_database()
+    return db.classification_rules
+
+
+def get_newer_rule_set(version: int) -> Optional[Dict[str, Any]]:
+    """
+    Get the latest rule set if it is newer than a version
+
+    Args:
+        version: Version currently in use
+
+    Returns:
+        Rule set document or None if there is no newer version
+    """
+    collection = get_classification_rules_collection()
+    rule_set = collection.find_one({"version": {"$gt": version}}, sort=[("version", -1)])
+
+    if rule_set:
+        rule_set["_id"] = str(rule_set["_id"])
+        return rule_set
+
+    return None
+
+
+def publish_rule_set(
+    packs: Dict[str, Any],
+    languages: Dict[str, str],
+    description: Optional[str] = None
+) -> int:
+    """
+    Store a rule set as the next version
+
+    Args:
+        packs: Pack name -> {"categories": {...}, "types": {...}}
+        languages: Bug language -> pack name
+        description: Optional change description
+
+    Returns:
+        Version number assigned to the rule set
+    """
+    collection = get_classification_rules_collection()
+    latest = collection.find_one({}, {"version": 1}, sort=[("version", -1)])
+    version = (latest["version"] if latest else 0) + 1
+
+    # The unique index on version rejects a concurrent publish of the same number
+    collection.insert_one({
+        "version": version,
+        "packs": packs,
+        "languages": languages,
+        "description": description,
+        "created_at": datetime.utcnow()
+    })
+    logger.info(f"Published classification rule set version {version}")
+    return version
@@ -0,0 +1,75 @@
+"""Crash fingerprint database operations"""
+
+from typing import List, Dict, Any, Iterator, Optional
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+import logging
+
+from src.database.connection import get_database
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+def get_crash_fingerprints_collection() -> Collection:
+    """Get crash_fingerprints collection"""
+    db = get_database()
+    return db.crash_fingerprints
+
+
+def iter_crash_fingerprints(since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Stream stored crash fingerprints
+
+    Args:
+        since: Only fingerprints seen after this time
+        batch_size: Documents fetched per round trip
+
+    Yields:
+        Documents with fingerprint, count, last_bug_id and last_decision
+    """
+    collection = get_crash_fingerprints_collection()
+    query: Dict[str, Any] = {}
+    if since:
+        query["last_seen"] = {"$gt": since}
+
+    cursor = collection.find(
+        query,
+        {"_id": 0, "fingerprint": 1, "count": 1, "last_bug_id": 1, "last_decision": 1}
+    ).batch_size(batch_size)
+    yield from cursor
+
+
+def bulk_record_crash_occurrences(occurrence_docs: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """
+    Add occurrences and the latest decision to many fingerprints with unordered bulk writes
+
+    Args:
+        occurrence_docs: Documents with fingerprint, new_occurrences and
+            optional last_bug_id / last_decision
+        batch_size: Number of operations per bulk write
+
+    Returns:
+        Number of documents inserted or modified
+    """
+    collection = get_crash_fingerprints_collection()
+
+    written = 0
+    now = datetime.utcnow()
+    for start in range(0, len(occurrence_docs), batch_size):
+        operations = []
+        for doc in occurrence_docs[start:start + batch_size]:
+            fields = {key: value for key, value in doc.items() if key not in ("fingerprint", "new_occurrences")}
+            operations.append(UpdateOne(
+                {"fingerprint": doc["fingerprint"]},
+                {
+                    "$inc": {"count": doc.get("new_occurrences", 0)},
+                    "$set": {**fields, "last_seen": now},
+                    "$setOnInsert": {"first_seen": now}
+                },
+                upsert=True
+            ))
+        result = collection.bulk_write(operations, ordered=False)
+        written += result.upserted_count + result.modified_count
+
+    return written
@@ -0,0 +1,68 @@
+"""Bug embedding database operations"""
+
+from typing import List, Dict, Any
+from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+import logging
+
+from src.database.connection import get_database
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+def get_embeddings_collection() -> Collection:
+    """Get embeddings collection"""
+    db = get_database()
+    return db.embeddings
+
+
+def get_embeddings(bug_ids: List[str], model: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Get stored embeddings of one embedding model for many bugs
+
+    Args:
+        bug_ids: Bug IDs
+        model: Embedding model name
+
+    Returns:
+        Dictionary mapping bug_id to embedding document
+    """
+    collection = get_embeddings_collection()
+
+    documents = collection.find(
+        {"bug_id": {"$in": bug_ids}, "model": model},
+        {"_id": 0, "bug_id": 1, "vector": 1, "updated_at": 1}
+    )
+
+    return {doc["bug_id"]: doc for doc in documents}
+
+
+def bulk_upsert_embeddings(embedding_docs: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """
+    Create or update many embeddings with unordered bulk writes
+
+    Args:
+        embedding_docs: Embedding documents keyed by bug_id
+        batch_size: Number of operations per bulk write
+
+    Returns:
+        Number of documents inserted or modified
+    """
+    collection = get_embeddings_collection()
+
+    written = 0
+    now = datetime.utcnow()
+    for start in range(0, len(embedding_docs), batch_size):
+        operations = [
+            UpdateOne(
+                {"bug_id": doc["bug_id"]},
+                {"$set": {**doc, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+                upsert=True
+            )
+            for doc in embedding_docs[start:start + batch_size]
+        ]
+        result = collection.bulk_write(operations, ordered=False)
+        written += result.upserted_count + result.modified_count
+
+    return written
@@ -0,0 +1,155 @@
+"""Historical bug database operations"""
+
+from typing import Dict, Any, Iterator, List, Optional, Set
+from datetime import datetime
+from bson import ObjectId
+from pymongo.collection import Collection
+import logging
+
+from src.database.connection import get_database
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+def get_historical_bugs_collection() -> Collection:
+    """Get historical_bugs collection"""
+    db = get_database()
+    return db.historical_bugs
+
+
+def iter_labeled_bugs(since: Optional[datetime] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """
+    Stream historical bugs that have a category, oldest update first
+
+    With since, every bug updated at or after it is streamed, including bugs
+    whose category was removed, so a retrain can replace or withdraw what it
+    counted for them before. Bugs updated exactly at since are read again;
+    the training ledger skips them when they are unchanged.
+
+    Args:
+        since: Only bugs updated at or after this time
+        batch_size: Documents fetched per round trip
+
+    Yields:
+        Historical bug documents
+    """
+    collection = get_historical_bugs_collection()
+    query: Dict[str, Any] = {"category": {"$type": "string"}}
+    if since:
+        query = {"updated_at": {"$gte": since}}
+
+    cursor = collection.find(query).sort("updated_at", 1).batch_size(batch_size)
+    for bug in cursor:
+        bug["_id"] = str(bug["_id"])
+        yield bug
+
+
+def iter_resolved_bugs(batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """
+    Stream historical bugs that have a resolver or a recorded resolution
+
+    Args:
+        batch_size: Documents fetched per round trip
+
+    Yields:
+        Historical bug documents
+    """
+    collection = get_historical_bugs_collection()
+    query = {"$or": [{"resolved_by": {"$type": "string"}}, {"resolution": {"$type": "string"}}]}
+
+    cursor = collection.find(query).sort("bug_id", 1).batch_size(batch_size)
+    for bug in cursor:
+        bug["_id"] = str(bug["_id"])
+        yield bug
+
+
+def iter_resolution_times(since: Optional[datetime] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the resolution times of historical bugs, oldest update first
+
+    Args:
+        since: Only bugs updated at or after this time, so bugs resolved or
+            backfilled later are streamed even if their date_resolved is old
+            (bugs without updated_at are only streamed when since is None)
+        batch_size: Documents fetched per round trip
+
+    Yields:
+        Documents with bug_id, category, type, module, language,
+        resolution_time_hours and updated_at
+    """
+    collection = get_historical_bugs_collection()
+    query: Dict[str, Any] = {"resolution_time_hours": {"$gt": 0}}
+    if since:
+        query["updated_at"] = {"$gte": since}
+
+    cursor = collection.find(
+        query,
+        {
+            "_id": 0, "bug_id": 1, "category": 1, "type": 1, "module": 1, "language": 1,
+            "resolution_time_hours": 1, "updated_at": 1
+        }
+    ).sort("updated_at", 1).batch_size(batch_size)
+    yield from cursor
+
+
+def iter_resolver_history(after: Optional[str] = None, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+    """
+    Stream historical bugs with a resolver in insertion order
+
+    Args:
+        after: Only bugs inserted after the one with this _id (hex string);
+            ObjectIds grow with insertion time, so backfilled bugs are
+            streamed even if they were resolved long ago
+        batch_size: Documents fetched per round trip
+
+    Yields:
+        Documents with _id (hex string), bug_id, resolved_by, category,
+        module, language and resolution_time_hours
+    """
+    collection = get_historical_bugs_collection()
+    query: Dict[str, Any] = {"resolved_by": {"$type": "string"}}
+    if after:
+        query["_id"] = {"$gt": ObjectId(after)}
+
+    cursor = collection.find(
+        query,
+        {"bug_id": 1, "resolved_by": 1, "category": 1, "module": 1, "language": 1, "resolution_time_hours": 1}
+    ).sort("_id", 1).batch_size(batch_size)
+    for bug in cursor:
+        bug["_id"] = str(bug["_id"])
+        yield bug
+
+
+def get_bug_resolutions(bug_ids: List[str]) -> Dict[str, str]:
+    """
+    Get the recorded resolutions of many historical bugs
+
+    Args:
+        bug_ids: Bug IDs
+
+    Returns:
+        Dictionary mapping bug_id to resolution text (bugs without one are omitted)
+    """
+    collection = get_historical_bugs_collection()
+
+    documents = collection.find(
+        {"bug_id": {"$in": bug_ids}, "resolution": {"$type": "string"}},
+        {"_id": 0, "bug_id": 1, "resolution": 1}
+    )
+
+    return {doc["bug_id"]: doc["resolution"] for doc in documents}
+
+
+def get_historical_bug_ids(bug_ids: List[str]) -> Set[str]:
+    """
+    Get which of the given bugs are in historical_bugs
+
+    Args:
+        bug_ids: Bug IDs
+
+    Returns:
+        The bug IDs that have a historical record
+    """
+    collection = get_historical_bugs_collection()
+    documents = collection.find({"bug_id": {"$in": bug_ids}}, {"_id": 0, "bug_id": 1})
+    return {doc["bug_id"] for doc in documents}
@@ -31,6 +31,8 @@ def create_indexes():
     db.historical_bugs.create_index("language")
     db.historical_bugs.create_index("module")
     db.historical_bugs.create_index("resolved_by")
+    db.historical_bugs.create_index("date_resolved")
+    db.historical_bugs.create_index("updated_at")
     
     # severity_priority_rules indexes
     db.severity_priority_rules.create_index("severity")
@@ -44,6 +46,17 @@ def create_indexes():
     # embeddings indexes
     db.embeddings.create_index("bug_id", unique=True)
     
+    # bug_signatures indexes
+    db.bug_signatures.create_index("bug_id", unique=True)
+    db.bug_signatures.create_index("created_at")
+    
+    # crash_fingerprints indexes
+    db.crash_fingerprints.create_index("fingerprint", unique=True)
+    db.crash_fingerprints.create_index("last_seen")
+    
+    # sketch_snapshots indexes
+    db.sketch_snapshots.create_index("name", unique=True)
+    
     # routing_rules indexes
     db.routing_rules.create_index("rule_type")
     db.routing_rules.create_index("conditions.languages")
@@ -55,6 +68,10 @@ def create_indexes():
     db.triage_history.create_index("assignment.member_id")
     db.triage_history.create_index("language")
     db.triage_history.create_index("classification.category")
+    db.triage_history.create_index([("bug_id", 1), ("content_hash", 1)])
+    
+    # classification_rules indexes
+    db.classification_rules.create_index("version", unique=True)
     
     logger.info("Created all database indexes")
 
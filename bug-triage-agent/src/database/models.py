@@ -34,6 +34,13 @@ class ModuleOwnership(BaseModel):
     id: Optional[str] = Field(default=None, alias="_id")
     module_name: str
     owners: List[str] = Field(default_factory=list)
+    path_patterns: List[str] = Field(default_factory=list)  # e.g. "src/payments/", "**/billing"
+    path_prefix: Optional[str] = None  # Set on documents written by ownership ingestion
+    owner_weights: List[Dict[str, Any]] = Field(default_factory=list)  # [{member_id, weight}]
+    rule_order: Optional[int] = None  # CODEOWNERS rules only; the last matching rule wins
+    anchored: Optional[bool] = None  # CODEOWNERS rules only; False matches at any depth
+    source: Optional[str] = None
+    ingest_run: Optional[str] = None  # Ingestion run that wrote the document
     tech_stack: List[str] = Field(default_factory=list)
     primary_language: Optional[str] = None
     risk_level: Optional[str] = None
@@ -58,6 +65,7 @@ class HistoricalBug(BaseModel):
     language: Optional[str] = None
     file_type: Optional[str] = None
     resolved_by: Optional[str] = None
+    resolution: Optional[str] = None
     resolution_time_hours: Optional[float] = None
     date_resolved: Optional[datetime] = None
     input_signature: Dict[str, Any] = Field(default_factory=dict)
@@ -113,6 +121,50 @@ class Embedding(BaseModel):
     model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
 
+# Collection: bug_signatures
+class BugSignature(BaseModel):
+    """Bug MinHash signature document model (near-duplicate detection)"""
+    id: Optional[str] = Field(default=None, alias="_id")
+    bug_id: str
+    signature: List[int] = Field(default_factory=list)
+    canonical_bug_id: Optional[str] = None
+    assignment: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+
+# Collection: crash_fingerprints
+class CrashFingerprint(BaseModel):
+    """Crash fingerprint document model (occurrences of one stack fingerprint)"""
+    id: Optional[str] = Field(default=None, alias="_id")
+    fingerprint: str
+    count: int = 0
+    last_bug_id: Optional[str] = None
+    last_decision: Optional[Dict[str, Any]] = None
+    first_seen: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    last_seen: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+
+# Collection: sketch_snapshots
+class SketchSnapshot(BaseModel):
+    """Sketch snapshot document model (counters of one in-memory sketch)"""
+    id: Optional[str] = Field(default=None, alias="_id")
+    name: str
+    width: int
+    depth: int
+    half_life_seconds: float
+    landmark: float
+    table: bytes
+    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+
 # Collection: routing_rules
 class RoutingRule(BaseModel):
     """Routing rule document model"""
@@ -128,6 +180,19 @@ class RoutingRule(BaseModel):
     model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
 
+# Collection: classification_rules
+class ClassificationRuleSet(BaseModel):
+    """Classification rule set document model (one document per version)"""
+    id: Optional[str] = Field(default=None, alias="_id")
+    version: int
+    packs: Dict[str, Dict[str, Dict[str, List[str]]]] = Field(default_factory=dict)  # pack -> {categories, types}
+    languages: Dict[str, str] = Field(default_factory=dict)  # bug language -> pack
+    description: Optional[str] = None
+    created_at: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+
 # Collection: triage_history
 class TriageHistory(BaseModel):
     """Triage history document model"""
@@ -142,6 +207,8 @@ class TriageHistory(BaseModel):
     confidence_scores: Dict[str, float] = Field(default_factory=dict)
     raw_input: Optional[Dict[str, Any]] = None
     raw_output: Optional[Dict[str, Any]] = None
+    content_hash: Optional[str] = None
+    versions: Optional[Dict[str, str]] = None
     timestamp: Optional[datetime] = Field(default_factory=datetime.utcnow)
     feedback: Optional[Dict[str, Any]] = None
     
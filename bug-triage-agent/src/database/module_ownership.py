@@ -2,6 +2,7 @@
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from pymongo import UpdateOne
 from pymongo.collection import Collection
 import logging
 
@@ -37,6 +38,23 @@ def get_module_owners(module: str) -> List[str]:
     return []
 
 
+def get_module_path_patterns() -> List[Dict[str, Any]]:
+    """
+    Get modules that declare file path patterns
+    
+    Returns:
+        List of documents with module_name, path_patterns and owners
+    """
+    collection = get_module_ownership_collection()
+    
+    modules = collection.find(
+        {"path_patterns": {"$exists": True, "$ne": []}},
+        {"_id": 0, "module_name": 1, "path_patterns": 1, "owners": 1}
+    )
+    
+    return list(modules)
+
+
 def get_modules_by_language(language: str) -> List[str]:
     """
     Get list of modules that use a specific language
@@ -115,4 +133,69 @@ def create_or_update_module(module_data: Dict[str, Any]) -> str:
     return module_name
 
 
+def get_ownership_weight_documents() -> List[Dict[str, Any]]:
+    """
+    Get path prefix ownership weights written by ownership ingestion
+    
+    Returns:
+        List of documents with path_prefix and owner_weights, plus
+        rule_order and anchored for CODEOWNERS rules
+    """
+    collection = get_module_ownership_collection()
+    
+    documents = collection.find(
+        {"owner_weights": {"$exists": True}},
+        {"_id": 0, "path_prefix": 1, "owner_weights": 1, "rule_order": 1, "anchored": 1}
+    )
+    
+    return list(documents)
+
 
+def bulk_upsert_modules(module_docs: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """
+    Create or update many modules with unordered bulk writes
+    
+    Args:
+        module_docs: Module documents keyed by module_name
+        batch_size: Number of operations per bulk write
+    
+    Returns:
+        Number of documents inserted or modified
+    """
+    collection = get_module_ownership_collection()
+    
+    written = 0
+    now = datetime.utcnow()
+    for start in range(0, len(module_docs), batch_size):
+        operations = [
+            UpdateOne(
+                {"module_name": doc["module_name"]},
+                {"$set": {**doc, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+                upsert=True
+            )
+            for doc in module_docs[start:start + batch_size]
+        ]
+        result = collection.bulk_write(operations, ordered=False)
+        written += result.upserted_count + result.modified_count
+    
+    logger.info(f"Bulk upserted {written} modules")
+    return written
+
+
+
+def delete_stale_ingested_modules(ingest_run: str) -> int:
+    """
+    Delete ownership documents written by earlier ingestion runs
+    
+    Args:
+        ingest_run: ingest_run of the documents to keep
+    
+    Returns:
+        Number of documents deleted
+    """
+    collection = get_module_ownership_collection()
+    
+    result = collection.delete_many({"source": "ingest", "ingest_run": {"$ne": ingest_run}})
+    
+    logger.info(f"Deleted {result.deleted_count} stale ingested modules")
+    return result.deleted_count
@@ -5,6 +5,7 @@ from pymongo.collection import Collection
 import logging
 
 from src.database.connection import get_database
+from src.utils.module_resolver import get_module_resolver
 
 logger = logging.getLogger("bug_triage_agent")
 
@@ -28,10 +29,10 @@ def get_applicable_routing_rules(bug: Dict[str, Any]) -> List[Dict[str, Any]]:
     collection = get_routing_rules_collection()
     
     language = bug.get("language", "")
-    code_context = bug.get("code_context", {})
+    code_context = bug.get("code_context") or {}
     file_path = code_context.get("file_path", "")
-    metadata = bug.get("metadata", {})
-    tags = metadata.get("tags", [])
+    metadata = bug.get("metadata") or {}
+    tags = metadata.get("tags") or []
     
     # Build query
     query = {"$or": []}
@@ -45,11 +46,9 @@ def get_applicable_routing_rules(bug: Dict[str, Any]) -> List[Dict[str, Any]]:
         query["$or"].append({"conditions.tags": {"$in": tags}})
     
     # Check module conditions (from file path)
-    if file_path:
-        if '/auth' in file_path.lower():
-            query["$or"].append({"conditions.modules": {"$in": ["auth"]}})
-        elif '/api' in file_path.lower():
-            query["$or"].append({"conditions.modules": {"$in": ["api"]}})
+    module = get_module_resolver().resolve(file_path)
+    if module:
+        query["$or"].append({"conditions.modules": {"$in": [module]}})
     
     # If no conditions, return empty
     if not query["$or"]:
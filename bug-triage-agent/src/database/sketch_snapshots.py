@@ -0,0 +1,54 @@
+"""Sketch snapshot database operations"""
+
+from typing import Dict, Any, Optional
+from datetime import datetime
+from bson import Binary
+from pymongo.collection import Collection
+import logging
+
+from src.database.connection import get_database
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+def get_sketch_snapshots_collection() -> Collection:
+    """Get sketch_snapshots collection"""
+    db = get_database()
+    return db.sketch_snapshots
+
+
+def get_sketch_snapshot(name: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the latest snapshot of a named sketch
+
+    Args:
+        name: Sketch name
+
+    Returns:
+        Snapshot state (as produced by the sketch's to_state) or None
+    """
+    collection = get_sketch_snapshots_collection()
+    doc = collection.find_one({"name": name}, {"_id": 0, "name": 0, "created_at": 0, "updated_at": 0})
+    if doc and "table" in doc:
+        doc["table"] = bytes(doc["table"])
+    return doc
+
+
+def save_sketch_snapshot(name: str, state: Dict[str, Any]) -> None:
+    """
+    Replace the snapshot of a named sketch
+
+    Args:
+        name: Sketch name
+        state: Sketch state with the counter table as bytes
+    """
+    collection = get_sketch_snapshots_collection()
+    now = datetime.utcnow()
+    collection.update_one(
+        {"name": name},
+        {
+            "$set": {**state, "table": Binary(state["table"]), "updated_at": now},
+            "$setOnInsert": {"created_at": now}
+        },
+        upsert=True
+    )
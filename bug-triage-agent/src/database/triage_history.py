@@ -1,7 +1,8 @@
 """Triage history database operations"""
 
-from typing import Dict, Any
-from datetime import datetime, UTC
+from typing import Dict, Any, Iterable, Iterator, Optional, Tuple
+from datetime import datetime, timedelta, UTC
+from bson import ObjectId
 from pymongo.collection import Collection
 import logging
 
@@ -21,7 +22,10 @@ def save_triage_history(
     classification: Dict[str, Any],
     priority: Dict[str, Any],
     assignment: Dict[str, Any],
-    fix_suggestion: Dict[str, Any]
+    fix_suggestion: Dict[str, Any],
+    content_hash: Optional[str] = None,
+    versions: Optional[Dict[str, str]] = None,
+    raw_output: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Save triage decision to history
@@ -32,6 +36,9 @@ def save_triage_history(
         priority: Priority result
         assignment: Assignment result
         fix_suggestion: Fix suggestion result
+        content_hash: Optional hash of the bug content, for result reuse
+        versions: Optional roster/rules versions the result was computed with
+        raw_output: Optional triage result as returned to the supervisor
     
     Returns:
         True if saved successfully
@@ -46,7 +53,8 @@ def save_triage_history(
             "classification": {
                 "category": classification.get("category"),
                 "type": classification.get("type"),
-                "root_cause": classification.get("root_cause")
+                "root_cause": classification.get("root_cause"),
+                "tier": classification.get("tier")
             },
             "priority": {
                 "level": priority.get("level"),
@@ -55,7 +63,8 @@ def save_triage_history(
             "assignment": {
                 "member_id": assignment.get("assigned_to_member_id"),
                 "name": assignment.get("assigned_to_name"),
-                "confidence": assignment.get("confidence")
+                "confidence": assignment.get("confidence"),
+                "alternates": assignment.get("alternates")
             },
             "suggested_fix": {
                 "approach": fix_suggestion.get("approach"),
@@ -67,6 +76,9 @@ def save_triage_history(
                 "assignee_confidence": assignment.get("confidence", 0.5)
             },
             "raw_input": bug,
+            "content_hash": content_hash,
+            "versions": versions,
+            "raw_output": raw_output,
             "timestamp": datetime.now(UTC)
         }
         
@@ -80,3 +92,115 @@ def save_triage_history(
 
 
 
+
+
+def iter_triage_keys(batch_size: int = 1000) -> Iterator[Tuple[str, str]]:
+    """
+    Stream the (bug_id, content_hash) pairs of reusable history documents
+    
+    Args:
+        batch_size: Documents fetched per round trip
+    
+    Yields:
+        Tuples of (bug_id, content_hash)
+    """
+    collection = get_triage_history_collection()
+    cursor = collection.find(
+        {"content_hash": {"$type": "string"}},
+        {"_id": 0, "bug_id": 1, "content_hash": 1}
+    ).batch_size(batch_size)
+    for doc in cursor:
+        yield doc["bug_id"], doc["content_hash"]
+
+
+def find_reusable_triage(
+    bug_id: str,
+    content_hash: str,
+    versions: Dict[str, str],
+    max_age_hours: float
+) -> Optional[Dict[str, Any]]:
+    """
+    Get the latest stored triage result for unchanged bug content
+    
+    Args:
+        bug_id: Bug ID
+        content_hash: Hash of the bug content
+        versions: Roster/rules versions the result must have been computed with
+        max_age_hours: Ignore results older than this
+    
+    Returns:
+        Stored raw_output or None
+    """
+    collection = get_triage_history_collection()
+    query = {
+        "bug_id": bug_id,
+        "content_hash": content_hash,
+        "raw_output": {"$ne": None},
+        "timestamp": {"$gte": datetime.now(UTC) - timedelta(hours=max_age_hours)}
+    }
+    for name, version in versions.items():
+        query[f"versions.{name}"] = version
+    
+    doc = collection.find_one(query, {"raw_output": 1}, sort=[("timestamp", -1)])
+    return doc["raw_output"] if doc else None
+
+
+def iter_triage_labels(
+    since: Optional[datetime] = None,
+    batch_size: int = 500,
+    exclude_tiers: Iterable[str] = ("model",)
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream triage decisions with their input, oldest first
+    
+    Decisions saved before the classification tier was recorded are skipped,
+    since they may have come from the model itself.
+    
+    Args:
+        since: Only decisions made after this time
+        batch_size: Documents fetched per round trip
+        exclude_tiers: Skip decisions made by these classification tiers
+    
+    Yields:
+        Documents with raw_input, classification and timestamp
+    """
+    collection = get_triage_history_collection()
+    query: Dict[str, Any] = {
+        "raw_input": {"$type": "object"},
+        "classification.category": {"$type": "string"},
+        "classification.tier": {"$type": "string", "$nin": list(exclude_tiers)}
+    }
+    if since:
+        query["timestamp"] = {"$gt": since}
+    
+    cursor = collection.find(
+        query,
+        {"_id": 0, "raw_input": 1, "classification": 1, "timestamp": 1}
+    ).sort("timestamp", 1).batch_size(batch_size)
+    yield from cursor
+
+
+def iter_triage_assignments(after: Optional[str] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """
+    Stream triage decisions that assigned a member in insertion order
+    
+    Args:
+        after: Only decisions inserted after the one with this _id (hex string)
+        batch_size: Documents fetched per round trip
+    
+    Yields:
+        Documents with _id (hex string), bug_id, assignment.member_id,
+        classification.category, language and raw_input
+    """
+    collection = get_triage_history_collection()
+    query: Dict[str, Any] = {"assignment.member_id": {"$type": "string"}}
+    if after:
+        query["_id"] = {"$gt": ObjectId(after)}
+    
+    cursor = collection.find(
+        query,
+        {"bug_id": 1, "assignment.member_id": 1, "classification.category": 1, "language": 1, "raw_input": 1}
+    ).sort("_id", 1).batch_size(batch_size)
+    for doc in cursor:
+        doc["_id"] = str(doc["_id"])
+        yield doc
@@ -1,20 +1,42 @@
 """Team member assignment engine"""
 
 from typing import Dict, Any, List, Optional
+import heapq
 import logging
+import os
 
 from src.database.team_members import query_by_language, query_by_skills, query_by_module, get_team_member
 from src.database.module_ownership import get_module_owners
 from src.database.developer_load import get_developer_load, get_all_developer_loads
 from src.database.routing_rules import get_applicable_routing_rules
+from src.engines.expertise import get_expertise_matrix
+from src.engines.similar_bugs import SimilarBug, find_similar_bugs, similar_resolver_weights
+from src.utils.keyword_matcher import get_roster_keyword_index
+from src.utils.module_resolver import get_module_resolver
+from src.utils.ownership_index import get_ownership_index
+from src.utils.stack_trace_parser import get_module_votes
 
 logger = logging.getLogger("bug_triage_agent")
 
+# Number of runner-up members returned as alternates with each assignment
+ASSIGNMENT_ALTERNATES = int(os.getenv("ASSIGNMENT_ALTERNATES", "3"))
+
+# Score added for a member owning 100% of a path in the ingested ownership index
+OWNERSHIP_INDEX_WEIGHT = 2.0
+
+# Score added for a member who resolved all of a bug's similar historical bugs
+SIMILAR_RESOLVER_WEIGHT = 2.0
+
+# Score added per unit of expertise matrix score (up to 1.5 each for the bug's
+# module and language)
+EXPERTISE_WEIGHT = 1.0
+
 
 def assign_bug(
     bug: Dict[str, Any],
     team_profiles: List[Dict[str, Any]],
-    db_available: bool = True
+    db_available: bool = True,
+    similar_bugs: Optional[List[SimilarBug]] = None
 ) -> Dict[str, Any]:
     """
     Assign bug to most suitable team member
@@ -23,6 +45,7 @@ def assign_bug(
         bug: Bug input dictionary
         team_profiles: List of team member profiles
         db_available: Whether database is available
+        similar_bugs: Precomputed similar resolved bugs; searched here if None
     
     Returns:
         Assignment dictionary with member_id, name, and confidence
@@ -35,51 +58,100 @@ def assign_bug(
     
     # Get bug requirements
     language = bug.get("language")
-    code_context = bug.get("code_context") or {}
-    file_path = code_context.get("file_path", "") if code_context else ""
     
-    # Extract module from file path
-    module = extract_module_from_path(file_path)
+    # Extract module from file path, falling back to the stack trace
+    module = extract_bug_module(bug, use_database=db_available)
+    
+    # Scan the description once for every framework/domain keyword in the roster
+    roster_index = get_roster_keyword_index([get_profile_keywords(profile) for profile in team_profiles])
+    keyword_hits = roster_index.member_hits(bug.get("description", "").lower())
+    
+    # Members who resolved the nearest similar historical bugs
+    if similar_bugs is None:
+        similar_bugs = find_similar_bugs(bug)
+    resolver_weights = similar_resolver_weights(similar_bugs)
     
     # Score each team member
     candidates = []
-    for profile in team_profiles:
-        score = calculate_assignment_score(bug, profile, language, module, db_available)
+    for profile, hits in zip(team_profiles, keyword_hits):
+        score = calculate_assignment_score(
+            bug, profile, language, module, db_available,
+            keyword_hits=hits, resolver_weights=resolver_weights
+        )
         if score > 0:
             candidates.append({
                 "profile": profile,
                 "score": score
             })
     
-    # Sort by score (highest first)
-    candidates.sort(key=lambda x: x["score"], reverse=True)
-    
     if not candidates:
-        # Fallback: assign to first available member
-        if team_profiles:
-            return {
-                "assigned_to_member_id": team_profiles[0]["member_id"],
-                "assigned_to_name": team_profiles[0]["name"],
-                "confidence": 0.3
-            }
-        return {
-            "assigned_to_member_id": "unknown",
-            "assigned_to_name": "Unknown",
-            "confidence": 0.0
-        }
+        return get_fallback_assignment(team_profiles)
     
-    # Get best candidate
-    best_candidate = candidates[0]
-    profile = best_candidate["profile"]
-    score = best_candidate["score"]
+    # Partial selection of the best candidate plus alternates (ties keep roster order)
+    top_candidates = heapq.nlargest(ASSIGNMENT_ALTERNATES + 1, candidates, key=lambda x: x["score"])
     
+    return build_assignment(
+        top_candidates[0]["profile"],
+        top_candidates[0]["score"],
+        [(candidate["profile"], candidate["score"]) for candidate in top_candidates[1:]]
+    )
+
+
+def build_assignment(
+    profile: Dict[str, Any],
+    score: float,
+    alternates: Optional[List[Any]] = None
+) -> Dict[str, Any]:
+    """
+    Build an assignment dictionary for a scored team member
+    
+    Args:
+        profile: Chosen team member profile
+        score: Assignment score of the chosen member
+        alternates: Optional (profile, score) pairs of runner-up members, best first
+    
+    Returns:
+        Assignment dictionary with member_id, name, confidence and alternates
+    """
     # Normalize score to confidence (0.0-1.0)
     confidence = min(score / 10.0, 1.0)  # Assuming max score is around 10
     
     return {
         "assigned_to_member_id": profile["member_id"],
         "assigned_to_name": profile["name"],
-        "confidence": confidence
+        "confidence": confidence,
+        "alternates": [
+            {
+                "member_id": alternate["member_id"],
+                "name": alternate["name"],
+                "score": alternate_score,
+                "confidence": min(alternate_score / 10.0, 1.0)
+            }
+            for alternate, alternate_score in (alternates or [])
+        ]
+    }
+
+
+def get_fallback_assignment(team_profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Assignment used when no team member scores above zero
+    
+    Args:
+        team_profiles: List of team member profiles
+    
+    Returns:
+        Assignment to the first available member, or an unknown assignee
+    """
+    if team_profiles:
+        return {
+            "assigned_to_member_id": team_profiles[0]["member_id"],
+            "assigned_to_name": team_profiles[0]["name"],
+            "confidence": 0.3
+        }
+    return {
+        "assigned_to_member_id": "unknown",
+        "assigned_to_name": "Unknown",
+        "confidence": 0.0
     }
 
 
@@ -88,7 +160,9 @@ def calculate_assignment_score(
     profile: Dict[str, Any],
     language: Optional[str],
     module: Optional[str],
-    db_available: bool
+    db_available: bool,
+    keyword_hits: Optional[int] = None,
+    resolver_weights: Optional[Dict[str, float]] = None
 ) -> float:
     """
     Calculate assignment score for a team member
@@ -99,6 +173,10 @@ def calculate_assignment_score(
         language: Bug language
         module: Bug module
         db_available: Whether database is available
+        keyword_hits: Precomputed count of the member's keywords found in the
+            description (from the roster keyword index); scanned here if None
+        resolver_weights: Precomputed share of the bug's similar historical
+            bugs resolved by each member; searched here if None
     
     Returns:
         Assignment score (higher is better)
@@ -107,13 +185,7 @@ def calculate_assignment_score(
     
     # Language matching (highest weight)
     if language:
-        skills = profile.get("skills", {})
-        if isinstance(skills, dict):
-            languages = skills.get("languages", [])
-        elif isinstance(skills, list):
-            languages = skills
-        else:
-            languages = []
+        languages = get_profile_languages(profile)
         
         if language.lower() in [lang.lower() for lang in languages]:
             score += 5.0  # Strong match
@@ -124,7 +196,7 @@ def calculate_assignment_score(
                 if db_member:
                     db_skills = db_member.get("skills", {})
                     if isinstance(db_skills, dict):
-                        db_languages = db_skills.get("languages", [])
+                        db_languages = db_skills.get("languages") or []
                         if language.lower() in [lang.lower() for lang in db_languages]:
                             score += 4.0
             except Exception:
@@ -133,42 +205,28 @@ def calculate_assignment_score(
     
     # Module ownership (high weight)
     if module:
-        modules_owned = profile.get("modules_owned", [])
+        modules_owned = profile.get("modules_owned") or []
         if module in modules_owned:
             score += 4.0
         elif db_available:
-            # Check database for module ownership
+            # Check database for module ownership (team_members, then module_ownership owners)
+            db_modules = []
             try:
                 db_member = get_team_member(profile["member_id"])
                 if db_member:
-                    db_modules = db_member.get("modules_owned", [])
-                    if module in db_modules:
-                        score += 3.5
+                    db_modules = db_member.get("modules_owned") or []
             except Exception:
                 # Database unavailable, skip database lookup
                 pass
+            if module in db_modules or profile["member_id"] in get_module_resolver().get_owners(module):
+                score += 3.5
     
     # Skills matching (medium weight)
-    skills = profile.get("skills", {})
-    if isinstance(skills, dict):
-        frameworks = skills.get("frameworks") or []
-        domains = skills.get("domains") or []
-    elif isinstance(skills, list):
-        frameworks = []
-        domains = skills or []
-    else:
-        frameworks = []
-        domains = []
-    
     # Check bug description for skill keywords
-    description = bug.get("description", "").lower()
-    for framework in (frameworks or []):
-        if framework.lower() in description:
-            score += 1.0
-    
-    for domain in (domains or []):
-        if domain.lower() in description:
-            score += 1.0
+    if keyword_hits is None:
+        description = bug.get("description", "").lower()
+        keyword_hits = sum(1 for keyword in get_profile_keywords(profile) if keyword in description)
+    score += float(keyword_hits)
     
     # Workload consideration (negative weight)
     current_load = profile.get("current_load")
@@ -192,39 +250,105 @@ def calculate_assignment_score(
             # Database unavailable, skip workload check
             pass
     
+    # Path ownership from CODEOWNERS and git history (medium weight)
+    if db_available:
+        code_context = bug.get("code_context") or {}
+        file_path = code_context.get("file_path", "") if code_context else ""
+        score += OWNERSHIP_INDEX_WEIGHT * get_ownership_index().owner_weight(file_path, profile["member_id"])
+    
+    # Resolvers of the most similar historical bugs (medium weight)
+    if resolver_weights is None:
+        resolver_weights = similar_resolver_weights(find_similar_bugs(bug))
+    score += SIMILAR_RESOLVER_WEIGHT * resolver_weights.get(profile["member_id"], 0.0)
+    
+    # Module and language history from the materialized expertise matrix (medium weight)
+    expertise_matrix = get_expertise_matrix()
+    if expertise_matrix is not None:
+        score += EXPERTISE_WEIGHT * expertise_matrix.expertise(profile["member_id"], module, language)
+    
     return max(score, 0.0)  # Ensure non-negative
 
 
-def extract_module_from_path(file_path: str) -> Optional[str]:
+def get_profile_languages(profile: Dict[str, Any]) -> List[str]:
+    """
+    Get the languages listed in a team profile
+    
+    Args:
+        profile: Team member profile
+    
+    Returns:
+        List of language names (structured or legacy skills format)
+    """
+    skills = profile.get("skills", {})
+    if isinstance(skills, dict):
+        return skills.get("languages", []) or []
+    elif isinstance(skills, list):
+        return skills
+    return []
+
+
+def get_profile_keywords(profile: Dict[str, Any]) -> List[str]:
+    """
+    Get lowercased framework and domain keywords for a team profile
+    
+    Each keyword is worth one point when it appears in the bug description,
+    so duplicates are kept.
+    
+    Args:
+        profile: Team member profile
+    
+    Returns:
+        List of lowercased keywords (frameworks first, then domains)
+    """
+    skills = profile.get("skills", {})
+    if isinstance(skills, dict):
+        frameworks = skills.get("frameworks") or []
+        domains = skills.get("domains") or []
+    elif isinstance(skills, list):
+        frameworks = []
+        domains = skills or []
+    else:
+        frameworks = []
+        domains = []
+    
+    return [keyword.lower() for keyword in list(frameworks) + list(domains)]
+
+
+def extract_module_from_path(file_path: str, use_database: bool = True) -> Optional[str]:
     """
     Extract module name from file path
     
     Args:
         file_path: File path string
+        use_database: Whether to use path patterns stored in module_ownership
+    
+    Returns:
+        Module name or None
+    """
+    return get_module_resolver(use_database).resolve(file_path)
+
+
+def extract_bug_module(bug: Dict[str, Any], use_database: bool = True) -> Optional[str]:
+    """
+    Extract the module a bug belongs to
+    
+    The code_context file path wins; without one, the module with the most
+    weighted stack frame votes is used.
+    
+    Args:
+        bug: Bug input dictionary
+        use_database: Whether to use path patterns stored in module_ownership
     
     Returns:
         Module name or None
     """
-    if not file_path:
-        return None
-    
-    path_lower = file_path.lower()
-    
-    # Common module patterns
-    if '/auth' in path_lower or '\\auth' in path_lower:
-        return "auth"
-    elif '/api' in path_lower or '\\api' in path_lower:
-        return "api"
-    elif '/db' in path_lower or '/database' in path_lower:
-        return "database"
-    elif '/ui' in path_lower or '/frontend' in path_lower:
-        return "ui"
-    elif '/user' in path_lower:
-        return "user"
-    elif '/payment' in path_lower:
-        return "payment"
+    code_context = bug.get("code_context") or {}
+    module = extract_module_from_path(code_context.get("file_path", ""), use_database=use_database)
+    if module:
+        return module
     
-    return None
+    votes = get_module_votes(bug.get("stack_trace"), use_database=use_database)
+    return next(iter(votes), None)
 
 
 def check_routing_rules(bug: Dict[str, Any]) -> Optional[Dict[str, Any]]:
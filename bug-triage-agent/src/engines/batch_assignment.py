@@ -0,0 +1,403 @@
+"""Vectorized batch assignment engine
+
+Builds a bugs x members score matrix with NumPy so that large batches are
+scored in one pass instead of a Python double loop. Every term mirrors
+``calculate_assignment_score`` in ``src.engines.assignment``.
+"""
+
+from typing import Dict, Any, List, Optional
+import heapq
+import logging
+import math
+import os
+import time
+
+import numpy as np
+
+from src.engines.assignment import (
+    ASSIGNMENT_ALTERNATES,
+    EXPERTISE_WEIGHT,
+    OWNERSHIP_INDEX_WEIGHT,
+    SIMILAR_RESOLVER_WEIGHT,
+    build_assignment,
+    check_routing_rules,
+    extract_bug_module,
+    get_fallback_assignment,
+    get_profile_keywords,
+    get_profile_languages,
+)
+from src.database.team_members import get_team_member
+from src.database.developer_load import get_developer_load
+from src.engines.expertise import get_expertise_matrix
+from src.engines.similar_bugs import SimilarBug, find_similar_bugs_batch, similar_resolver_weights
+from src.utils.keyword_matcher import get_roster_keyword_index
+from src.utils.module_resolver import get_module_resolver
+from src.utils.ownership_index import get_ownership_index
+
+logger = logging.getLogger("bug_triage_agent")
+
+# Open bugs at which a member has no headroom left in balanced mode
+BALANCED_MAX_OPEN_BUGS = int(os.getenv("BALANCED_MAX_OPEN_BUGS", "10"))
+
+# Wall-clock budget for the balanced solver; remaining bugs fall back to argmax
+BALANCED_TIME_BUDGET_SECONDS = float(os.getenv("BALANCED_TIME_BUDGET_SECONDS", "2.0"))
+
+
+def build_score_matrix(
+    bugs: List[Dict[str, Any]],
+    team_profiles: List[Dict[str, Any]],
+    db_available: bool = True,
+    member_data: Optional[List[Dict[str, Any]]] = None,
+    similar_bugs: Optional[List[List[SimilarBug]]] = None
+) -> np.ndarray:
+    """
+    Score every bug against every team member in one vectorized pass
+
+    Args:
+        bugs: List of bug input dictionaries
+        team_profiles: List of team member profiles
+        db_available: Whether database is available
+        member_data: Per-member database data, loaded here if None
+        similar_bugs: Similar resolved bugs per bug, searched here if None
+
+    Returns:
+        Float array of shape (len(bugs), len(team_profiles))
+    """
+    bug_count = len(bugs)
+    member_count = len(team_profiles)
+    scores = np.zeros((bug_count, member_count), dtype=np.float64)
+    if bug_count == 0 or member_count == 0:
+        return scores
+
+    if member_data is None:
+        member_data = [_load_member_data(profile, db_available) for profile in team_profiles]
+
+    # Language matching (highest weight)
+    bug_languages = [(bug.get("language") or None) for bug in bugs]
+    language_index = _intern([lang.lower() for lang in bug_languages if lang])
+    if language_index:
+        profile_match = np.zeros((len(language_index) + 1, member_count), dtype=bool)
+        db_match = np.zeros_like(profile_match)
+        for column, (profile, data) in enumerate(zip(team_profiles, member_data)):
+            for lang in get_profile_languages(profile):
+                row = language_index.get(lang.lower())
+                if row is not None:
+                    profile_match[row, column] = True
+            for lang in data["db_languages"]:
+                row = language_index.get(lang)
+                if row is not None:
+                    db_match[row, column] = True
+        rows = np.array(
+            [language_index[lang.lower()] if lang else len(language_index) for lang in bug_languages]
+        )
+        scores += np.where(profile_match[rows], 5.0, np.where(db_match[rows], 4.0, 0.0))
+
+    # Module ownership (high weight)
+    bug_modules = [extract_bug_module(bug, use_database=db_available) for bug in bugs]
+    module_index = _intern([module for module in bug_modules if module])
+    if module_index:
+        profile_match = np.zeros((len(module_index) + 1, member_count), dtype=bool)
+        db_match = np.zeros_like(profile_match)
+        resolver = get_module_resolver() if db_available else None
+        for column, (profile, data) in enumerate(zip(team_profiles, member_data)):
+            for module in profile.get("modules_owned") or []:
+                row = module_index.get(module)
+                if row is not None:
+                    profile_match[row, column] = True
+            for module in data["db_modules"]:
+                row = module_index.get(module)
+                if row is not None:
+                    db_match[row, column] = True
+            if resolver is not None:
+                for module, row in module_index.items():
+                    if profile["member_id"] in resolver.get_owners(module):
+                        db_match[row, column] = True
+        rows = np.array(
+            [module_index[module] if module else len(module_index) for module in bug_modules]
+        )
+        scores += np.where(profile_match[rows], 4.0, np.where(db_match[rows], 3.5, 0.0))
+
+    # Skills matching (medium weight): hits (B x K) @ keyword counts (K x M)
+    roster_index = get_roster_keyword_index([get_profile_keywords(profile) for profile in team_profiles])
+    if roster_index.vocabulary:
+        keyword_counts = np.zeros((len(roster_index.vocabulary), member_count), dtype=np.float64)
+        for column, keyword_ids in enumerate(roster_index.member_keyword_ids):
+            for keyword_id in keyword_ids:
+                keyword_counts[keyword_id, column] += 1.0
+        hits = np.zeros((bug_count, len(roster_index.vocabulary)), dtype=np.float64)
+        for row, bug in enumerate(bugs):
+            found = roster_index.keyword_hits(bug.get("description", "").lower())
+            hits[row, list(found)] = 1.0
+        scores += hits @ keyword_counts
+
+    # Workload consideration (per-member constant, broadcast over bugs)
+    load_adjustment = np.zeros(member_count, dtype=np.float64)
+    for column, (profile, data) in enumerate(zip(team_profiles, member_data)):
+        current_load = profile.get("current_load")
+        if current_load is not None:
+            if current_load > 5:
+                load_adjustment[column] -= 1.0
+            elif current_load == 0:
+                load_adjustment[column] += 0.5
+        load_score = data["load_score"]
+        if load_score is not None:
+            if load_score > 0.8:
+                load_adjustment[column] -= 1.5
+            elif load_score < 0.3:
+                load_adjustment[column] += 0.5
+    scores += load_adjustment
+
+    member_columns: Dict[str, List[int]] = {}
+    for column, profile in enumerate(team_profiles):
+        member_columns.setdefault(profile["member_id"], []).append(column)
+
+    # Path ownership from CODEOWNERS and git history (medium weight)
+    if db_available:
+        ownership_index = get_ownership_index()
+        ownership = np.zeros((bug_count, member_count), dtype=np.float64)
+        for row, bug in enumerate(bugs):
+            for member_id, weight in ownership_index.owner_weights(_bug_file_path(bug)).items():
+                ownership[row, member_columns.get(member_id, [])] = weight
+        scores += OWNERSHIP_INDEX_WEIGHT * ownership
+
+    # Resolvers of the most similar historical bugs (medium weight)
+    if similar_bugs is None:
+        similar_bugs = find_similar_bugs_batch(bugs)
+    resolvers = np.zeros((bug_count, member_count), dtype=np.float64)
+    for row, bug_similar_bugs in enumerate(similar_bugs):
+        for member_id, weight in similar_resolver_weights(bug_similar_bugs).items():
+            resolvers[row, member_columns.get(member_id, [])] = weight
+    scores += SIMILAR_RESOLVER_WEIGHT * resolvers
+
+    # Module and language history from the materialized expertise matrix (medium weight)
+    expertise_matrix = get_expertise_matrix()
+    if expertise_matrix is not None:
+        member_ids = [profile["member_id"] for profile in team_profiles]
+        scores += EXPERTISE_WEIGHT * expertise_matrix.score_matrix(bug_modules, bug_languages, member_ids)
+
+    return np.maximum(scores, 0.0)
+
+
+def assign_bugs_batch(
+    bugs: List[Dict[str, Any]],
+    team_profiles: List[Dict[str, Any]],
+    db_available: bool = True,
+    similar_bugs: Optional[List[List[SimilarBug]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Assign a batch of bugs using the vectorized score matrix
+
+    Produces the same assignment as calling ``assign_bug`` for each bug.
+
+    Args:
+        bugs: List of bug input dictionaries
+        team_profiles: List of team member profiles
+        db_available: Whether database is available
+        similar_bugs: Similar resolved bugs per bug, searched here if None
+
+    Returns:
+        List of assignment dictionaries, one per bug
+    """
+    scores = build_score_matrix(bugs, team_profiles, db_available, similar_bugs=similar_bugs)
+    rankings = _rank_members(scores)
+
+    assignments = []
+    for row, bug in enumerate(bugs):
+        if db_available:
+            routing_rule = check_routing_rules(bug)
+            if routing_rule:
+                assignments.append(routing_rule)
+                continue
+
+        if not team_profiles or scores[row, rankings[row, 0]] <= 0:
+            assignments.append(get_fallback_assignment(team_profiles))
+            continue
+
+        assignments.append(_member_assignment(team_profiles, scores, rankings, row, rankings[row, 0]))
+
+    return assignments
+
+
+def assign_bugs_balanced(
+    bugs: List[Dict[str, Any]],
+    team_profiles: List[Dict[str, Any]],
+    db_available: bool = True,
+    time_budget_seconds: Optional[float] = None,
+    similar_bugs: Optional[List[List[SimilarBug]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Assign a batch of bugs jointly so no member is overloaded
+
+    Greedy with a priority queue: bugs are popped in order of their best
+    remaining score and take their highest-scoring member that still has
+    capacity. Capacities split the batch in proportion to each member's
+    headroom, derived from ``current_load`` and ``current_load_score``.
+
+    Args:
+        bugs: List of bug input dictionaries
+        team_profiles: List of team member profiles
+        db_available: Whether database is available
+        time_budget_seconds: Solver time budget (defaults to BALANCED_TIME_BUDGET_SECONDS)
+        similar_bugs: Similar resolved bugs per bug, searched here if None
+
+    Returns:
+        List of assignment dictionaries, one per bug
+    """
+    deadline = time.perf_counter() + (
+        BALANCED_TIME_BUDGET_SECONDS if time_budget_seconds is None else time_budget_seconds
+    )
+    if not team_profiles:
+        return [get_fallback_assignment(team_profiles) for _ in bugs]
+
+    member_data = [_load_member_data(profile, db_available) for profile in team_profiles]
+    scores = build_score_matrix(bugs, team_profiles, db_available, member_data, similar_bugs)
+    member_columns = {profile["member_id"]: column for column, profile in enumerate(team_profiles)}
+
+    assignments: List[Optional[Dict[str, Any]]] = [None] * len(bugs)
+    assigned_counts = np.zeros(len(team_profiles), dtype=np.int64)
+
+    # Routing rules take precedence and still count against capacity
+    open_rows = []
+    for row, bug in enumerate(bugs):
+        routing_rule = check_routing_rules(bug) if db_available else None
+        if routing_rule:
+            assignments[row] = routing_rule
+            column = member_columns.get(routing_rule["assigned_to_member_id"])
+            if column is not None:
+                assigned_counts[column] += 1
+        else:
+            open_rows.append(row)
+
+    capacities = compute_member_capacities(team_profiles, member_data, len(bugs)) - assigned_counts
+
+    rankings = _rank_members(scores)
+    heap = [(-scores[row, rankings[row, 0]], row, 0) for row in open_rows if scores[row, rankings[row, 0]] > 0]
+    heapq.heapify(heap)
+
+    budget_exceeded = False
+    while heap:
+        if time.perf_counter() > deadline:
+            budget_exceeded = True
+            break
+        negative_score, row, rank = heapq.heappop(heap)
+        column = rankings[row, rank]
+        if capacities[column] > 0:
+            capacities[column] -= 1
+            assignments[row] = _member_assignment(team_profiles, scores, rankings, row, column)
+            continue
+        rank += 1
+        if rank < len(team_profiles) and scores[row, rankings[row, rank]] > 0:
+            heapq.heappush(heap, (-scores[row, rankings[row, rank]], row, rank))
+
+    if budget_exceeded:
+        logger.warning("Balanced assignment exceeded its time budget; remaining bugs use best-match assignment")
+
+    # Bugs with no scoring member, no remaining capacity or past the budget
+    for row in open_rows:
+        if assignments[row] is None:
+            if scores[row, rankings[row, 0]] > 0:
+                assignments[row] = _member_assignment(team_profiles, scores, rankings, row, rankings[row, 0])
+            else:
+                assignments[row] = get_fallback_assignment(team_profiles)
+
+    return assignments
+
+
+def compute_member_capacities(
+    team_profiles: List[Dict[str, Any]],
+    member_data: List[Dict[str, Any]],
+    batch_size: int
+) -> np.ndarray:
+    """
+    Split a batch across members in proportion to their headroom
+
+    Headroom is ``BALANCED_MAX_OPEN_BUGS - current_load`` scaled by
+    ``1 - current_load_score`` when a developer_load record exists.
+
+    Args:
+        team_profiles: List of team member profiles
+        member_data: Per-member database data
+        batch_size: Number of bugs in the batch
+
+    Returns:
+        Integer capacity per member; capacities sum to at least batch_size
+    """
+    headroom = np.zeros(len(team_profiles), dtype=np.float64)
+    for column, (profile, data) in enumerate(zip(team_profiles, member_data)):
+        current_load = profile.get("current_load") or 0
+        member_headroom = max(BALANCED_MAX_OPEN_BUGS - current_load, 0)
+        if data["load_score"] is not None:
+            member_headroom *= max(1.0 - data["load_score"], 0.0)
+        headroom[column] = member_headroom
+
+    if headroom.sum() <= 0:
+        headroom[:] = 1.0
+    shares = headroom / headroom.sum() * batch_size
+    return np.array([math.ceil(share) for share in shares], dtype=np.int64)
+
+
+def _rank_members(scores: np.ndarray) -> np.ndarray:
+    """Order each bug's members by descending score (ties keep roster order)"""
+    return np.argsort(-scores, axis=1, kind="stable")
+
+
+def _member_assignment(
+    team_profiles: List[Dict[str, Any]],
+    scores: np.ndarray,
+    rankings: np.ndarray,
+    row: int,
+    column: int
+) -> Dict[str, Any]:
+    """Build the assignment of bug ``row`` to member ``column`` with its top alternates"""
+    alternates = []
+    for alternate_column in rankings[row]:
+        if len(alternates) == ASSIGNMENT_ALTERNATES or scores[row, alternate_column] <= 0:
+            break
+        if alternate_column != column:
+            alternates.append((team_profiles[alternate_column], float(scores[row, alternate_column])))
+    return build_assignment(team_profiles[column], float(scores[row, column]), alternates)
+
+
+def _load_member_data(profile: Dict[str, Any], db_available: bool) -> Dict[str, Any]:
+    """Fetch per-member database data once instead of once per bug"""
+    data = {"db_languages": [], "db_modules": [], "load_score": None}
+    if not db_available:
+        return data
+
+    try:
+        db_member = get_team_member(profile["member_id"])
+        if db_member:
+            db_skills = db_member.get("skills", {})
+            if isinstance(db_skills, dict):
+                data["db_languages"] = [lang.lower() for lang in db_skills.get("languages") or []]
+            data["db_modules"] = db_member.get("modules_owned") or []
+    except Exception:
+        # Database unavailable, skip database lookup
+        pass
+
+    try:
+        load_data = get_developer_load(profile["member_id"])
+        if load_data:
+            load_score = load_data.get("current_load_score", 0.5)
+            if isinstance(load_score, (int, float)):
+                data["load_score"] = float(load_score)
+    except Exception:
+        # Database unavailable, skip workload check
+        pass
+
+    return data
+
+
+def _bug_file_path(bug: Dict[str, Any]) -> str:
+    """Get the code_context file path of a bug, or an empty string"""
+    code_context = bug.get("code_context") or {}
+    return code_context.get("file_path", "") if code_context else ""
+
+
+def _intern(values: List[str]) -> Dict[str, int]:
+    """Map each distinct value to a dense index in first-seen order"""
+    index: Dict[str, int] = {}
+    for value in values:
+        if value not in index:
+            index[value] = len(index)
+    return index
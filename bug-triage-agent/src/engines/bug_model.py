@@ -0,0 +1,495 @@
+"""Hashed-feature naive Bayes classifier for bug category and type"""
+
+import logging
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.artifacts import (
+    artifact_path, new_artifact_version, publish_artifact, read_artifact_meta, save_array
+)
+from src.utils.log_parser import reduce_logs
+from src.utils.refresh_cache import RefreshingLoader
+
+logger = logging.getLogger("bug_triage_agent")
+
+# Directory holding the trained model artifacts (see scripts/train_bug_model.py)
+BUG_MODEL_DIR = Path(os.getenv("BUG_MODEL_DIR", str(Path(__file__).resolve().parents[2] / "artifacts" / "bug_model")))
+
+# Size of the hashed feature space for new models
+BUG_MODEL_FEATURES = int(os.getenv("BUG_MODEL_FEATURES", str(2 ** 18)))
+
+# Predictions below this probability fall back to the rule engine
+BUG_MODEL_MIN_CONFIDENCE = float(os.getenv("BUG_MODEL_MIN_CONFIDENCE", "0.6"))
+
+# Seconds between checks for a retrained model
+BUG_MODEL_REFRESH_SECONDS = int(os.getenv("BUG_MODEL_REFRESH_SECONDS", "300"))
+
+# Laplace smoothing for feature likelihoods
+SMOOTHING_ALPHA = 0.1
+
+# Tokens read per bug, so huge logs cost no more than a page of text
+MAX_TOKENS_PER_BUG = 4000
+
+HEADS = ("category", "type")
+
+_TOKEN = re.compile(r"[a-z][a-z0-9_]+")
+
+
+# bug_id -> (feature indices, feature values, category, type) of each counted
+# historical bug, so an edited or relabelled bug replaces its earlier counts
+TrainingLedger = Dict[str, Tuple[np.ndarray, np.ndarray, str, str]]
+
+# A training example: (bug_id or None, bug, category or None to withdraw, type)
+TrainingExample = Tuple[Optional[str], Dict[str, Any], Optional[str], Optional[str]]
+
+
+class ModelPrediction(NamedTuple):
+    """Model labels for one bug; type is None when it is below the confidence threshold"""
+    category: str
+    type: Optional[str]
+    confidence: float
+    version: str
+
+
+def featurize_text(text: str, n_features: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash unigrams and bigrams of text into a sparse feature vector
+
+    Args:
+        text: Bug text
+        n_features: Size of the hashed feature space
+
+    Returns:
+        Tuple of (sorted unique feature indices, log(1 + count) weights)
+    """
+    tokens = _TOKEN.findall(text.lower())[:MAX_TOKENS_PER_BUG]
+    grams = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+    if not grams:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    hashed = np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.int64, count=len(grams))
+    indices, counts = np.unique(hashed % n_features, return_counts=True)
+    return indices, np.log1p(counts).astype(np.float32)
+
+
+def bug_text(bug: Dict[str, Any]) -> str:
+    """
+    Text the model reads from a bug: title, description, stack trace, the
+    error records of its logs and the code file path
+
+    Args:
+        bug: Bug dictionary
+
+    Returns:
+        Combined text
+    """
+    code_context = bug.get("code_context") or {}
+    logs = reduce_logs(bug["logs"]) if bug.get("logs") else None
+    fields = [bug.get("title"), bug.get("description"), bug.get("stack_trace"), logs, code_context.get("file_path")]
+    return " ".join(field for field in fields if field)
+
+
+class NaiveBayesCounts:
+    """
+    Per-class feature counts for multinomial naive Bayes. A model is
+    retrained incrementally by loading its counts and fitting the new
+    documents; a changed document is first fitted with weight -1 under its
+    old row and labels (see fit_examples).
+    """
+
+    def __init__(
+        self,
+        n_features: int,
+        classes: Optional[List[str]] = None,
+        feature_counts: Optional[np.ndarray] = None,
+        class_counts: Optional[np.ndarray] = None
+    ) -> None:
+        self.n_features = n_features
+        self.classes: List[str] = list(classes or [])
+        self.feature_counts = (
+            np.array(feature_counts, dtype=np.float32) if feature_counts is not None
+            else np.zeros((len(self.classes), n_features), dtype=np.float32)
+        )
+        self.class_counts = (
+            np.array(class_counts, dtype=np.float64) if class_counts is not None
+            else np.zeros(len(self.classes), dtype=np.float64)
+        )
+        self._class_ids = {label: i for i, label in enumerate(self.classes)}
+
+    def _class_id(self, label: str) -> int:
+        class_id = self._class_ids.get(label)
+        if class_id is None:
+            class_id = len(self.classes)
+            self.classes.append(label)
+            self._class_ids[label] = class_id
+            self.feature_counts = np.vstack([self.feature_counts, np.zeros((1, self.n_features), dtype=np.float32)])
+            self.class_counts = np.append(self.class_counts, 0.0)
+        return class_id
+
+    def partial_fit(
+        self,
+        rows: Sequence[Tuple[np.ndarray, np.ndarray]],
+        labels: Sequence[str],
+        weight: float = 1.0
+    ) -> None:
+        """
+        Add a batch of documents
+
+        Args:
+            rows: Sparse feature vectors from featurize_text
+            labels: Class label per row
+            weight: 1.0 to add the documents, -1.0 to remove previously added ones
+        """
+        if not rows:
+            return
+        class_ids = np.array([self._class_id(label) for label in labels], dtype=np.int64)
+        lengths = np.array([len(indices) for indices, _ in rows], dtype=np.int64)
+        np.add.at(self.class_counts, class_ids, weight)
+        if lengths.sum():
+            np.add.at(
+                self.feature_counts,
+                (np.repeat(class_ids, lengths), np.concatenate([indices for indices, _ in rows])),
+                np.concatenate([values for _, values in rows]) * np.float32(weight)
+            )
+
+    def drop_empty_classes(self) -> None:
+        """Remove classes whose documents have all been removed."""
+        keep = self.class_counts > 0
+        if keep.all():
+            return
+        self.classes = [label for label, kept in zip(self.classes, keep) if kept]
+        self.feature_counts = self.feature_counts[keep]
+        self.class_counts = self.class_counts[keep]
+        self._class_ids = {label: i for i, label in enumerate(self.classes)}
+
+    def log_probabilities(self, alpha: float = SMOOTHING_ALPHA) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute smoothed log likelihoods and log priors
+
+        Returns:
+            Tuple of (feature-major log likelihoods of shape (n_features,
+            n_classes), log priors of shape (n_classes,))
+        """
+        smoothed = self.feature_counts.astype(np.float64) + alpha
+        log_likelihood = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        log_prior = np.log(self.class_counts + 1.0) - np.log(self.class_counts.sum() + len(self.classes))
+        # Feature-major so a bug's features are contiguous rows
+        return np.ascontiguousarray(log_likelihood.T, dtype=np.float32), log_prior.astype(np.float32)
+
+
+class ModelHead:
+    """Inference side of one label head, backed by (memory-mapped) arrays"""
+
+    def __init__(self, classes: List[str], log_likelihood: np.ndarray, log_prior: np.ndarray) -> None:
+        self.classes = classes
+        self.log_likelihood = log_likelihood
+        self.log_prior = log_prior
+
+    def predict(self, rows: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Tuple[List[str], np.ndarray]:
+        """
+        Score a batch of sparse feature vectors
+
+        All rows are gathered into one CSR-style batch: each bug's score is
+        the dot product of its feature weights with the likelihood rows of
+        its features, summed with np.add.reduceat.
+
+        Args:
+            rows: Sparse feature vectors from featurize_text
+
+        Returns:
+            Tuple of (best label per row, its posterior probability)
+        """
+        lengths = np.array([len(indices) for indices, _ in rows], dtype=np.int64)
+        scores = np.tile(self.log_prior.astype(np.float64), (len(rows), 1))
+        nonempty = lengths > 0
+        if nonempty.any():
+            indices = np.concatenate([indices for indices, _ in rows])
+            values = np.concatenate([values for _, values in rows]).astype(np.float64)
+            contributions = self.log_likelihood[indices] * values[:, None]
+            starts = (np.cumsum(lengths) - lengths)[nonempty]
+            scores[nonempty] += np.add.reduceat(contributions, starts, axis=0)
+
+        scores -= scores.max(axis=1, keepdims=True)
+        probabilities = np.exp(scores)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        return [self.classes[i] for i in best], probabilities[np.arange(len(rows)), best]
+
+
+class BugModel:
+    """Trained category and type heads loaded from a model directory"""
+
+    def __init__(self, version: str, n_features: int, heads: Dict[str, ModelHead]) -> None:
+        self.version = version
+        self.n_features = n_features
+        self.heads = heads
+
+    def predict(self, bugs: Sequence[Dict[str, Any]], min_confidence: float = BUG_MODEL_MIN_CONFIDENCE) -> List[Optional[ModelPrediction]]:
+        """
+        Predict category and type for a batch of bugs
+
+        Args:
+            bugs: Bug dictionaries
+            min_confidence: Minimum category probability to return a prediction
+
+        Returns:
+            ModelPrediction per bug, or None where the model is not confident
+        """
+        if not bugs:
+            return []
+        rows = [featurize_text(bug_text(bug), self.n_features) for bug in bugs]
+        categories, category_probabilities = self.heads["category"].predict(rows)
+        types, type_probabilities = self.heads["type"].predict(rows)
+
+        predictions: List[Optional[ModelPrediction]] = []
+        for category, category_probability, bug_type, type_probability in zip(
+            categories, category_probabilities, types, type_probabilities
+        ):
+            if category_probability < min_confidence:
+                predictions.append(None)
+                continue
+            predictions.append(ModelPrediction(
+                category,
+                bug_type if type_probability >= min_confidence else None,
+                round(float(category_probability), 4),
+                self.version
+            ))
+        return predictions
+
+
+def fit_examples(
+    heads: Dict[str, NaiveBayesCounts],
+    ledger: TrainingLedger,
+    examples: Iterable[TrainingExample]
+) -> Tuple[int, int]:
+    """
+    Fit a batch of labeled bugs, replacing earlier counts of the same bug
+
+    Examples with a bug ID are recorded in the ledger. When the bug was
+    counted before with a different row or labels, its ledgered counts are
+    subtracted first, so each bug counts once under its current text and
+    labels. An example without a category only withdraws the bug's counts.
+
+    Args:
+        heads: Counts per head, updated in place
+        ledger: Training ledger, updated in place
+        examples: (bug_id or None, bug, category or None, type) tuples
+
+    Returns:
+        Tuple of (documents fitted, documents withdrawn)
+    """
+    n_features = next(iter(heads.values())).n_features
+    fitted: List[Tuple[np.ndarray, np.ndarray, str, str]] = []
+    withdrawn: List[Tuple[np.ndarray, np.ndarray, str, str]] = []
+    for bug_id, bug, category, bug_type in examples:
+        counted = (*featurize_text(bug_text(bug), n_features), category, bug_type) if category else None
+        if bug_id is not None:
+            previous = ledger.pop(bug_id, None)
+            if previous is not None and counted is not None and previous[2:] == counted[2:] \
+                    and np.array_equal(previous[0], counted[0]) and np.array_equal(previous[1], counted[1]):
+                ledger[bug_id] = previous
+                continue
+            if previous is not None:
+                withdrawn.append(previous)
+            if counted is not None:
+                ledger[bug_id] = counted
+        if counted is not None:
+            fitted.append(counted)
+
+    for documents, weight in ((withdrawn, -1.0), (fitted, 1.0)):
+        rows = [(indices, values) for indices, values, _, _ in documents]
+        heads["category"].partial_fit(rows, [category for _, _, category, _ in documents], weight)
+        heads["type"].partial_fit(rows, [bug_type for _, _, _, bug_type in documents], weight)
+    if withdrawn:
+        for counts in heads.values():
+            counts.drop_empty_classes()
+    return len(fitted), len(withdrawn)
+
+
+def _artifact(directory: Path, meta: Dict[str, Any], head: str, name: str) -> Path:
+    return artifact_path(directory, meta, f"{head}_{name}.npy")
+
+
+def save_model(
+    directory: Path,
+    heads: Dict[str, NaiveBayesCounts],
+    meta: Dict[str, Any],
+    ledger: Optional[TrainingLedger] = None
+) -> Dict[str, Any]:
+    """
+    Write model artifacts: counts and training ledger (for retraining),
+    inference arrays and meta.json
+
+    The arrays go into a new per-version subdirectory and meta.json, which
+    names it and holds the class labels, is replaced last, so a load never
+    pairs one build's classes with another's likelihoods.
+
+    Args:
+        directory: Model directory
+        heads: Trained counts per head
+        meta: Extra metadata (documents, trained_until, ...)
+        ledger: Training ledger of the counted historical bugs
+
+    Returns:
+        The written metadata
+    """
+    meta = dict(meta)
+    meta["version"] = new_artifact_version(directory)
+    meta["classes"] = {}
+    for head, counts in heads.items():
+        log_likelihood, log_prior = counts.log_probabilities()
+        save_array(_artifact(directory, meta, head, "feature_counts"), counts.feature_counts)
+        save_array(_artifact(directory, meta, head, "class_counts"), counts.class_counts)
+        save_array(_artifact(directory, meta, head, "log_likelihood"), log_likelihood)
+        save_array(_artifact(directory, meta, head, "log_prior"), log_prior)
+        meta["classes"][head] = counts.classes
+    meta["n_features"] = next(iter(heads.values())).n_features
+
+    ledger = ledger or {}
+    bug_ids = list(ledger)
+    counted = [ledger[bug_id] for bug_id in bug_ids]
+    save_array(artifact_path(directory, meta, "ledger_bug_ids.npy"), np.array(bug_ids, dtype=str))
+    save_array(artifact_path(directory, meta, "ledger_labels.npy"), np.array(
+        [(category, bug_type) for _, _, category, bug_type in counted], dtype=str
+    ).reshape(len(counted), 2))
+    save_array(artifact_path(directory, meta, "ledger_offsets.npy"), np.concatenate(
+        [[0], np.cumsum([len(indices) for indices, _, _, _ in counted], dtype=np.int64)]
+    ).astype(np.int64))
+    save_array(artifact_path(directory, meta, "ledger_indices.npy"), np.concatenate(
+        [np.empty(0, dtype=np.int64)] + [indices for indices, _, _, _ in counted]
+    ))
+    save_array(artifact_path(directory, meta, "ledger_values.npy"), np.concatenate(
+        [np.empty(0, dtype=np.float32)] + [values for _, values, _, _ in counted]
+    ))
+    publish_artifact(directory, meta)
+    return meta
+
+
+def load_model_counts(directory: Path) -> Tuple[Dict[str, NaiveBayesCounts], Dict[str, Any]]:
+    """
+    Load the training counts of an existing model for incremental retraining
+
+    Args:
+        directory: Model directory
+
+    Returns:
+        Tuple of (counts per head, metadata)
+
+    Raises:
+        OSError: If the model does not exist
+    """
+    meta = read_artifact_meta(directory)
+    heads = {
+        head: NaiveBayesCounts(
+            meta["n_features"],
+            meta["classes"][head],
+            np.load(_artifact(directory, meta, head, "feature_counts")),
+            np.load(_artifact(directory, meta, head, "class_counts"))
+        )
+        for head in HEADS
+    }
+    return heads, meta
+
+
+def load_training_ledger(directory: Path) -> TrainingLedger:
+    """
+    Load the training ledger of an existing model for incremental retraining
+
+    Args:
+        directory: Model directory
+
+    Returns:
+        Training ledger
+
+    Raises:
+        OSError: If the model does not exist or was saved without a ledger
+    """
+    meta = read_artifact_meta(directory)
+    bug_ids = np.load(artifact_path(directory, meta, "ledger_bug_ids.npy")).tolist()
+    labels = np.load(artifact_path(directory, meta, "ledger_labels.npy")).tolist()
+    offsets = np.load(artifact_path(directory, meta, "ledger_offsets.npy"))
+    indices = np.load(artifact_path(directory, meta, "ledger_indices.npy"))
+    values = np.load(artifact_path(directory, meta, "ledger_values.npy"))
+    return {
+        bug_id: (indices[start:end], values[start:end], category, bug_type)
+        for bug_id, (category, bug_type), start, end in zip(bug_ids, labels, offsets[:-1], offsets[1:])
+    }
+
+
+def load_bug_model(directory: Path = BUG_MODEL_DIR) -> BugModel:
+    """
+    Load a model's inference arrays as read-only memory maps
+
+    Args:
+        directory: Model directory
+
+    Returns:
+        BugModel instance
+
+    Raises:
+        OSError: If the model does not exist
+    """
+    meta = read_artifact_meta(directory)
+    heads = {
+        head: ModelHead(
+            meta["classes"][head],
+            np.load(_artifact(directory, meta, head, "log_likelihood"), mmap_mode="r"),
+            np.load(_artifact(directory, meta, head, "log_prior"))
+        )
+        for head in HEADS
+    }
+    return BugModel(meta["version"], meta["n_features"], heads)
+
+
+_model_cache: RefreshingLoader[Optional[BugModel]] = RefreshingLoader(
+    "bug model",
+    lambda: load_bug_model(BUG_MODEL_DIR),
+    None,
+    BUG_MODEL_REFRESH_SECONDS,
+)
+
+
+def get_bug_model() -> Optional[BugModel]:
+    """
+    Get the trained model, reloading it when a retrained version is written
+
+    Returns:
+        BugModel instance or None if no model has been trained
+    """
+    return _model_cache.get()
+
+
+def predict_bug_classes(bugs: Sequence[Dict[str, Any]]) -> List[Optional[ModelPrediction]]:
+    """
+    Predict category and type for a batch of bugs with the trained model
+
+    Args:
+        bugs: Bug dictionaries
+
+    Returns:
+        ModelPrediction per bug, or None where there is no confident prediction
+    """
+    model = get_bug_model()
+    if model is None:
+        return [None] * len(bugs)
+    try:
+        return model.predict(bugs)
+    except Exception as e:
+        logger.warning(f"Bug model prediction failed: {e}")
+        return [None] * len(bugs)
+
+
+def iter_batches(items: Iterable[Any], batch_size: int) -> Iterable[List[Any]]:
+    """Group an iterable into lists of batch_size items."""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
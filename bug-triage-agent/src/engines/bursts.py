@@ -0,0 +1,149 @@
+"""Burst detection with a time-decayed count-min sketch"""
+
+import logging
+import os
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+
+from src.database.sketch_snapshots import get_sketch_snapshot, save_sketch_snapshot
+from src.utils.count_min_sketch import DecayingCountMinSketch
+from src.utils.metrics import metrics_collector
+
+logger = logging.getLogger("bug_triage_agent")
+
+BURST_DETECTION_ENABLED = os.getenv("BURST_DETECTION_ENABLED", "true").lower() == "true"
+
+# Report counts halve every BURST_HALF_LIFE_SECONDS, so a burst's count
+# approximates the reports in the last half-life / ln 2 seconds
+BURST_HALF_LIFE_SECONDS = float(os.getenv("BURST_HALF_LIFE_SECONDS", "300"))
+
+# Sketch shape: 4 rows of 2048 float64 counters is 64 KiB whatever the number of keys
+BURST_SKETCH_WIDTH = int(os.getenv("BURST_SKETCH_WIDTH", "2048"))
+BURST_SKETCH_DEPTH = int(os.getenv("BURST_SKETCH_DEPTH", "4"))
+
+# Seconds between snapshots to sketch_snapshots
+BURST_SNAPSHOT_SECONDS = float(os.getenv("BURST_SNAPSHOT_SECONDS", "60"))
+
+# Seconds between attempts to reach the database after a failure
+BURST_RETRY_SECONDS = 300
+
+SNAPSHOT_NAME = "bursts"
+
+
+def burst_key(module: Optional[str], category: str, fingerprint: Optional[str]) -> str:
+    """Sketch key for a (module, category, stack fingerprint) triple."""
+    return f"{module or ''}\x1f{category}\x1f{fingerprint or ''}"
+
+
+class BurstDetector:
+    """
+    Decayed report counts per (module, category, stack fingerprint).
+
+    The sketch is restored from its snapshot on first use and snapshotted
+    again at most every BURST_SNAPSHOT_SECONDS, so a restart keeps the
+    bursts in progress.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._sketch = self._new_sketch()
+        self._loaded = False
+        self._load_attempted_at: Optional[float] = None
+        self._snapshot_at = time.monotonic()
+        self._snapshot_failed_at: Optional[float] = None
+        self._dirty = False
+        self.observed = 0
+
+    @staticmethod
+    def _new_sketch() -> DecayingCountMinSketch:
+        return DecayingCountMinSketch(BURST_SKETCH_WIDTH, BURST_SKETCH_DEPTH, BURST_HALF_LIFE_SECONDS)
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded or (
+                self._load_attempted_at is not None and now - self._load_attempted_at < BURST_RETRY_SECONDS
+            ):
+                return
+            self._load_attempted_at = now
+            try:
+                state = get_sketch_snapshot(SNAPSHOT_NAME)
+            except Exception as e:
+                logger.debug(f"Could not load the burst sketch snapshot: {e}")
+                return
+            self._loaded = True
+            if not state:
+                return
+            try:
+                # Reports counted before the load are kept on top of the snapshot
+                self._sketch.merge_state(state)
+            except ValueError as e:
+                logger.warning(f"Ignoring the burst sketch snapshot: {e}")
+                return
+            logger.info("Restored the burst sketch snapshot")
+
+    def observe(self, module: Optional[str], category: str, fingerprint: Optional[str]) -> float:
+        """
+        Count a report and return the recent report count for its key
+
+        Args:
+            module: Module the bug belongs to
+            category: Classification category
+            fingerprint: Stack fingerprint (None without a stack trace)
+
+        Returns:
+            Decayed count of reports with the same key, including this one
+        """
+        self._ensure_loaded()
+        with self._lock:
+            self.observed += 1
+            self._dirty = True
+            return self._sketch.add(burst_key(module, category, fingerprint))
+
+    def flush(self) -> None:
+        """Snapshot the sketch to sketch_snapshots if BURST_SNAPSHOT_SECONDS have passed."""
+        with self._lock:
+            now = time.monotonic()
+            if not self._dirty or now - self._snapshot_at < BURST_SNAPSHOT_SECONDS or (
+                self._snapshot_failed_at is not None and now - self._snapshot_failed_at < BURST_RETRY_SECONDS
+            ):
+                return
+            state = self._sketch.to_state()
+            self._snapshot_at = now
+            self._dirty = False
+        try:
+            save_sketch_snapshot(SNAPSHOT_NAME, state)
+        except Exception as e:
+            logger.debug(f"Could not save the burst sketch snapshot: {e}")
+            with self._lock:
+                self._snapshot_failed_at = time.monotonic()
+                self._dirty = True
+            return
+        with self._lock:
+            self._snapshot_failed_at = None
+
+    def reset(self) -> None:
+        """Drop all counts (mainly used in tests)."""
+        with self._lock:
+            self._sketch = self._new_sketch()
+            self._loaded = False
+            self._load_attempted_at = None
+            self._snapshot_at = time.monotonic()
+            self._snapshot_failed_at = None
+            self._dirty = False
+            self.observed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Sketch size and report counts for /metrics."""
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "bytes": self._sketch.memory_bytes(),
+                "observed": self.observed,
+                "decayed_reports": round(self._sketch.total(), 2),
+            }
+
+
+burst_detector = BurstDetector()
+metrics_collector.register_cache("bursts", burst_detector)
@@ -1,119 +1,82 @@
 """Bug classification engine"""
 
-import re
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+import hashlib
 import logging
+import os
+import re
+
+from src.engines.bug_model import ModelPrediction
+from src.engines.exception_types import get_exception_table, lookup_exception_type
+# CATEGORY_PATTERNS and TYPE_PATTERNS (all packs merged) are re-exported for callers of this module
+from src.engines.rule_packs import CATEGORY_PATTERNS, TYPE_PATTERNS, RulePack, get_active_rule_set, get_rule_pack
+from src.utils.log_parser import reduce_logs
+from src.utils.metrics import metrics_collector
+from src.utils.result_cache import TTLCache
+from src.utils.text_scanner import ScanBudget, ScanBudgetExceeded, count_matches
 
 logger = logging.getLogger("bug_triage_agent")
 
+# Minimum tier confidence (see tier_confidence) to stop after the
+# title/description tier and after the stack trace/logs tier
+SUMMARY_TIER_THRESHOLD = float(os.getenv("CLASSIFICATION_SUMMARY_THRESHOLD", "0.5"))
+TRACES_TIER_THRESHOLD = float(os.getenv("CLASSIFICATION_TRACES_THRESHOLD", "0.5"))
 
-# Category patterns
-CATEGORY_PATTERNS = {
-    "Runtime Error": [
-        r"NullPointerException",
-        r"IndexOutOfBoundsException",
-        r"ArrayIndexOutOfBounds",
-        r"TypeError",
-        r"AttributeError",
-        r"KeyError",
-        r"ValueError",
-        r"RuntimeException",
-        r"undefined is not",
-        r"Cannot read property",
-        r"is not defined"
-    ],
-    "Security": [
-        r"SQL.*injection",
-        r"XSS",
-        r"cross.?site.*scripting",
-        r"authentication.*failed",
-        r"unauthorized",
-        r"forbidden",
-        r"CSRF",
-        r"security.*vulnerability",
-        r"insecure",
-        r"vulnerability"
-    ],
-    "Performance": [
-        r"timeout",
-        r"slow",
-        r"performance",
-        r"memory.*leak",
-        r"out of memory",
-        r"OOM",
-        r"CPU.*high",
-        r"response.*time",
-        r"latency"
-    ],
-    "Logic Error": [
-        r"logic.*error",
-        r"incorrect.*calculation",
-        r"wrong.*result",
-        r"unexpected.*behavior",
-        r"does not work",
-        r"not.*working",
-        r"broken"
-    ],
-    "Configuration Error": [
-        r"configuration.*error",
-        r"config.*missing",
-        r"environment.*variable",
-        r"setting.*not.*found",
-        r"invalid.*config"
-    ],
-    "UX/UI Issue": [
-        r"UI.*issue",
-        r"user.*interface",
-        r"display.*wrong",
-        r"layout.*broken",
-        r"styling",
-        r"CSS",
-        r"rendering"
-    ]
-}
+# Wall-clock budget for all pattern scans of one bug
+CLASSIFICATION_TIME_BUDGET_MS = float(os.getenv("CLASSIFICATION_TIME_BUDGET_MS", "200"))
+
+# Memo of category/type/tier keyed by bug content and rule set version
+CLASSIFICATION_CACHE_MAX_ENTRIES = int(os.getenv("CLASSIFICATION_CACHE_MAX_ENTRIES", "10000"))
+CLASSIFICATION_CACHE_MAX_BYTES = int(os.getenv("CLASSIFICATION_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+CLASSIFICATION_CACHE_TTL_SECONDS = float(os.getenv("CLASSIFICATION_CACHE_TTL_SECONDS", "600"))
+
+# Rough per-entry bookkeeping (tuple, dict slot, timestamps) on top of the strings
+_CACHE_ENTRY_OVERHEAD_BYTES = 256
 
-# Type patterns (more specific)
-TYPE_PATTERNS = {
-    "NullPointerException": [r"NullPointerException", r"null.*pointer", r"NoneType"],
-    "SQL Injection": [r"SQL.*injection", r"SQLi"],
-    "Index Out of Bounds": [r"IndexOutOfBounds", r"array.*index", r"list.*index"],
-    "Type Error": [r"TypeError", r"type.*error", r"cannot.*convert"],
-    "Authentication Error": [r"authentication.*failed", r"unauthorized", r"login.*failed"],
-    "Timeout": [r"timeout", r"request.*timed.*out"],
-    "Memory Leak": [r"memory.*leak", r"out.*of.*memory", r"OOM"]
-}
+_HORIZONTAL_SPACE = re.compile(r"[ \t\r\f\v]+")
 
+classification_cache: TTLCache[Tuple[str, str, str]] = TTLCache(
+    CLASSIFICATION_CACHE_MAX_ENTRIES,
+    CLASSIFICATION_CACHE_MAX_BYTES,
+    CLASSIFICATION_CACHE_TTL_SECONDS
+)
+metrics_collector.register_cache("classification", classification_cache)
 
-def classify_bug(bug: Dict[str, Any], code_context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+
+def classify_bug(
+    bug: Dict[str, Any],
+    code_context: Optional[Dict[str, Any]] = None,
+    prediction: Optional[ModelPrediction] = None
+) -> Dict[str, Any]:
     """
     Classify a bug into category, type, and root cause
     
     Args:
         bug: Bug input dictionary
         code_context: Optional code context dictionary
+        prediction: Optional confident trained-model prediction (see predict_bug_classes)
     
     Returns:
-        Dictionary with classification, type, and root_cause
+        Dictionary with classification, type, root_cause, confidence and
+        the tier that decided it ("budget_exceeded" if pattern scanning
+        ran out of time and the result uses the scores gathered so far)
     """
-    # Combine text sources for analysis
-    text_sources = []
-    
-    if bug.get("title"):
-        text_sources.append(bug["title"].lower())
-    if bug.get("description"):
-        text_sources.append(bug["description"].lower())
-    if bug.get("stack_trace"):
-        text_sources.append(bug["stack_trace"].lower())
-    if bug.get("logs"):
-        text_sources.append(bug["logs"].lower())
-    
-    combined_text = " ".join(text_sources)
-    
-    # Classify category
-    category = classify_category(combined_text, code_context)
-    
-    # Classify type
-    bug_type = classify_type(combined_text, category, code_context)
+    # One rule set per bug, so a rule set swapped in mid-request is not mixed in
+    rule_set = get_active_rule_set()
+    
+    # Category and type are memoized by content; repeats of one incident skip the scans
+    cache_key = classification_cache_key(bug, code_context, rule_set.version, prediction)
+    cached = classification_cache.get(cache_key)
+    if cached is not None:
+        category, bug_type, tier = cached
+    else:
+        category, bug_type, tier = classify_category_and_type(
+            bug, code_context, rule_set.pack_for(bug.get("language")), prediction
+        )
+        # Partial results from an exhausted time budget are not reused
+        if tier != "budget_exceeded":
+            size = len(cache_key) + len(category) + len(bug_type) + len(tier) + _CACHE_ENTRY_OVERHEAD_BYTES
+            classification_cache.put(cache_key, (category, bug_type, tier), size)
     
     # Analyze root cause
     root_cause = analyze_root_cause(bug, category, bug_type, code_context)
@@ -125,45 +88,225 @@ def classify_bug(bug: Dict[str, Any], code_context: Optional[Dict[str, Any]] = N
         "category": category,
         "type": bug_type,
         "root_cause": root_cause,
-        "confidence": confidence
+        "confidence": confidence,
+        "tier": tier
     }
 
 
-def classify_category(text: str, code_context: Optional[Dict[str, Any]] = None) -> str:
+def classify_category_and_type(
+    bug: Dict[str, Any],
+    code_context: Optional[Dict[str, Any]],
+    rule_pack: RulePack,
+    prediction: Optional[ModelPrediction] = None
+) -> Tuple[str, str, str]:
+    """
+    Run the classification tiers for a bug
+    
+    Args:
+        bug: Bug input dictionary
+        code_context: Optional code context dictionary
+        rule_pack: Rule pack for the bug's language
+        prediction: Optional confident trained-model prediction
+    
+    Returns:
+        Tuple of (category, type, tier that decided them)
+    """
+    # Logs contribute only their warning, error and exception records
+    logs = reduce_logs(bug["logs"]) if bug.get("logs") else None
+    
+    # Tier 1: a known exception class or panic message decides category and type
+    tier = "exception"
+    known_type = lookup_exception_type([bug.get("stack_trace"), logs, bug.get("title"), bug.get("description")])
+    if known_type:
+        category, bug_type = known_type
+    elif prediction is not None:
+        # Tier 2: the trained model; its type falls back to the type patterns
+        tier = "model"
+        category = prediction.category
+        bug_type = prediction.type
+        if bug_type is None:
+            fields = [bug.get("title"), bug.get("description"), bug.get("stack_trace"), logs]
+            text = " ".join(field for field in fields if field).lower()
+            try:
+                budget = ScanBudget(CLASSIFICATION_TIME_BUDGET_MS / 1000)
+                bug_type = classify_type(text, category, code_context, rule_pack=rule_pack, budget=budget)
+            except ScanBudgetExceeded:
+                bug_type = f"{category} Issue"
+    else:
+        # Pattern tiers add scores field group by field group and stop
+        # once one category leads clearly; the last tier adds code context hints
+        category_scores = {category: 0 for category in rule_pack.category_patterns}
+        scanned_text = []
+        budget = ScanBudget(CLASSIFICATION_TIME_BUDGET_MS / 1000)
+        try:
+            for tier, fields, threshold in (
+                ("summary", [bug.get("title"), bug.get("description")], SUMMARY_TIER_THRESHOLD),
+                ("traces", [bug.get("stack_trace"), logs], TRACES_TIER_THRESHOLD),
+            ):
+                text = " ".join(field for field in fields if field).lower()
+                if text:
+                    scanned_text.append(text)
+                    for category, score in score_categories(text, rule_pack=rule_pack, budget=budget).items():
+                        category_scores[category] = category_scores.get(category, 0) + score
+                if tier_confidence(category_scores) >= threshold:
+                    break
+            else:
+                tier = "code_context"
+                add_code_context_hints(category_scores, code_context)
+                if not any(category_scores.values()):
+                    tier = "default"
+            
+            category = pick_category(category_scores)
+            bug_type = classify_type(" ".join(scanned_text), category, code_context, rule_pack=rule_pack, budget=budget)
+        except ScanBudgetExceeded:
+            logger.warning(
+                f"Classification of bug {bug.get('bug_id')} stopped after {budget.elapsed() * 1000:.0f} ms "
+                f"(budget {CLASSIFICATION_TIME_BUDGET_MS:.0f} ms)"
+            )
+            tier = "budget_exceeded"
+            category = pick_category(category_scores)
+            bug_type = f"{category} Issue"
+    
+    return category, bug_type, tier
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Normalize text for content hashing: strip lines, drop blank lines and
+    collapse runs of spaces and tabs (line structure is kept for log parsing)
+    
+    Args:
+        text: Field value
+    
+    Returns:
+        Normalized text
+    """
+    if not text:
+        return ""
+    lines = (_HORIZONTAL_SPACE.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def classification_cache_key(
+    bug: Dict[str, Any],
+    code_context: Optional[Dict[str, Any]],
+    rules_version: int,
+    prediction: Optional[ModelPrediction] = None
+) -> str:
+    """
+    Hash everything category and type classification depends on
+    
+    Args:
+        bug: Bug input dictionary
+        code_context: Optional code context dictionary
+        rules_version: Active classification rule set version
+        prediction: Optional trained-model prediction
+    
+    Returns:
+        Hex digest
+    """
+    code_context = code_context or {}
+    parts = [
+        str(rules_version),
+        get_exception_table().version,
+        f"{prediction.version}/{prediction.category}/{prediction.type}" if prediction else "",
+        (bug.get("language") or "").lower(),
+        normalize_text(bug.get("title")),
+        normalize_text(bug.get("description")),
+        normalize_text(bug.get("stack_trace")),
+        normalize_text(bug.get("logs")),
+        normalize_text(code_context.get("snippet")),
+        normalize_text(code_context.get("file_path")),
+    ]
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def classify_category(
+    text: str,
+    code_context: Optional[Dict[str, Any]] = None,
+    language: Optional[str] = None
+) -> str:
     """
     Classify bug category
     
     Args:
         text: Combined text from bug description, stack trace, etc.
         code_context: Optional code context
+        language: Bug language selecting the rule pack (all packs if None)
     
     Returns:
         Category string
     """
-    category_scores = {}
+    category_scores = score_categories(text, language)
+    add_code_context_hints(category_scores, code_context)
+    return pick_category(category_scores)
+
+
+def score_categories(
+    text: str,
+    language: Optional[str] = None,
+    rule_pack: Optional[RulePack] = None,
+    budget: Optional[ScanBudget] = None
+) -> Dict[str, float]:
+    """
+    Score each category by its pattern matches in text
+    
+    Args:
+        text: Lowercased text
+        language: Bug language selecting the rule pack (all packs if None)
+        rule_pack: Rule pack to use instead of looking one up by language
+        budget: Optional time budget checked before each pattern and window
+    
+    Returns:
+        Mapping of category to match count
     
-    # Score each category based on pattern matches
-    for category, patterns in CATEGORY_PATTERNS.items():
+    Raises:
+        ScanBudgetExceeded: If the budget runs out
+    """
+    rule_pack = rule_pack or get_rule_pack(language)
+    category_scores = {}
+    for category, patterns in rule_pack.category_patterns.items():
         score = 0
         for pattern in patterns:
-            matches = len(re.findall(pattern, text, re.IGNORECASE))
+            matches = count_matches(pattern, text, budget=budget)
             score += matches
         category_scores[category] = score
+    return category_scores
+
+
+def add_code_context_hints(category_scores: Dict[str, float], code_context: Optional[Dict[str, Any]]) -> None:
+    """
+    Add category hints from the code context to category scores in place
     
-    # Check code context for additional hints
-    if code_context:
-        snippet = code_context.get("snippet", "").lower()
-        file_path = code_context.get("file_path", "").lower()
-        
-        # Security-related file paths
-        if any(term in file_path for term in ["auth", "security", "login", "password"]):
-            category_scores["Security"] = category_scores.get("Security", 0) + 1
-        
-        # Performance-related patterns in code
-        if any(term in snippet for term in ["loop", "recursion", "while", "for"]):
-            category_scores["Performance"] = category_scores.get("Performance", 0) + 0.5
+    Args:
+        category_scores: Mapping of category to score
+        code_context: Optional code context
+    """
+    if not code_context:
+        return
     
-    # Return category with highest score, default to "Logic Error"
+    snippet = (code_context.get("snippet") or "").lower()
+    file_path = (code_context.get("file_path") or "").lower()
+    
+    # Security-related file paths
+    if any(term in file_path for term in ["auth", "security", "login", "password"]):
+        category_scores["Security"] = category_scores.get("Security", 0) + 1
+    
+    # Performance-related patterns in code
+    if any(term in snippet for term in ["loop", "recursion", "while", "for"]):
+        category_scores["Performance"] = category_scores.get("Performance", 0) + 0.5
+
+
+def pick_category(category_scores: Dict[str, float]) -> str:
+    """
+    Pick the category with the highest score, defaulting to "Logic Error"
+    
+    Args:
+        category_scores: Mapping of category to score
+    
+    Returns:
+        Category string
+    """
     if category_scores:
         max_category = max(category_scores.items(), key=lambda x: x[1])
         if max_category[1] > 0:
@@ -172,7 +315,32 @@ def classify_category(text: str, code_context: Optional[Dict[str, Any]] = None)
     return "Logic Error"  # Default category
 
 
-def classify_type(text: str, category: str, code_context: Optional[Dict[str, Any]] = None) -> str:
+def tier_confidence(category_scores: Dict[str, float]) -> float:
+    """
+    Confidence that the leading category will not change
+    
+    Based on the lead over the runner-up: a lead of 1 gives 0.5, 2 gives
+    0.67, 3 gives 0.75, and a tie gives 0.0.
+    
+    Args:
+        category_scores: Mapping of category to score
+    
+    Returns:
+        Confidence between 0.0 and 1.0
+    """
+    top_scores = sorted(category_scores.values(), reverse=True)[:2] + [0, 0]
+    lead = top_scores[0] - top_scores[1]
+    return lead / (lead + 1) if lead > 0 else 0.0
+
+
+def classify_type(
+    text: str,
+    category: str,
+    code_context: Optional[Dict[str, Any]] = None,
+    language: Optional[str] = None,
+    rule_pack: Optional[RulePack] = None,
+    budget: Optional[ScanBudget] = None
+) -> str:
     """
     Classify specific bug type
     
@@ -180,30 +348,36 @@ def classify_type(text: str, category: str, code_context: Optional[Dict[str, Any
         text: Combined text
         category: Detected category
         code_context: Optional code context
+        language: Bug language selecting the rule pack (all packs if None)
+        rule_pack: Rule pack to use instead of looking one up by language
+        budget: Optional time budget checked before each pattern and window
     
     Returns:
         Type string
+    
+    Raises:
+        ScanBudgetExceeded: If the budget runs out
     """
+    rule_pack = rule_pack or get_rule_pack(language)
     type_scores = {}
     
     # Score each type based on pattern matches
-    for bug_type, patterns in TYPE_PATTERNS.items():
+    for bug_type, patterns in rule_pack.type_patterns.items():
         score = 0
         for pattern in patterns:
-            matches = len(re.findall(pattern, text, re.IGNORECASE))
+            matches = count_matches(pattern, text, budget=budget)
             score += matches
         type_scores[bug_type] = score
     
     # Category-specific type inference
     if category == "Runtime Error":
-        # Look for specific exception types in stack trace
-        if "stack_trace" in text:
-            if "NullPointerException" in text or "null pointer" in text:
-                return "NullPointerException"
-            elif "IndexOutOfBounds" in text:
-                return "Index Out of Bounds"
-            elif "TypeError" in text:
-                return "Type Error"
+        # Look for specific exception types (text is already lowercased)
+        if "nullpointerexception" in text or "null pointer" in text:
+            return "NullPointerException"
+        elif "indexoutofbounds" in text:
+            return "Index Out of Bounds"
+        elif "typeerror" in text:
+            return "Type Error"
     
     elif category == "Security":
         if "sql" in text and "injection" in text:
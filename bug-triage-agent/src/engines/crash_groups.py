@@ -0,0 +1,168 @@
+"""Crash grouping by stack trace fingerprint"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta, UTC
+from threading import Lock
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from src.database.crash_fingerprints import bulk_record_crash_occurrences, iter_crash_fingerprints
+from src.utils.metrics import metrics_collector
+
+logger = logging.getLogger("bug_triage_agent")
+
+CRASH_GROUPING_ENABLED = os.getenv("CRASH_GROUPING_ENABLED", "true").lower() == "true"
+
+# Fingerprints seen within this many days are loaded on first use
+CRASH_GROUP_WINDOW_DAYS = float(os.getenv("CRASH_GROUP_WINDOW_DAYS", "90"))
+
+# Fingerprints with unsaved occurrences kept while the database is unavailable
+MAX_PENDING_FINGERPRINTS = 10000
+
+# Seconds between attempts to reach the database after a failure
+CRASH_GROUP_RETRY_SECONDS = 300
+
+
+class CrashGroup(NamedTuple):
+    """Occurrences of one crash fingerprint, including the current bug"""
+    fingerprint: str
+    occurrences: int
+    previous_bug_id: Optional[str]
+    previous_decision: Optional[Dict[str, Any]]
+
+
+class CrashGroupIndex:
+    """
+    In-memory map of crash fingerprint -> [occurrences, last bug_id, last
+    triage decision].
+
+    Loaded from crash_fingerprints on first use. Occurrence increments and
+    decisions are written back in one bulk write per request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._groups: Dict[str, List[Any]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._load_attempted_at: Optional[float] = None
+        self._flush_failed_at: Optional[float] = None
+        self.observed = 0
+        self.recurring = 0
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded or (
+                self._load_attempted_at is not None and now - self._load_attempted_at < CRASH_GROUP_RETRY_SECONDS
+            ):
+                return
+            self._load_attempted_at = now
+            try:
+                docs = list(iter_crash_fingerprints(datetime.now(UTC) - timedelta(days=CRASH_GROUP_WINDOW_DAYS)))
+            except Exception as e:
+                logger.debug(f"Could not load crash fingerprints: {e}")
+                return
+            for doc in docs:
+                group = self._groups.setdefault(doc["fingerprint"], [0, None, None])
+                # Occurrences counted before the load are added on top of the stored count
+                group[0] += doc.get("count", 0)
+                group[1] = group[1] or doc.get("last_bug_id")
+                group[2] = group[2] or doc.get("last_decision")
+            self._loaded = True
+            logger.info(f"Loaded {len(docs)} crash fingerprints")
+
+    def observe(self, fingerprint: str, bug_id: str) -> CrashGroup:
+        """
+        Count an occurrence of a fingerprint and return its group
+
+        Retriaging the bug that was last seen with the fingerprint does not
+        count again.
+
+        Args:
+            fingerprint: Fingerprint from stack_fingerprint
+            bug_id: Bug ID
+
+        Returns:
+            CrashGroup with the previous bug and decision for the fingerprint
+        """
+        self._ensure_loaded()
+        with self._lock:
+            group = self._groups.setdefault(fingerprint, [0, None, None])
+            previous_bug_id, previous_decision = group[1], group[2]
+            if previous_bug_id != bug_id:
+                group[0] += 1
+                group[1] = bug_id
+                pending = self._queue(fingerprint)
+                pending["new_occurrences"] = pending.get("new_occurrences", 0) + 1
+                pending["last_bug_id"] = bug_id
+            self.observed += 1
+            if group[0] > 1:
+                self.recurring += 1
+            return CrashGroup(fingerprint, group[0], previous_bug_id, previous_decision)
+
+    def record_decision(self, fingerprint: str, decision: Dict[str, Any]) -> None:
+        """Store the triage decision made for the latest occurrence of a fingerprint."""
+        with self._lock:
+            group = self._groups.get(fingerprint)
+            if group is None:
+                return
+            group[2] = decision
+            self._queue(fingerprint)["last_decision"] = decision
+
+    def _queue(self, fingerprint: str) -> Dict[str, Any]:
+        pending = self._pending.setdefault(fingerprint, {"fingerprint": fingerprint})
+        while len(self._pending) > MAX_PENDING_FINGERPRINTS:
+            del self._pending[next(iter(self._pending))]
+        return pending
+
+    def flush(self) -> None:
+        """Write new occurrences and decisions to crash_fingerprints."""
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending or (
+                self._flush_failed_at is not None and now - self._flush_failed_at < CRASH_GROUP_RETRY_SECONDS
+            ):
+                return
+            docs = list(self._pending.values())
+            self._pending = {}
+        try:
+            bulk_record_crash_occurrences(docs)
+        except Exception as e:
+            logger.debug(f"Could not save crash fingerprints: {e}")
+            with self._lock:
+                self._flush_failed_at = time.monotonic()
+                # Merge the unsaved documents with anything queued since
+                for doc in docs:
+                    pending = self._queue(doc["fingerprint"])
+                    new_occurrences = doc.get("new_occurrences", 0) + pending.get("new_occurrences", 0)
+                    self._pending[doc["fingerprint"]] = {**doc, **pending, "new_occurrences": new_occurrences}
+            return
+        with self._lock:
+            self._flush_failed_at = None
+
+    def reset(self) -> None:
+        """Empty the index and counters (mainly used in tests)."""
+        with self._lock:
+            self._groups = {}
+            self._pending = {}
+            self._loaded = False
+            self._load_attempted_at = None
+            self._flush_failed_at = None
+            self.observed = self.recurring = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Group count and lookup counts for /metrics."""
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "fingerprints": len(self._groups),
+                "observed": self.observed,
+                "recurring": self.recurring,
+                "pending_writes": len(self._pending),
+            }
+
+
+crash_group_index = CrashGroupIndex()
+metrics_collector.register_cache("crash_groups", crash_group_index)
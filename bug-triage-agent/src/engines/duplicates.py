@@ -0,0 +1,279 @@
+"""Near-duplicate bug detection with MinHash/LSH"""
+
+import logging
+import os
+import re
+import time
+from datetime import datetime, timedelta, UTC
+from threading import Lock
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+import numpy as np
+
+from src.database.bug_signatures import bulk_upsert_bug_signatures, iter_bug_signatures
+from src.utils.metrics import metrics_collector
+from src.utils.minhash import LSHIndex, MinHasher
+
+logger = logging.getLogger("bug_triage_agent")
+
+DUPLICATE_DETECTION_ENABLED = os.getenv("DUPLICATE_DETECTION_ENABLED", "true").lower() == "true"
+
+# Estimated Jaccard similarity for a duplicate_of hint, and for copying the
+# canonical bug's assignment instead of scoring the roster
+DUPLICATE_HINT_THRESHOLD = float(os.getenv("DUPLICATE_HINT_THRESHOLD", "0.7"))
+DUPLICATE_CONFIRM_THRESHOLD = float(os.getenv("DUPLICATE_CONFIRM_THRESHOLD", "0.9"))
+
+# Signatures stored within this many days are loaded at startup, and
+# older ones are evicted from the in-memory index
+DUPLICATE_WINDOW_DAYS = float(os.getenv("DUPLICATE_WINDOW_DAYS", "30"))
+
+# Bugs held in memory; the oldest are evicted first
+DUPLICATE_MAX_BUGS = int(os.getenv("DUPLICATE_MAX_BUGS", "200000"))
+
+# 64 permutations in 8 bands of 8 rows: pairs above about 0.77 similarity
+# share a band with high probability
+DUPLICATE_NUM_PERM = 64
+DUPLICATE_BANDS = 8
+
+# Word shingle length, and the fewest shingles a bug needs to be compared
+SHINGLE_WORDS = 3
+MIN_SHINGLES = 3
+
+# Tokens read per bug, so huge stack traces cost no more than a page of text
+MAX_SHINGLE_TOKENS = 2000
+
+# Signatures kept for persistence while the database is unavailable
+MAX_PENDING_SIGNATURES = 10000
+
+# Seconds between attempts to reach the database after a failure
+DUPLICATE_RETRY_SECONDS = 300
+
+# Identifiers only: line numbers, addresses and IDs differ between reports of one incident
+_TOKEN = re.compile(r"[a-z_][a-z0-9_]*")
+
+_ASSIGNMENT_FIELDS = ("assigned_to_member_id", "assigned_to_name", "confidence")
+
+
+class DuplicateMatch(NamedTuple):
+    """The canonical bug an incoming bug duplicates"""
+    bug_id: str
+    similarity: float
+    confirmed: bool
+    assignment: Optional[Dict[str, Any]] = None
+
+
+def bug_shingles(bug: Dict[str, Any]) -> Set[str]:
+    """
+    Word shingles of a bug's title, description and stack trace
+
+    Args:
+        bug: Bug dictionary
+
+    Returns:
+        Set of SHINGLE_WORDS-word shingles
+    """
+    text = " ".join(field for field in (bug.get("title"), bug.get("description"), bug.get("stack_trace")) if field)
+    tokens = _TOKEN.findall(text.lower())[:MAX_SHINGLE_TOKENS]
+    return {" ".join(tokens[i:i + SHINGLE_WORDS]) for i in range(len(tokens) - SHINGLE_WORDS + 1)}
+
+
+def _epoch_seconds(value: Optional[datetime]) -> float:
+    # MongoDB returns naive UTC datetimes
+    if value is None:
+        return time.time()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+class DuplicateIndex:
+    """
+    In-memory MinHash/LSH index of triaged bugs.
+
+    Signatures are loaded from bug_signatures on first use. New signatures
+    and the assignments made for them are written back in one bulk write
+    per request. Bugs indexed more than DUPLICATE_WINDOW_DAYS ago, and the
+    oldest bugs beyond DUPLICATE_MAX_BUGS, are evicted.
+    """
+
+    def __init__(self) -> None:
+        self._hasher = MinHasher(DUPLICATE_NUM_PERM)
+        self._lock = Lock()
+        self._lsh = LSHIndex(DUPLICATE_NUM_PERM, DUPLICATE_BANDS)
+        self._canonical: Dict[str, str] = {}
+        self._assignments: Dict[str, Dict[str, Any]] = {}
+        # bug_id -> time indexed (epoch seconds), oldest first
+        self._indexed_at: Dict[str, float] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._load_attempted_at: Optional[float] = None
+        self._flush_failed_at: Optional[float] = None
+        self.checks = 0
+        self.hints = 0
+        self.confirmed = 0
+        self.evicted = 0
+
+    def _index(
+        self,
+        bug_id: str,
+        signature: np.ndarray,
+        canonical_bug_id: Optional[str],
+        indexed_at: float
+    ) -> None:
+        self._lsh.add(bug_id, signature)
+        self._indexed_at[bug_id] = indexed_at
+        if canonical_bug_id and canonical_bug_id != bug_id:
+            self._canonical[bug_id] = canonical_bug_id
+
+    def _evict(self, now: float) -> None:
+        # Bugs are indexed in time order, so expired ones are at the front
+        cutoff = now - DUPLICATE_WINDOW_DAYS * 86400
+        while self._indexed_at:
+            bug_id, indexed_at = next(iter(self._indexed_at.items()))
+            if indexed_at >= cutoff and len(self._indexed_at) <= DUPLICATE_MAX_BUGS:
+                break
+            del self._indexed_at[bug_id]
+            self._lsh.remove(bug_id)
+            self._canonical.pop(bug_id, None)
+            self._assignments.pop(bug_id, None)
+            self.evicted += 1
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded or (
+                self._load_attempted_at is not None and now - self._load_attempted_at < DUPLICATE_RETRY_SECONDS
+            ):
+                return
+            self._load_attempted_at = now
+            try:
+                docs = list(iter_bug_signatures(datetime.now(UTC) - timedelta(days=DUPLICATE_WINDOW_DAYS)))
+            except Exception as e:
+                logger.debug(f"Could not load bug signatures: {e}")
+                return
+            # Stored bugs go ahead of any indexed while the database was unavailable
+            indexed_since_start = self._indexed_at
+            self._indexed_at = {}
+            for doc in docs:
+                if doc["bug_id"] not in self._lsh:
+                    self._index(
+                        doc["bug_id"], np.array(doc["signature"], dtype=np.uint32),
+                        doc.get("canonical_bug_id"), _epoch_seconds(doc.get("created_at"))
+                    )
+                if doc.get("assignment") and doc["bug_id"] not in self._assignments:
+                    self._assignments[doc["bug_id"]] = doc["assignment"]
+            for bug_id, indexed_at in indexed_since_start.items():
+                self._indexed_at.setdefault(bug_id, indexed_at)
+            self._evict(time.time())
+            self._loaded = True
+            logger.info(f"Loaded {len(docs)} bug signatures into the duplicate index")
+
+    def check(self, bug_id: str, bug: Dict[str, Any]) -> Optional[DuplicateMatch]:
+        """
+        Find the canonical bug that a bug duplicates, then index the bug
+
+        Args:
+            bug_id: Bug ID
+            bug: Bug dictionary
+
+        Returns:
+            DuplicateMatch or None
+        """
+        self._ensure_loaded()
+        shingles = bug_shingles(bug)
+        if len(shingles) < MIN_SHINGLES:
+            return None
+        signature = self._hasher.signature(shingles)
+
+        with self._lock:
+            now = time.time()
+            self._evict(now)
+            self.checks += 1
+            match = None
+            for key, similarity in self._lsh.query(signature, DUPLICATE_HINT_THRESHOLD):
+                canonical = self._canonical.get(key, key)
+                if key == bug_id or canonical == bug_id:
+                    continue
+                confirmed = similarity >= DUPLICATE_CONFIRM_THRESHOLD
+                match = DuplicateMatch(
+                    canonical, round(similarity, 4), confirmed,
+                    self._assignments.get(canonical) if confirmed else None
+                )
+                self.hints += 1
+                self.confirmed += confirmed
+                break
+
+            if bug_id not in self._lsh:
+                canonical_bug_id = match.bug_id if match else None
+                self._index(bug_id, signature, canonical_bug_id, now)
+                self._evict(now)
+                self._queue(bug_id, {"signature": signature.tolist(), "canonical_bug_id": canonical_bug_id})
+        return match
+
+    def record_assignment(self, bug_id: str, assignment: Dict[str, Any]) -> None:
+        """Remember the assignment made for an indexed bug, for later duplicates to copy."""
+        with self._lock:
+            if bug_id not in self._lsh:
+                return
+            assignment = {field: assignment.get(field) for field in _ASSIGNMENT_FIELDS}
+            self._assignments[bug_id] = assignment
+            self._queue(bug_id, {"assignment": assignment})
+
+    def _queue(self, bug_id: str, fields: Dict[str, Any]) -> None:
+        self._pending.setdefault(bug_id, {"bug_id": bug_id}).update(fields)
+        while len(self._pending) > MAX_PENDING_SIGNATURES:
+            del self._pending[next(iter(self._pending))]
+
+    def flush(self) -> None:
+        """Write new signatures and assignments to bug_signatures."""
+        with self._lock:
+            now = time.monotonic()
+            if not self._pending or (
+                self._flush_failed_at is not None and now - self._flush_failed_at < DUPLICATE_RETRY_SECONDS
+            ):
+                return
+            docs = list(self._pending.values())
+            self._pending = {}
+        try:
+            bulk_upsert_bug_signatures(docs)
+        except Exception as e:
+            logger.debug(f"Could not save bug signatures: {e}")
+            with self._lock:
+                self._flush_failed_at = time.monotonic()
+                # Keep the unsaved documents, merged under any fields queued since
+                for doc in docs:
+                    self._pending[doc["bug_id"]] = {**doc, **self._pending.get(doc["bug_id"], {})}
+            return
+        with self._lock:
+            self._flush_failed_at = None
+
+    def reset(self) -> None:
+        """Empty the index and counters (mainly used in tests)."""
+        with self._lock:
+            self._lsh = LSHIndex(DUPLICATE_NUM_PERM, DUPLICATE_BANDS)
+            self._canonical = {}
+            self._assignments = {}
+            self._indexed_at = {}
+            self._pending = {}
+            self._loaded = False
+            self._load_attempted_at = None
+            self._flush_failed_at = None
+            self.checks = self.hints = self.confirmed = self.evicted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and detection counts for /metrics."""
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "bugs": len(self._lsh),
+                "bytes": self._lsh.memory_bytes(),
+                "checks": self.checks,
+                "duplicate_hints": self.hints,
+                "confirmed_duplicates": self.confirmed,
+                "evicted": self.evicted,
+                "pending_writes": len(self._pending),
+            }
+
+
+duplicate_index = DuplicateIndex()
+metrics_collector.register_cache("duplicates", duplicate_index)
@@ -0,0 +1,269 @@
+"""Effort estimation from historical resolution times"""
+
+import logging
+import os
+import time
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.database.historical_bugs import iter_resolution_times
+from src.utils.metrics import metrics_collector
+
+logger = logging.getLogger("bug_triage_agent")
+
+EFFORT_ESTIMATION_ENABLED = os.getenv("EFFORT_ESTIMATION_ENABLED", "true").lower() == "true"
+
+# Resolutions a bucket needs before its quantiles are used instead of a broader bucket's
+EFFORT_MIN_SAMPLES = int(os.getenv("EFFORT_MIN_SAMPLES", "5"))
+
+# Seconds between fetches of newly resolved bugs (and between attempts after a failure)
+EFFORT_REFRESH_SECONDS = float(os.getenv("EFFORT_REFRESH_SECONDS", "300"))
+
+# Log-spaced histogram bins from 15 minutes to 90 days, each about 21% wide;
+# times outside the range are counted in the first or last bin
+HISTOGRAM_EDGES = np.geomspace(0.25, 2160.0, 49)
+
+EFFORT_QUANTILES = (0.25, 0.5, 0.75)
+
+BucketKey = Tuple[Optional[str], ...]
+
+
+class EffortEstimate(NamedTuple):
+    """Resolution time quantiles, in hours, of the bucket a bug falls in"""
+    p25: float
+    p50: float
+    p75: float
+    samples: int
+    bucket: BucketKey
+
+
+def effort_buckets(
+    category: Optional[str],
+    bug_type: Optional[str],
+    module: Optional[str],
+    language: Optional[str]
+) -> List[BucketKey]:
+    """Bucket keys for a bug, most specific first."""
+    return [
+        (category, bug_type, module, language),
+        (category, bug_type, module),
+        (category, bug_type),
+        (category,),
+    ]
+
+
+def histogram_quantiles(counts: np.ndarray, quantiles: Iterable[float] = EFFORT_QUANTILES) -> List[float]:
+    """
+    Quantiles of a resolution time histogram, interpolated within bins
+
+    Args:
+        counts: Counts per HISTOGRAM_EDGES bin
+        quantiles: Quantiles between 0 and 1
+
+    Returns:
+        Hours at each quantile
+    """
+    cumulative = np.cumsum(counts)
+    values = []
+    for quantile in quantiles:
+        target = quantile * cumulative[-1]
+        index = min(int(np.searchsorted(cumulative, target)), len(counts) - 1)
+        before = cumulative[index - 1] if index else 0
+        fraction = (target - before) / counts[index] if counts[index] else 0.0
+        low, high = HISTOGRAM_EDGES[index], HISTOGRAM_EDGES[index + 1]
+        values.append(float(low * (high / low) ** fraction))
+    return values
+
+
+def _histogram_bin(hours: float) -> int:
+    return min(max(int(np.searchsorted(HISTOGRAM_EDGES, hours, side="right")) - 1, 0), len(HISTOGRAM_EDGES) - 2)
+
+
+class EffortIndex:
+    """
+    Resolution time histograms per (category, type, module, language) bucket
+    and its coarser prefixes, with precomputed p25/p50/p75 per bucket.
+
+    All historical resolutions are streamed once on first use; later
+    refreshes stream only bugs updated since the newest updated_at seen
+    (so late-resolved and backfilled bugs are picked up) and recompute the
+    quantiles of the buckets they touch, so estimates are a few dictionary
+    lookups. Each bug is counted once: a bug streamed again replaces its
+    earlier resolution time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._histograms: Dict[BucketKey, np.ndarray] = {}
+        self._quantiles: Dict[BucketKey, EffortEstimate] = {}
+        # bug_id -> (most specific bucket, histogram bin) it was counted in
+        self._counted: Dict[str, Tuple[BucketKey, int]] = {}
+        self._watermark: Optional[datetime] = None
+        self._loaded = False
+        self._refreshing = False
+        self._refreshed_at: Optional[float] = None
+        self.resolutions = 0
+        self.lookups = 0
+        self.learned = 0
+
+    @property
+    def version(self) -> str:
+        """Newest updated_at counted ("none" before the first load), for result reuse keys."""
+        with self._lock:
+            return self._watermark.isoformat() if self._watermark else "none"
+
+    def _ensure_fresh(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshing or (
+                self._refreshed_at is not None and now - self._refreshed_at < EFFORT_REFRESH_SECONDS
+            ):
+                return
+            self._refreshing = True
+            self._refreshed_at = now
+            # After the full pass only bugs updated since the newest updated_at
+            # seen are fetched; ties are fetched again and counted once
+            since = (self._watermark or datetime.min) if self._loaded else None
+        try:
+            # Read outside the lock, so estimates are served during the first full pass
+            resolutions: List[Tuple[Any, BucketKey, int]] = []
+            watermark = self._watermark
+            for doc in iter_resolution_times(since):
+                key = (doc.get("category"), doc.get("type"), doc.get("module"), doc.get("language"))
+                resolutions.append((doc.get("bug_id"), key, _histogram_bin(float(doc["resolution_time_hours"]))))
+                if doc.get("updated_at") and (watermark is None or doc["updated_at"] > watermark):
+                    watermark = doc["updated_at"]
+        except Exception as e:
+            logger.debug(f"Could not load resolution times: {e}")
+            with self._lock:
+                self._refreshing = False
+            return
+        with self._lock:
+            self._merge_resolutions(resolutions)
+            self._watermark = watermark
+            if not self._loaded:
+                logger.info(f"Loaded {len(resolutions)} resolution times into {len(self._histograms)} effort buckets")
+            self._loaded = True
+            self._refreshing = False
+
+    def _merge_resolutions(self, resolutions: List[Tuple[Any, BucketKey, int]]) -> None:
+        deltas: Dict[BucketKey, np.ndarray] = {}
+
+        def count(key: BucketKey, bin_index: int, step: int) -> None:
+            for bucket in effort_buckets(*key):
+                deltas.setdefault(bucket, np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int32))[bin_index] += step
+
+        for bug_id, key, bin_index in resolutions:
+            if bug_id is not None:
+                previous = self._counted.get(bug_id)
+                if previous == (key, bin_index):
+                    continue
+                if previous is not None:
+                    count(*previous, -1)
+                    self.resolutions -= 1
+                self._counted[bug_id] = (key, bin_index)
+            count(key, bin_index, 1)
+            self.resolutions += 1
+
+        # Only the buckets touched by changed resolutions have their quantiles recomputed
+        for key, delta in deltas.items():
+            merged = self._histograms.get(key)
+            merged = delta if merged is None else merged + delta
+            self._histograms[key] = merged
+            samples = int(merged.sum())
+            if samples >= EFFORT_MIN_SAMPLES:
+                self._quantiles[key] = EffortEstimate(*histogram_quantiles(merged), samples, key)
+            else:
+                self._quantiles.pop(key, None)
+
+    def estimate(
+        self,
+        category: Optional[str],
+        bug_type: Optional[str],
+        module: Optional[str],
+        language: Optional[str]
+    ) -> Optional[EffortEstimate]:
+        """
+        Resolution time quantiles of the most specific bucket with enough samples
+
+        Args:
+            category: Bug category
+            bug_type: Bug type
+            module: Module the bug belongs to
+            language: Programming language
+
+        Returns:
+            EffortEstimate or None if no bucket has EFFORT_MIN_SAMPLES resolutions
+        """
+        self._ensure_fresh()
+        with self._lock:
+            self.lookups += 1
+            for key in effort_buckets(category, bug_type, module, language):
+                estimate = self._quantiles.get(key)
+                if estimate is not None:
+                    self.learned += 1
+                    return estimate
+        return None
+
+    def reset(self) -> None:
+        """Drop all histograms and counters (mainly used in tests)."""
+        with self._lock:
+            self._histograms = {}
+            self._quantiles = {}
+            self._counted = {}
+            self._watermark = None
+            self._loaded = False
+            self._refreshing = False
+            self._refreshed_at = None
+            self.resolutions = self.lookups = self.learned = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Bucket count and lookup counts for /metrics."""
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "resolutions": self.resolutions,
+                "buckets": len(self._histograms),
+                "bytes": sum(counts.nbytes for counts in self._histograms.values()),
+                "lookups": self.lookups,
+                "learned_estimates": self.learned,
+            }
+
+
+def _duration(hours: float) -> Tuple[int, str]:
+    if hours < 1:
+        return max(5, int(round(hours * 12)) * 5), "minutes"
+    if hours >= 48:
+        return round(hours / 24), "days"
+    return round(hours), "hours"
+
+
+def _format_duration(value: int, unit: str) -> str:
+    return f"{value} {unit[:-1] if value == 1 else unit}"
+
+
+def format_effort(estimate: EffortEstimate) -> str:
+    """
+    Format learned quantiles like the rule-based estimates (e.g. "2-6 hours")
+
+    Args:
+        estimate: EffortEstimate
+
+    Returns:
+        Interquartile range with the median, e.g. "2-6 hours (median 3 hours)"
+    """
+    (low, low_unit), (high, high_unit) = _duration(estimate.p25), _duration(estimate.p75)
+    if (low, low_unit) == (high, high_unit):
+        span = f"about {_format_duration(high, high_unit)}"
+    elif low_unit == high_unit:
+        span = f"{low}-{high} {high_unit}"
+    else:
+        span = f"{_format_duration(low, low_unit)} - {_format_duration(high, high_unit)}"
+    return f"{span} (median {_format_duration(*_duration(estimate.p50))})"
+
+
+effort_index = EffortIndex()
+metrics_collector.register_cache("effort", effort_index)
@@ -0,0 +1,167 @@
+"""Exception class dictionary used as a classification fast path"""
+
+import json
+import logging
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.utils.keyword_matcher import KeywordAutomaton
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+# Packaged table of exception classes and panic messages -> (category, type).
+# It lists only classes with an unambiguous label; anything else falls through
+# to the rule patterns.
+EXCEPTION_TABLE_PATH = Path(__file__).parent / "data" / "exception_types.json"
+
+# Dotted (Java/.NET/Python) or path-qualified (Rust) identifiers
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*(?:(?:\.|::)[A-Za-z_$][\w$]*)*")
+_QUALIFIER = re.compile(r".*(?:\.|::)")
+
+
+class ExceptionTable:
+    """
+    Hash table of exception class names plus an automaton over panic and
+    error messages (Go, Rust, JavaScript) that have no class name.
+    """
+
+    def __init__(
+        self,
+        classes: Dict[str, Tuple[str, str]],
+        phrases: List[Tuple[str, Tuple[str, str]]],
+        version: str = "empty"
+    ) -> None:
+        self.version = version
+        self.classes = classes
+        self._phrase_labels = [label for _, label in phrases]
+        self._phrases = KeywordAutomaton([phrase for phrase, _ in phrases])
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+    def lookup(self, token: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up an exception token, fully qualified first, then by simple name
+
+        Args:
+            token: Identifier such as "java.lang.NullPointerException"
+
+        Returns:
+            Tuple of (category, type) or None
+        """
+        label = self.classes.get(token)
+        if label is None:
+            label = self.classes.get(_QUALIFIER.sub("", token))
+        return label
+
+    def match(self, text: Optional[str]) -> Optional[Tuple[str, str]]:
+        """
+        Classify text from a known panic message or its first known exception token
+
+        Messages are checked (in table order) before class names because
+        they are more specific ("TypeError: Cannot read properties of
+        undefined" is a null access, not a type mismatch).
+
+        Args:
+            text: Stack trace, log or free text
+
+        Returns:
+            Tuple of (category, type) or None
+        """
+        if not text:
+            return None
+
+        found = self._phrases.find(text.lower())
+        if found:
+            return self._phrase_labels[min(found)]
+
+        for token in extract_exception_tokens(text):
+            label = self.lookup(token)
+            if label:
+                return label
+        return None
+
+
+def extract_exception_tokens(text: str) -> Iterator[str]:
+    """
+    Pull candidate exception identifiers out of text
+
+    Only CamelCase identifiers (uppercase first letter of the simple name
+    and at least one lowercase letter) are yielded, which skips prose,
+    keywords and constants.
+
+    Args:
+        text: Stack trace or log text
+
+    Yields:
+        Identifiers in order of appearance
+    """
+    for match in _IDENTIFIER.finditer(text):
+        token = match.group(0)
+        name = _QUALIFIER.sub("", token)
+        if name[:1].isupper() and not name.isupper():
+            yield token
+
+
+def build_exception_table(data: Dict) -> ExceptionTable:
+    """
+    Compile the exception table from its JSON form
+
+    Args:
+        data: {"version", "exceptions": {category: {type: [class names]}},
+            "phrases": {category: {type: [lowercase messages]}}}
+
+    Returns:
+        Compiled ExceptionTable
+    """
+    classes: Dict[str, Tuple[str, str]] = {}
+    for category, types in data.get("exceptions", {}).items():
+        for bug_type, names in types.items():
+            for name in names:
+                classes.setdefault(name, (category, bug_type))
+
+    phrases: List[Tuple[str, Tuple[str, str]]] = []
+    for category, types in data.get("phrases", {}).items():
+        for bug_type, messages in types.items():
+            phrases.extend((message.lower(), (category, bug_type)) for message in messages)
+
+    return ExceptionTable(classes, phrases, version=str(data.get("version", "unknown")))
+
+
+@lru_cache(maxsize=1)
+def get_exception_table() -> ExceptionTable:
+    """
+    Get the exception table, loading the packaged data file on first use
+
+    Returns:
+        ExceptionTable instance (empty if the data file cannot be read)
+    """
+    try:
+        with open(EXCEPTION_TABLE_PATH, "r", encoding="utf-8") as handle:
+            table = build_exception_table(json.load(handle))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load exception table from {EXCEPTION_TABLE_PATH}: {e}")
+        return ExceptionTable({}, [])
+    logger.info(f"Loaded {len(table)} exception classes (table version {table.version})")
+    return table
+
+
+def lookup_exception_type(texts: Iterable[Optional[str]]) -> Optional[Tuple[str, str]]:
+    """
+    Classify a bug from the first text that names a known exception
+
+    Args:
+        texts: Texts in priority order (e.g. stack trace, logs, title, description)
+
+    Returns:
+        Tuple of (category, type) or None if no known exception is present
+    """
+    table = get_exception_table()
+    for text in texts:
+        label = table.match(text)
+        if label:
+            return label
+    return None
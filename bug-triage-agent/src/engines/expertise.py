@@ -0,0 +1,346 @@
+"""Per-member expertise matrix materialized from resolved and triaged history"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.artifacts import new_artifact_version, publish_artifact, read_artifact_meta, save_array
+from src.utils.refresh_cache import RefreshingLoader
+
+logger = logging.getLogger("bug_triage_agent")
+
+# Directory holding the materialized matrix (see scripts/build_expertise_matrix.py)
+EXPERTISE_DIR = Path(os.getenv("EXPERTISE_DIR", str(Path(__file__).resolve().parents[2] / "artifacts" / "expertise")))
+
+# Seconds between checks for a rebuilt matrix
+EXPERTISE_REFRESH_SECONDS = int(os.getenv("EXPERTISE_REFRESH_SECONDS", "300"))
+
+FACETS = ("category", "module", "language")
+
+# Facets scored at assignment time. Bugs are assigned before they are
+# classified in batch mode, so the category facet is materialized but not scored.
+SCORED_FACETS = ("module", "language")
+
+# Bounds on the speed factor: a member's average resolution time against
+# the average for the same facet value
+MIN_SPEED_FACTOR = 0.5
+MAX_SPEED_FACTOR = 1.5
+
+# Weight of a triage assignment against a resolution. Assignments are this
+# service's own decisions, so weighting them low keeps a member's past
+# assignments from compounding into ever more assignments.
+EXPERTISE_ASSIGNMENT_WEIGHT = float(os.getenv("EXPERTISE_ASSIGNMENT_WEIGHT", "0.25"))
+
+# Per-facet arrays of shape (members, values): bugs resolved, resolved bugs
+# with a resolution time, their summed hours, and triage assignments of bugs
+# not (yet) in the resolved history
+STATISTICS = ("counts", "resolved", "hours", "assigned")
+
+# A history event: (bug_id, "resolved" or "assigned", member_id, {facet: value}, resolution hours or None)
+HistoryEvent = Tuple[str, str, str, Dict[str, Optional[str]], Optional[float]]
+
+# bug_id -> (member row, value column per facet or -1) of each counted
+# assignment, so a later assignment or resolution of the bug replaces it
+AssignmentLedger = Dict[str, Tuple[int, Tuple[int, ...]]]
+
+
+def expertise_scores(counts: np.ndarray, resolved: np.ndarray, hours: np.ndarray, assigned: np.ndarray) -> np.ndarray:
+    """
+    Score each member against each facet value
+
+    The score is the member's share of history relative to the most
+    experienced member for the value (1.0 for the top member), scaled by how
+    much faster than average they resolve it. An assignment counts as
+    EXPERTISE_ASSIGNMENT_WEIGHT of a resolution.
+
+    Args:
+        counts: Resolved bugs per (member, value)
+        resolved: Resolved bugs with a resolution time per (member, value)
+        hours: Summed resolution hours per (member, value)
+        assigned: Triage assignments per (member, value)
+
+    Returns:
+        Float array of the same shape
+    """
+    history = counts + EXPERTISE_ASSIGNMENT_WEIGHT * assigned
+    share = history / np.maximum(history.max(axis=0, initial=0), 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        member_hours = hours / resolved
+        value_hours = hours.sum(axis=0) / resolved.sum(axis=0)
+        speed = np.clip(value_hours / member_hours, MIN_SPEED_FACTOR, MAX_SPEED_FACTOR)
+    return share * np.where(np.isfinite(speed), speed, 1.0)
+
+
+class ExpertiseMatrix:
+    """
+    Member x facet-value history with interned ids.
+
+    For each facet (category, module, language) the matrix holds
+    (members x values) arrays of resolution counts, resolution hours and
+    assignment counts, plus a precomputed score array, so scoring a member
+    is one array lookup per facet. The assignment ledger is only loaded by
+    the build script.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        members: List[str],
+        values: Dict[str, List[str]],
+        arrays: Dict[str, Dict[str, np.ndarray]],
+        assignments: Optional[AssignmentLedger] = None,
+        watermarks: Optional[Dict[str, Optional[str]]] = None
+    ) -> None:
+        self.version = version
+        self.members = members
+        self.values = values
+        self.arrays = arrays
+        self.assignments = assignments or {}
+        self.watermarks = watermarks or {}
+        self._member_index = {member: row for row, member in enumerate(members)}
+        self._value_index = {facet: {value: column for column, value in enumerate(values[facet])} for facet in FACETS}
+        self._scores = {facet: expertise_scores(*(arrays[facet][name] for name in STATISTICS)) for facet in FACETS}
+
+    def _columns(self, facet: str, value: Optional[str]) -> Optional[int]:
+        return self._value_index[facet].get(_normalize(facet, value)) if value else None
+
+    def expertise(self, member_id: str, module: Optional[str], language: Optional[str]) -> float:
+        """
+        Expertise of a member for a bug's module and language
+
+        Args:
+            member_id: Team member ID
+            module: Bug module
+            language: Bug language
+
+        Returns:
+            Sum of the member's module and language scores (0.0 without history)
+        """
+        row = self._member_index.get(member_id)
+        total = 0.0
+        if row is None:
+            return total
+        for facet, value in zip(SCORED_FACETS, (module, language)):
+            column = self._columns(facet, value)
+            if column is not None:
+                total += self._scores[facet][row, column]
+        return total
+
+    def score_matrix(
+        self,
+        modules: Sequence[Optional[str]],
+        languages: Sequence[Optional[str]],
+        member_ids: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Expertise of every member for every bug, equal to expertise() per cell
+
+        Args:
+            modules: Module per bug
+            languages: Language per bug
+            member_ids: Member ID per column
+
+        Returns:
+            Float array of shape (len(modules), len(member_ids))
+        """
+        result = np.zeros((len(modules), len(member_ids)), dtype=np.float64)
+        member_rows = np.array([self._member_index.get(member_id, -1) for member_id in member_ids], dtype=np.int64)
+        known_members = member_rows >= 0
+        for facet, bug_values in zip(SCORED_FACETS, (modules, languages)):
+            columns = np.array([
+                column if column is not None else -1
+                for column in (self._columns(facet, value) for value in bug_values)
+            ], dtype=np.int64)
+            known_bugs = columns >= 0
+            if not known_bugs.any() or not known_members.any():
+                continue
+            block = self._scores[facet][np.ix_(member_rows[known_members], columns[known_bugs])].T
+            result[np.ix_(known_bugs, known_members)] += block
+        return result
+
+
+def _normalize(facet: str, value: str) -> str:
+    return value.lower() if facet == "language" else value
+
+
+def update_expertise_arrays(
+    base: Optional[ExpertiseMatrix],
+    events: Iterable[HistoryEvent]
+) -> Tuple[List[str], Dict[str, List[str]], Dict[str, Dict[str, np.ndarray]], AssignmentLedger]:
+    """
+    Add history events to a matrix's arrays
+
+    Members and values already interned keep their indexes; new ones are
+    appended, so only the new events are read. Each bug counts once: a
+    resolution or a newer assignment of a bug replaces its ledgered
+    assignment.
+
+    Args:
+        base: Matrix to extend, with its assignment ledger (None to start empty)
+        events: (bug_id, source, member_id, {facet: value}, resolution hours or None) tuples
+
+    Returns:
+        (members, values per facet, arrays per facet, assignment ledger)
+    """
+    members = list(base.members) if base else []
+    member_index = {member: row for row, member in enumerate(members)}
+    values = {facet: list(base.values[facet]) if base else [] for facet in FACETS}
+    value_index = {facet: {value: column for column, value in enumerate(values[facet])} for facet in FACETS}
+    assignments: AssignmentLedger = dict(base.assignments) if base else {}
+
+    # (facet, member row, value column) -> [count, resolved, hours, assigned]
+    increments: Dict[Tuple[str, int, int], List[float]] = {}
+
+    def add(row: int, columns: Tuple[int, ...], statistic: int, amount: float) -> None:
+        for facet, column in zip(FACETS, columns):
+            if column >= 0:
+                increments.setdefault((facet, row, column), [0, 0, 0.0, 0])[statistic] += amount
+
+    for bug_id, source, member_id, facet_values, hours in events:
+        row = member_index.setdefault(member_id, len(member_index))
+        if row == len(members):
+            members.append(member_id)
+        columns = []
+        for facet in FACETS:
+            value = facet_values.get(facet)
+            if not value:
+                columns.append(-1)
+                continue
+            value = _normalize(facet, value)
+            column = value_index[facet].setdefault(value, len(value_index[facet]))
+            if column == len(values[facet]):
+                values[facet].append(value)
+            columns.append(column)
+
+        previous = assignments.pop(bug_id, None)
+        if previous is not None:
+            add(*previous, 3, -1)
+        if source == "assigned":
+            assignments[bug_id] = (row, tuple(columns))
+            add(row, tuple(columns), 3, 1)
+            continue
+        add(row, tuple(columns), 0, 1)
+        if hours is not None and hours > 0:
+            add(row, tuple(columns), 1, 1)
+            add(row, tuple(columns), 2, hours)
+
+    arrays: Dict[str, Dict[str, np.ndarray]] = {}
+    for facet in FACETS:
+        shape = (len(members), len(values[facet]))
+        arrays[facet] = {
+            "counts": np.zeros(shape, dtype=np.int32),
+            "resolved": np.zeros(shape, dtype=np.int32),
+            "hours": np.zeros(shape, dtype=np.float64),
+            "assigned": np.zeros(shape, dtype=np.int32),
+        }
+        if base:
+            old_rows, old_columns = base.arrays[facet]["counts"].shape
+            for name in STATISTICS:
+                arrays[facet][name][:old_rows, :old_columns] = base.arrays[facet][name]
+    for (facet, row, column), amounts in increments.items():
+        for name, amount in zip(STATISTICS, amounts):
+            arrays[facet][name][row, column] += amount
+    return members, values, arrays, assignments
+
+
+def save_expertise_matrix(
+    directory: Path,
+    members: List[str],
+    values: Dict[str, List[str]],
+    arrays: Dict[str, Dict[str, np.ndarray]],
+    assignments: AssignmentLedger,
+    watermarks: Dict[str, Optional[str]]
+) -> Dict[str, Any]:
+    """
+    Write the matrix as .npy arrays plus meta.json with the interned ids
+
+    The arrays go into a new per-version subdirectory and meta.json, which
+    names it, is replaced last, so a service never loads arrays from two
+    builds (see publish_artifact).
+
+    Args:
+        directory: Matrix directory
+        members: Member ID per row
+        values: Facet value per column, per facet
+        arrays: counts / resolved / hours / assigned arrays per facet
+        assignments: Assignment ledger
+        watermarks: _id of the last resolved and triaged record read (hex strings)
+
+    Returns:
+        The written metadata
+    """
+    version = new_artifact_version(directory)
+    array_directory = directory / version
+    for facet in FACETS:
+        for name in STATISTICS:
+            save_array(array_directory / f"{facet}_{name}.npy", arrays[facet][name])
+    ledger_ids = list(assignments)
+    save_array(array_directory / "assigned_bug_ids.npy", np.array(ledger_ids, dtype=str))
+    save_array(array_directory / "assigned_cells.npy", np.array(
+        [(assignments[bug_id][0], *assignments[bug_id][1]) for bug_id in ledger_ids], dtype=np.int32
+    ).reshape(len(ledger_ids), 1 + len(FACETS)))
+
+    meta = {
+        "members": members,
+        "values": values,
+        "watermarks": watermarks,
+        "version": version,
+    }
+    publish_artifact(directory, meta)
+    return meta
+
+
+def load_expertise_matrix(directory: Path = EXPERTISE_DIR, with_assignments: bool = False) -> ExpertiseMatrix:
+    """
+    Load a materialized matrix
+
+    Args:
+        directory: Matrix directory
+        with_assignments: Also load the assignment ledger (needed to extend the matrix)
+
+    Returns:
+        ExpertiseMatrix instance
+
+    Raises:
+        OSError: If the matrix does not exist
+    """
+    meta = read_artifact_meta(directory)
+    array_directory = directory / meta["version"]
+    arrays = {
+        facet: {name: np.load(array_directory / f"{facet}_{name}.npy") for name in STATISTICS}
+        for facet in FACETS
+    }
+    assignments: AssignmentLedger = {}
+    if with_assignments:
+        cells = np.load(array_directory / "assigned_cells.npy")
+        for bug_id, (row, *columns) in zip(np.load(array_directory / "assigned_bug_ids.npy").tolist(), cells.tolist()):
+            assignments[bug_id] = (row, tuple(columns))
+    return ExpertiseMatrix(
+        meta["version"], meta["members"], meta["values"], arrays, assignments, meta.get("watermarks")
+    )
+
+
+_matrix_cache: RefreshingLoader[Optional[ExpertiseMatrix]] = RefreshingLoader(
+    "expertise matrix",
+    lambda: load_expertise_matrix(EXPERTISE_DIR),
+    None,
+    EXPERTISE_REFRESH_SECONDS,
+)
+
+
+def get_expertise_matrix() -> Optional[ExpertiseMatrix]:
+    """
+    Get the expertise matrix, reloading it when a rebuilt version is written
+
+    Returns:
+        ExpertiseMatrix instance or None if no matrix has been built
+    """
+    return _matrix_cache.get()
+
+
+def reset_expertise_matrix() -> None:
+    """Drop the cached matrix so the next call reloads it (mainly used in tests)."""
+    _matrix_cache.reset()
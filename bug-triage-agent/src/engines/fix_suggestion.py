@@ -1,15 +1,20 @@
 """Fix suggestion engine"""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 
+from src.engines.effort_estimation import EFFORT_ESTIMATION_ENABLED, effort_index, format_effort
+from src.engines.similar_bugs import SimilarBug
+
 logger = logging.getLogger("bug_triage_agent")
 
 
 def suggest_fix(
     bug: Dict[str, Any],
     classification: Dict[str, Any],
-    code_context: Optional[Dict[str, Any]] = None
+    code_context: Optional[Dict[str, Any]] = None,
+    similar_bugs: Optional[List[SimilarBug]] = None,
+    module: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Suggest fix approach for a bug
@@ -18,6 +23,8 @@ def suggest_fix(
         bug: Bug input dictionary
         classification: Classification result
         code_context: Optional code context
+        similar_bugs: Optional similar resolved bugs, best first
+        module: Optional module the bug belongs to (narrows the effort estimate)
     
     Returns:
         Dictionary with approach and estimated_effort
@@ -29,8 +36,16 @@ def suggest_fix(
     # Generate fix approach
     approach = generate_fix_approach(category, bug_type, root_cause, code_context)
     
+    # Reuse the known fix of the most similar resolved bug
+    known_fix = next((similar for similar in similar_bugs or [] if similar.resolution), None)
+    if known_fix:
+        approach = (
+            f"Similar resolved bug {known_fix.bug_id} ({known_fix.similarity:.0%} match) was fixed by: "
+            f"{known_fix.resolution.strip().rstrip('.')}. {approach}"
+        )
+    
     # Estimate effort
-    estimated_effort = estimate_effort(category, bug_type, code_context)
+    estimated_effort = estimate_effort(category, bug_type, code_context, module, bug.get("language"))
     
     return {
         "approach": approach,
@@ -117,19 +132,32 @@ def generate_fix_approach(
 def estimate_effort(
     category: str,
     bug_type: str,
-    code_context: Optional[Dict[str, Any]]
+    code_context: Optional[Dict[str, Any]],
+    module: Optional[str] = None,
+    language: Optional[str] = None
 ) -> str:
     """
     Estimate effort required to fix the bug
     
+    Resolution time quartiles of similar historical bugs are used when a
+    bucket has enough of them; otherwise the estimate is rule-based.
+    
     Args:
         category: Bug category
         bug_type: Bug type
         code_context: Optional code context
+        module: Optional module the bug belongs to
+        language: Optional programming language
     
     Returns:
         Effort estimate string
     """
+    # Learned from historical resolution times
+    if EFFORT_ESTIMATION_ENABLED:
+        learned = effort_index.estimate(category, bug_type, module, language)
+        if learned:
+            return format_effort(learned)
+    
     # Base effort by category
     if category == "Runtime Error":
         if "NullPointerException" in bug_type:
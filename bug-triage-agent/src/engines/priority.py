@@ -2,6 +2,7 @@
 
 from typing import Dict, Any, Optional
 import logging
+import os
 
 from src.database.severity_priority_rules import get_priority_rule
 
@@ -10,11 +11,24 @@ logger = logging.getLogger("bug_triage_agent")
 
 PRIORITY_LEVELS = ["critical", "high", "medium", "low"]
 
+# Occurrences of one crash fingerprint at which priority rises one level each
+CRASH_ESCALATION_OCCURRENCES = [
+    int(count) for count in os.getenv("CRASH_ESCALATION_OCCURRENCES", "10,50").split(",") if count.strip()
+]
+
+# Recent reports of one (module, category, fingerprint) at which priority
+# rises one level each (decayed counts from the burst detector)
+BURST_ESCALATION_REPORTS = [
+    float(count) for count in os.getenv("BURST_ESCALATION_REPORTS", "20,100").split(",") if count.strip()
+]
+
 
 def assess_priority(
     bug: Dict[str, Any],
     classification: Dict[str, Any],
-    severity_rules: Optional[list] = None
+    severity_rules: Optional[list] = None,
+    occurrences: Optional[int] = None,
+    burst_reports: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     Assess bug priority level
@@ -23,6 +37,8 @@ def assess_priority(
         bug: Bug input dictionary
         classification: Classification result
         severity_rules: Optional list of severity priority rules from database
+        occurrences: Optional number of times the bug's crash fingerprint has been seen
+        burst_reports: Optional recent report count for the bug's module, category and fingerprint
     
     Returns:
         Dictionary with level and justification
@@ -45,6 +61,24 @@ def assess_priority(
     # Generate justification
     justification = generate_justification(category, bug_type, environment, tags, priority_level)
     
+    # Frequently recurring crashes and bursts of reports rise above their category's level
+    escalated_level = priority_level
+    reasons = []
+    crash_level = escalate_for_recurrence(escalated_level, occurrences)
+    if crash_level != escalated_level:
+        reasons.append(f"a crash seen {occurrences} times")
+        escalated_level = crash_level
+    burst_level = escalate_for_burst(escalated_level, burst_reports)
+    if burst_level != escalated_level:
+        reasons.append(f"a burst of about {round(burst_reports)} similar reports")
+        escalated_level = burst_level
+    if escalated_level != priority_level:
+        justification = (
+            f"{escalated_level.capitalize()} priority: escalated from {priority_level} for "
+            f"{' and '.join(reasons)}; {justification.split(': ', 1)[1]}"
+        )
+        priority_level = escalated_level
+    
     # Calculate confidence
     confidence = calculate_priority_confidence(bug, classification, priority_level)
     
@@ -101,6 +135,41 @@ def determine_priority_level(
     return "low"
 
 
+def escalate_for_recurrence(priority_level: str, occurrences: Optional[int]) -> str:
+    """
+    Raise a priority level one step per crash escalation threshold reached
+    
+    Args:
+        priority_level: Priority level
+        occurrences: Times the crash fingerprint has been seen (None if unknown)
+    
+    Returns:
+        Escalated priority level (at most critical)
+    """
+    return _escalate(priority_level, occurrences, CRASH_ESCALATION_OCCURRENCES)
+
+
+def escalate_for_burst(priority_level: str, burst_reports: Optional[float]) -> str:
+    """
+    Raise a priority level one step per burst escalation threshold reached
+    
+    Args:
+        priority_level: Priority level
+        burst_reports: Recent report count for the bug's key (None if unknown)
+    
+    Returns:
+        Escalated priority level (at most critical)
+    """
+    return _escalate(priority_level, burst_reports, BURST_ESCALATION_REPORTS)
+
+
+def _escalate(priority_level: str, count: Optional[float], thresholds: list) -> str:
+    if not count or priority_level not in PRIORITY_LEVELS:
+        return priority_level
+    steps = sum(1 for threshold in thresholds if count >= threshold)
+    return PRIORITY_LEVELS[max(PRIORITY_LEVELS.index(priority_level) - steps, 0)]
+
+
 def generate_justification(
     category: str,
     bug_type: str,
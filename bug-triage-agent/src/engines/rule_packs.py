@@ -0,0 +1,395 @@
+"""Classification rule packs partitioned by language, hot-reloaded from the database"""
+
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Pattern
+
+from src.database.classification_rules import get_newer_rule_set
+from src.utils.regex_safety import compile_guarded
+
+logger = logging.getLogger("bug_triage_agent")
+
+# Category patterns that apply to every language, including languages
+# without a pack of their own (exception names several runtimes share)
+SHARED_CATEGORY_PATTERNS = {
+    "Runtime Error": [
+        r"RuntimeException",
+        r"TypeError",
+        r"is not defined"
+    ],
+    "Security": [
+        r"SQL.*injection",
+        r"XSS",
+        r"cross.?site.*scripting",
+        r"authentication.*failed",
+        r"unauthorized",
+        r"forbidden",
+        r"CSRF",
+        r"security.*vulnerability",
+        r"insecure",
+        r"vulnerability"
+    ],
+    "Performance": [
+        r"timeout",
+        r"slow",
+        r"performance",
+        r"memory.*leak",
+        r"out of memory",
+        r"OOM",
+        r"CPU.*high",
+        r"response.*time",
+        r"latency"
+    ],
+    "Logic Error": [
+        r"logic.*error",
+        r"incorrect.*calculation",
+        r"wrong.*result",
+        r"unexpected.*behavior",
+        r"does not work",
+        r"not.*working",
+        r"broken"
+    ],
+    "Configuration Error": [
+        r"configuration.*error",
+        r"config.*missing",
+        r"environment.*variable",
+        r"setting.*not.*found",
+        r"invalid.*config"
+    ],
+    "UX/UI Issue": [
+        r"UI.*issue",
+        r"user.*interface",
+        r"display.*wrong",
+        r"layout.*broken",
+        r"styling",
+        r"CSS",
+        r"rendering"
+    ]
+}
+
+# Type patterns (more specific) that apply to every language
+SHARED_TYPE_PATTERNS = {
+    "NullPointerException": [r"null.*pointer"],
+    "SQL Injection": [r"SQL.*injection", r"SQLi"],
+    "Index Out of Bounds": [r"array.*index", r"list.*index"],
+    "Type Error": [r"type.*error", r"cannot.*convert"],
+    "Authentication Error": [r"authentication.*failed", r"unauthorized", r"login.*failed"],
+    "Timeout": [r"timeout", r"request.*timed.*out"],
+    "Memory Leak": [r"memory.*leak", r"out.*of.*memory", r"OOM"]
+}
+
+# Patterns for exceptions and messages that only one runtime produces
+LANGUAGE_CATEGORY_PATTERNS = {
+    "jvm": {
+        "Runtime Error": [
+            r"NullPointerException",
+            r"IndexOutOfBoundsException",
+            r"ArrayIndexOutOfBounds"
+        ]
+    },
+    "python": {
+        "Runtime Error": [
+            r"AttributeError",
+            r"KeyError",
+            r"ValueError"
+        ]
+    },
+    "javascript": {
+        "Runtime Error": [
+            r"undefined is not",
+            r"Cannot read property"
+        ]
+    }
+}
+
+LANGUAGE_TYPE_PATTERNS = {
+    "jvm": {
+        "NullPointerException": [r"NullPointerException"],
+        "Index Out of Bounds": [r"IndexOutOfBounds"]
+    },
+    "python": {
+        "NullPointerException": [r"NoneType"],
+        "Type Error": [r"TypeError"]
+    },
+    "javascript": {
+        "Type Error": [r"TypeError"]
+    }
+}
+
+# Built-in mapping of bug language (as resolved by
+# detect_and_validate_language_file_type) to rule pack.
+# Other known languages use the shared pack only.
+LANGUAGE_RULE_PACKS = {
+    "java": "jvm",
+    "kotlin": "jvm",
+    "scala": "jvm",
+    "python": "python",
+    "javascript": "javascript",
+    "typescript": "javascript",
+}
+
+# Name of the pack holding every pattern, used when the language is unknown
+ALL_RULES = "all"
+SHARED_RULES = "shared"
+
+# Version of the rule set built from the patterns in this module
+BUILTIN_RULES_VERSION = 0
+
+# Seconds between background checks of classification_rules for a newer version
+RULE_PACK_REFRESH_SECONDS = int(os.getenv("RULE_PACK_REFRESH_SECONDS", "60"))
+
+
+def merge_patterns(*pattern_sets: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Merge pattern sets, keeping the key order of the first set and dropping duplicates
+
+    Args:
+        pattern_sets: Mappings of category or type to regex patterns
+
+    Returns:
+        Merged mapping
+    """
+    merged: Dict[str, List[str]] = {}
+    for pattern_set in pattern_sets:
+        for key, patterns in pattern_set.items():
+            target = merged.setdefault(key, [])
+            target.extend(pattern for pattern in patterns if pattern not in target)
+    return merged
+
+
+# Every pattern from every pack (the rules applied before packs were split)
+CATEGORY_PATTERNS = merge_patterns(SHARED_CATEGORY_PATTERNS, *LANGUAGE_CATEGORY_PATTERNS.values())
+TYPE_PATTERNS = merge_patterns(SHARED_TYPE_PATTERNS, *LANGUAGE_TYPE_PATTERNS.values())
+
+
+def builtin_rule_packs() -> Dict[str, Dict[str, Dict[str, List[str]]]]:
+    """
+    Get the built-in packs in the stored document layout
+
+    Returns:
+        Pack name -> {"categories": {...}, "types": {...}}
+    """
+    packs = {SHARED_RULES: {"categories": SHARED_CATEGORY_PATTERNS, "types": SHARED_TYPE_PATTERNS}}
+    for name in LANGUAGE_CATEGORY_PATTERNS.keys() | LANGUAGE_TYPE_PATTERNS.keys():
+        packs[name] = {
+            "categories": LANGUAGE_CATEGORY_PATTERNS.get(name, {}),
+            "types": LANGUAGE_TYPE_PATTERNS.get(name, {}),
+        }
+    return packs
+
+
+class RulePack:
+    """
+    Compiled category and type patterns for one language
+
+    Patterns are linted and compiled with bounded wildcards (see
+    compile_guarded); an unsafe pattern raises UnsafePatternError.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        category_patterns: Dict[str, List[str]],
+        type_patterns: Dict[str, List[str]]
+    ) -> None:
+        self.name = name
+        self.category_patterns: Dict[str, List[Pattern[str]]] = {
+            category: [compile_guarded(pattern) for pattern in patterns]
+            for category, patterns in category_patterns.items()
+        }
+        self.type_patterns: Dict[str, List[Pattern[str]]] = {
+            bug_type: [compile_guarded(pattern) for pattern in patterns]
+            for bug_type, patterns in type_patterns.items()
+        }
+
+
+class RuleSet:
+    """
+    One version of every rule pack, compiled up front. A rule set is never
+    modified after construction: a new version is compiled separately and
+    replaces the active one as a whole.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        packs: Dict[str, Dict[str, Dict[str, List[str]]]],
+        languages: Dict[str, str],
+        source: str = "builtin"
+    ) -> None:
+        started = time.perf_counter()
+        self.version = version
+        self.source = source
+        self.languages = {language.lower(): pack for language, pack in languages.items()}
+
+        shared = packs.get(SHARED_RULES, {})
+        shared_categories = shared.get("categories", {})
+        shared_types = shared.get("types", {})
+        language_packs = {name: pack for name, pack in packs.items() if name != SHARED_RULES}
+
+        self.packs: Dict[str, RulePack] = {SHARED_RULES: RulePack(SHARED_RULES, shared_categories, shared_types)}
+        for name, pack in language_packs.items():
+            self.packs[name] = RulePack(
+                name,
+                merge_patterns(shared_categories, pack.get("categories", {})),
+                merge_patterns(shared_types, pack.get("types", {}))
+            )
+        self.packs[ALL_RULES] = RulePack(
+            ALL_RULES,
+            merge_patterns(shared_categories, *(pack.get("categories", {}) for pack in language_packs.values())),
+            merge_patterns(shared_types, *(pack.get("types", {}) for pack in language_packs.values()))
+        )
+
+        self.compile_seconds = time.perf_counter() - started
+        self.compiled_at = time.time()
+
+    def resolve_pack_name(self, language: Optional[str]) -> str:
+        """Get the pack name for a bug language ("all" if unknown, "shared" if it has no pack)"""
+        if not language:
+            return ALL_RULES
+        return self.languages.get(language.strip().lower(), SHARED_RULES)
+
+    def pack_for(self, language: Optional[str]) -> RulePack:
+        """Get the compiled pack for a bug language"""
+        return self.packs.get(self.resolve_pack_name(language), self.packs[SHARED_RULES])
+
+
+class RuleSetManager:
+    """
+    Serves the active rule set and swaps in newer stored versions.
+
+    Readers take a reference to the active RuleSet and keep using it, so a
+    swap never blocks or changes an in-flight classification. Checking the
+    database and compiling happen on a background thread at most once per
+    refresh interval; a failed load or compile keeps the current rule set.
+    """
+
+    def __init__(self, refresh_seconds: float = RULE_PACK_REFRESH_SECONDS) -> None:
+        self._refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._builtin = RuleSet(BUILTIN_RULES_VERSION, builtin_rule_packs(), LANGUAGE_RULE_PACKS)
+        self._active = self._builtin
+        self._refreshing = False
+        self._checked_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def active(self) -> RuleSet:
+        """The active rule set, without triggering a refresh"""
+        return self._active
+
+    def get(self) -> RuleSet:
+        """Return the active rule set, starting a background refresh if one is due."""
+        with self._lock:
+            now = time.monotonic()
+            due = self._checked_at is None or now - self._checked_at >= self._refresh_seconds
+            if due and not self._refreshing:
+                self._checked_at = now
+                self._refreshing = True
+                threading.Thread(target=self._refresh_in_background, name="rule-pack-refresh", daemon=True).start()
+        return self._active
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self) -> bool:
+        """
+        Load and compile a newer stored rule set, then swap it in
+
+        Returns:
+            True if a new rule set became active
+        """
+        try:
+            document = get_newer_rule_set(self._active.version)
+            if document is None:
+                return False
+            rule_set = RuleSet(
+                document["version"],
+                document.get("packs") or {},
+                document.get("languages") or LANGUAGE_RULE_PACKS,
+                source="database"
+            )
+        except re.error as e:
+            # Includes UnsafePatternError from the pattern lint
+            self.last_error = f"Rule set failed to compile: {e}"
+            logger.error(self.last_error)
+            return False
+        except Exception as e:
+            self.last_error = str(e)
+            logger.debug(f"Could not load classification rules: {e}")
+            return False
+
+        # Reference assignment is atomic; readers holding the old set keep it
+        self._active = rule_set
+        self.last_error = None
+        logger.info(
+            f"Activated classification rule set version {rule_set.version} "
+            f"(compiled in {rule_set.compile_seconds * 1000:.1f} ms)"
+        )
+        return True
+
+    def reset(self) -> None:
+        """Go back to the built-in rule set (mainly used in tests)."""
+        with self._lock:
+            self._active = self._builtin
+            self._checked_at = None
+            self.last_error = None
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the active rule set for the status endpoint."""
+        rule_set = self._active
+        return {
+            "version": rule_set.version,
+            "source": rule_set.source,
+            "packs": sorted(rule_set.packs),
+            "compile_ms": round(rule_set.compile_seconds * 1000, 3),
+            "compiled_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(rule_set.compiled_at)),
+            "refresh_seconds": self._refresh_seconds,
+            "last_error": self.last_error,
+        }
+
+
+rule_set_manager = RuleSetManager()
+
+
+def get_active_rule_set() -> RuleSet:
+    """
+    Get the active classification rule set
+
+    Returns:
+        RuleSet instance
+    """
+    return rule_set_manager.get()
+
+
+def resolve_rule_pack_name(language: Optional[str]) -> str:
+    """
+    Get the rule pack name for a bug language
+
+    Args:
+        language: Bug language, or None if unknown
+
+    Returns:
+        Pack name: a language pack, "shared" for other languages, or "all" if unknown
+    """
+    return get_active_rule_set().resolve_pack_name(language)
+
+
+def get_rule_pack(language: Optional[str] = None) -> RulePack:
+    """
+    Get the compiled rule pack for a bug language from the active rule set
+
+    Args:
+        language: Bug language, or None if unknown
+
+    Returns:
+        RulePack instance
+    """
+    return get_active_rule_set().pack_for(language)
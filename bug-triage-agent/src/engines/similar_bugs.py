@@ -0,0 +1,420 @@
+"""Nearest resolved historical bugs from locally computed embeddings"""
+
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.database.historical_bugs import get_bug_resolutions
+from src.engines.bug_model import bug_text, featurize_text
+from src.utils.artifacts import (
+    artifact_path, new_artifact_version, publish_artifact, read_artifact_meta, save_array
+)
+from src.utils.refresh_cache import RefreshingLoader
+
+logger = logging.getLogger("bug_triage_agent")
+
+# Directory holding the similar-bug index (see scripts/backfill_embeddings.py)
+SIMILAR_BUGS_DIR = Path(os.getenv("SIMILAR_BUGS_DIR", str(Path(__file__).resolve().parents[2] / "artifacts" / "similar_bugs")))
+
+# Embedding dimension; changing it requires a full backfill
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "256"))
+EMBEDDING_MODEL = f"hashed-tf-{EMBEDDING_DIM}"
+
+# Neighbours returned per bug and the cosine similarity they must reach
+SIMILAR_BUGS_K = int(os.getenv("SIMILAR_BUGS_K", "5"))
+SIMILAR_BUGS_MIN_SIMILARITY = float(os.getenv("SIMILAR_BUGS_MIN_SIMILARITY", "0.75"))
+
+# Inverted lists scanned per query
+SIMILAR_BUGS_NPROBE = int(os.getenv("SIMILAR_BUGS_NPROBE", "8"))
+
+# Seconds between checks for a rebuilt index
+SIMILAR_BUGS_REFRESH_SECONDS = int(os.getenv("SIMILAR_BUGS_REFRESH_SECONDS", "300"))
+
+# Indexes with at least this many rows are split into about sqrt(rows)
+# inverted lists; smaller ones are scanned in full
+IVF_MIN_ROWS = 20000
+
+# Rows dequantized at a time while scanning or assigning lists
+SCAN_BLOCK_ROWS = 65536
+
+# Spherical k-means over a sample of the rows
+KMEANS_SAMPLE_ROWS = 65536
+KMEANS_ITERATIONS = 10
+
+# featurize_text is called with the full crc32 range: the low bits pick the
+# bucket and the top bit the sign
+_HASH_SPACE = 2 ** 32
+_SIGN_BIT = 1 << 31
+
+
+class SimilarBug(NamedTuple):
+    """A resolved historical bug close to the bug being triaged"""
+    bug_id: str
+    similarity: float
+    resolved_by: Optional[str]
+    resolution: Optional[str] = None
+
+
+def embed_bugs(bugs: Sequence[Dict[str, Any]], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Embed bugs as L2-normalized dense vectors
+
+    The hashed unigram/bigram term frequencies of ``bug_text`` are folded
+    into ``dim`` buckets with a pseudo-random sign per feature, a sparse
+    random projection that keeps dot products in expectation.
+
+    Args:
+        bugs: Bug dictionaries
+        dim: Embedding dimension (a power of two)
+
+    Returns:
+        Float32 array of shape (len(bugs), dim); empty bugs are zero rows
+    """
+    vectors = np.zeros((len(bugs), dim), dtype=np.float32)
+    for row, bug in enumerate(bugs):
+        indices, weights = featurize_text(bug_text(bug), _HASH_SPACE)
+        if len(indices):
+            signed = np.where(indices & _SIGN_BIT, -weights, weights)
+            vectors[row] = np.bincount(indices % dim, weights=signed, minlength=dim)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Quantize rows to int8 with one scale per row
+
+    Args:
+        vectors: Float array of shape (rows, dim)
+
+    Returns:
+        Tuple of (int8 codes, float32 scales); row i is about codes[i] * scales[i]
+    """
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    divisors = np.where(scales > 0, scales, 1.0)
+    codes = np.rint(vectors / divisors[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def train_centroids(codes: np.ndarray, n_lists: int, seed: int = 0) -> np.ndarray:
+    """
+    Spherical k-means over a sample of quantized rows
+
+    Row scales are ignored: they do not change which centroid is closest
+    in cosine terms.
+
+    Args:
+        codes: Int8 rows
+        n_lists: Number of centroids
+        seed: Random seed for sampling and initialization
+
+    Returns:
+        Float32 unit centroids of shape (n_lists, dim)
+    """
+    rng = np.random.default_rng(seed)
+    sample_rows = np.sort(rng.choice(len(codes), size=min(len(codes), KMEANS_SAMPLE_ROWS), replace=False))
+    sample = _normalize(codes[sample_rows].astype(np.float32))
+    centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        labels = (sample @ centroids.T).argmax(axis=1)
+        order = np.argsort(labels, kind="stable")
+        present, starts = np.unique(labels[order], return_index=True)
+        # Lists that lost every row keep their previous centroid
+        centroids[present] = _normalize(np.add.reduceat(sample[order], starts, axis=0))
+    return centroids
+
+
+def assign_lists(codes: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    Closest centroid of every row, scanned in blocks
+
+    Args:
+        codes: Int8 rows
+        centroids: Unit centroids
+
+    Returns:
+        Int32 list number per row
+    """
+    labels = np.empty(len(codes), dtype=np.int32)
+    for start in range(0, len(codes), SCAN_BLOCK_ROWS):
+        block = codes[start:start + SCAN_BLOCK_ROWS].astype(np.float32)
+        labels[start:start + len(block)] = (block @ centroids.T).argmax(axis=1)
+    return labels
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class SimilarBugIndex:
+    """
+    Inverted-file index over int8 quantized embeddings, backed by
+    (memory-mapped) arrays. Rows are stored grouped by list, so each probed
+    list is one contiguous slice.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        vectors: np.ndarray,
+        scales: np.ndarray,
+        centroids: np.ndarray,
+        offsets: np.ndarray,
+        bug_ids: np.ndarray,
+        resolvers: np.ndarray,
+        members: List[str]
+    ) -> None:
+        self.version = version
+        self.vectors = vectors
+        self.scales = scales
+        self.centroids = centroids
+        self.offsets = offsets
+        self.bug_ids = bug_ids
+        self.resolvers = resolvers
+        self.members = members
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def resolved_by(self, row: int) -> Optional[str]:
+        """Member who resolved the bug stored at ``row``."""
+        member = int(self.resolvers[row])
+        return self.members[member] if member >= 0 else None
+
+    def search(self, queries: np.ndarray, k: int, nprobe: int = SIMILAR_BUGS_NPROBE) -> List[List[Tuple[int, float]]]:
+        """
+        Approximate top-k rows by cosine similarity
+
+        Args:
+            queries: Unit query vectors of shape (queries, dim)
+            k: Neighbours per query
+            nprobe: Inverted lists scanned per query
+
+        Returns:
+            Per query, (row, similarity) pairs best first
+        """
+        n_lists = len(self.offsets) - 1
+        nprobe = max(min(nprobe, n_lists), 1)
+        if n_lists > nprobe:
+            probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.tile(np.arange(n_lists), (len(queries), 1))
+
+        results = []
+        for query, lists in zip(queries, probes):
+            rows, scores = self._scan(query, np.sort(lists))
+            top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind="stable")]
+            results.append([(int(rows[i]), float(scores[i])) for i in top])
+        return results
+
+    def _scan(self, query: np.ndarray, lists: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Similarity of the query to every row of the given lists"""
+        row_parts = []
+        score_parts = []
+        for list_number in lists:
+            start, end = int(self.offsets[list_number]), int(self.offsets[list_number + 1])
+            for block_start in range(start, end, SCAN_BLOCK_ROWS):
+                block_end = min(block_start + SCAN_BLOCK_ROWS, end)
+                block = self.vectors[block_start:block_end].astype(np.float32)
+                score_parts.append((block @ query) * self.scales[block_start:block_end])
+                row_parts.append(np.arange(block_start, block_end))
+        if not score_parts:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return np.concatenate(row_parts), np.concatenate(score_parts)
+
+
+def build_similar_bug_index(
+    directory: Path,
+    codes: np.ndarray,
+    scales: np.ndarray,
+    bug_ids: Sequence[str],
+    resolved_by: Sequence[Optional[str]],
+    meta: Optional[Dict[str, Any]] = None,
+    n_lists: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Partition quantized embeddings into inverted lists and write the index
+
+    The arrays go into a new per-version subdirectory and meta.json, which
+    names it, is replaced last (see publish_artifact).
+
+    Args:
+        directory: Index directory
+        codes: Int8 rows from quantize
+        scales: Per-row scales from quantize
+        bug_ids: Bug ID per row
+        resolved_by: Resolving member per row (or None)
+        meta: Extra metadata
+        n_lists: Number of inverted lists (defaults to sqrt(rows) above IVF_MIN_ROWS, else 1)
+
+    Returns:
+        The written metadata
+    """
+    rows = len(codes)
+    if n_lists is None:
+        n_lists = int(round(math.sqrt(rows))) if rows >= IVF_MIN_ROWS else 1
+    n_lists = max(min(n_lists, rows), 1)
+    if n_lists > 1:
+        centroids = train_centroids(codes, n_lists)
+        labels = assign_lists(codes, centroids)
+    else:
+        centroids = np.zeros((1, codes.shape[1]), dtype=np.float32)
+        labels = np.zeros(rows, dtype=np.int32)
+    order = np.argsort(labels, kind="stable")
+    offsets = np.searchsorted(labels[order], np.arange(n_lists + 1)).astype(np.int64)
+
+    members = sorted({member for member in resolved_by if member})
+    member_numbers = {member: number for number, member in enumerate(members)}
+    resolvers = np.array([member_numbers.get(member, -1) for member in resolved_by], dtype=np.int32)
+
+    meta = dict(meta or {})
+    meta.update({
+        "model": f"hashed-tf-{codes.shape[1]}",
+        "rows": rows,
+        "lists": n_lists,
+        "members": members,
+        "version": new_artifact_version(directory),
+    })
+    save_array(artifact_path(directory, meta, "vectors.npy"), codes[order])
+    save_array(artifact_path(directory, meta, "scales.npy"), scales[order])
+    save_array(artifact_path(directory, meta, "centroids.npy"), centroids)
+    save_array(artifact_path(directory, meta, "offsets.npy"), offsets)
+    save_array(artifact_path(directory, meta, "bug_ids.npy"), np.array(list(bug_ids), dtype=str)[order])
+    save_array(artifact_path(directory, meta, "resolvers.npy"), resolvers[order])
+    publish_artifact(directory, meta)
+    return meta
+
+
+def load_similar_bug_index(directory: Path = SIMILAR_BUGS_DIR) -> SimilarBugIndex:
+    """
+    Load an index with its vectors and bug IDs as read-only memory maps
+
+    Args:
+        directory: Index directory
+
+    Returns:
+        SimilarBugIndex instance
+
+    Raises:
+        OSError: If the index does not exist
+    """
+    meta = read_artifact_meta(directory)
+    return SimilarBugIndex(
+        meta["version"],
+        np.load(artifact_path(directory, meta, "vectors.npy"), mmap_mode="r"),
+        np.load(artifact_path(directory, meta, "scales.npy"), mmap_mode="r"),
+        np.load(artifact_path(directory, meta, "centroids.npy")),
+        np.load(artifact_path(directory, meta, "offsets.npy")),
+        np.load(artifact_path(directory, meta, "bug_ids.npy"), mmap_mode="r"),
+        np.load(artifact_path(directory, meta, "resolvers.npy"), mmap_mode="r"),
+        meta["members"],
+    )
+
+
+_index_cache: RefreshingLoader[Optional[SimilarBugIndex]] = RefreshingLoader(
+    "similar bug index",
+    lambda: load_similar_bug_index(SIMILAR_BUGS_DIR),
+    None,
+    SIMILAR_BUGS_REFRESH_SECONDS,
+)
+
+
+def get_similar_bug_index() -> Optional[SimilarBugIndex]:
+    """
+    Get the similar-bug index, reloading it when a rebuilt version is written
+
+    Returns:
+        SimilarBugIndex instance or None if no index has been built
+    """
+    return _index_cache.get()
+
+
+def find_similar_bugs_batch(
+    bugs: Sequence[Dict[str, Any]],
+    k: int = SIMILAR_BUGS_K,
+    min_similarity: float = SIMILAR_BUGS_MIN_SIMILARITY
+) -> List[List[SimilarBug]]:
+    """
+    Find the nearest resolved historical bugs for a batch of bugs
+
+    Known fixes of all neighbours are fetched in a single database query.
+
+    Args:
+        bugs: Bug dictionaries
+        k: Neighbours per bug
+        min_similarity: Minimum cosine similarity of a neighbour
+
+    Returns:
+        Per bug, similar resolved bugs best first (empty without an index)
+    """
+    index = get_similar_bug_index()
+    if index is None or not len(index) or not bugs:
+        return [[] for _ in bugs]
+    try:
+        hits = index.search(embed_bugs(bugs, index.dim), k)
+    except Exception as e:
+        logger.warning(f"Similar bug search failed: {e}")
+        return [[] for _ in bugs]
+
+    hits = [[(row, similarity) for row, similarity in bug_hits if similarity >= min_similarity] for bug_hits in hits]
+    bug_ids = sorted({str(index.bug_ids[row]) for bug_hits in hits for row, _ in bug_hits})
+    resolutions: Dict[str, str] = {}
+    if bug_ids:
+        try:
+            resolutions = get_bug_resolutions(bug_ids)
+        except Exception as e:
+            logger.debug(f"Could not load resolutions of similar bugs: {e}")
+
+    return [
+        [
+            SimilarBug(str(index.bug_ids[row]), round(similarity, 4), index.resolved_by(row),
+                       resolutions.get(str(index.bug_ids[row])))
+            for row, similarity in bug_hits
+        ]
+        for bug_hits in hits
+    ]
+
+
+def find_similar_bugs(bug: Dict[str, Any]) -> List[SimilarBug]:
+    """
+    Find the nearest resolved historical bugs for one bug
+
+    Args:
+        bug: Bug dictionary
+
+    Returns:
+        Similar resolved bugs best first
+    """
+    return find_similar_bugs_batch([bug])[0]
+
+
+def similar_resolver_weights(similar_bugs: Sequence[SimilarBug]) -> Dict[str, float]:
+    """
+    Similarity-weighted share of the similar bugs each member resolved
+
+    Args:
+        similar_bugs: Similar resolved bugs
+
+    Returns:
+        Dictionary mapping member_id to a share between 0 and 1
+    """
+    total = sum(similar.similarity for similar in similar_bugs)
+    weights: Dict[str, float] = {}
+    if total <= 0:
+        return weights
+    for similar in similar_bugs:
+        if similar.resolved_by:
+            weights[similar.resolved_by] = weights.get(similar.resolved_by, 0.0) + similar.similarity / total
+    return weights
@@ -0,0 +1,224 @@
+"""Reuse of stored triage results for bugs retriaged with unchanged content"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from src.database.triage_history import find_reusable_triage, iter_triage_keys
+from src.engines.bug_model import get_bug_model
+from src.engines.effort_estimation import effort_index
+from src.engines.exception_types import get_exception_table
+from src.engines.expertise import get_expertise_matrix
+from src.engines.rule_packs import get_active_rule_set
+from src.engines.similar_bugs import get_similar_bug_index
+from src.utils.bloom_filter import BloomFilter
+from src.utils.metrics import metrics_collector
+from src.utils.module_resolver import get_module_resolver
+from src.utils.ownership_index import get_ownership_index
+
+logger = logging.getLogger("bug_triage_agent")
+
+TRIAGE_REUSE_ENABLED = os.getenv("TRIAGE_REUSE_ENABLED", "true").lower() == "true"
+
+# Bloom filter sizing: (bug_id, content_hash) pairs held at the target false positive rate
+TRIAGE_REUSE_CAPACITY = int(os.getenv("TRIAGE_REUSE_CAPACITY", "1000000"))
+TRIAGE_REUSE_ERROR_RATE = float(os.getenv("TRIAGE_REUSE_ERROR_RATE", "0.01"))
+
+# Stored results older than this are recomputed; bounds staleness from
+# inputs outside the version keys (routing rules, live developer load)
+TRIAGE_REUSE_MAX_AGE_HOURS = float(os.getenv("TRIAGE_REUSE_MAX_AGE_HOURS", "24"))
+
+# Seconds between attempts to load the filter while the database is unavailable
+TRIAGE_REUSE_RETRY_SECONDS = 300
+
+
+def bug_content_hash(bug: Dict[str, Any]) -> str:
+    """
+    Hash every field of a prepared bug except its ID
+
+    Args:
+        bug: Bug dictionary after preparation (budgets, frame compression)
+
+    Returns:
+        Hex digest
+    """
+    content = {field: value for field, value in bug.items() if field != "bug_id"}
+    data = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _digest(value: Any) -> str:
+    data = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.blake2b(data.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def roster_version(team_profiles: List[Dict[str, Any]]) -> str:
+    """
+    Version of the merged team roster (skills, modules, load, availability)
+
+    Args:
+        team_profiles: Merged team profiles
+
+    Returns:
+        Hex digest
+    """
+    return _digest(sorted(team_profiles, key=lambda profile: str(profile.get("member_id"))))
+
+
+def rules_version(severity_rules: List[Dict[str, Any]]) -> str:
+    """
+    Version of the rules and tables the engines use
+
+    Args:
+        severity_rules: Severity to priority rules loaded for the request
+
+    Returns:
+        Version string
+    """
+    rules = [{key: value for key, value in rule.items() if key != "_id"} for rule in severity_rules]
+    bug_model = get_bug_model()
+    similar_bugs = get_similar_bug_index()
+    expertise = get_expertise_matrix()
+    return ":".join([
+        str(get_active_rule_set().version),
+        get_exception_table().version,
+        get_module_resolver().version,
+        get_ownership_index().version,
+        bug_model.version if bug_model else "none",
+        similar_bugs.version if similar_bugs else "none",
+        effort_index.version,
+        expertise.version if expertise else "none",
+        _digest(rules),
+    ])
+
+
+class TriageReuseIndex:
+    """
+    Bloom filter over the (bug_id, content_hash) pairs in triage_history.
+
+    A negative answer means the bug content was never triaged, so the
+    history lookup is skipped. The filter is loaded from triage_history on
+    first use and grows as new results are saved.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self._capacity = capacity
+        self._error_rate = error_rate
+        self._lock = Lock()
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._loaded = False
+        self._load_attempted_at: Optional[float] = None
+        self._pending: List[str] = []
+        self.negatives = 0
+        self.positives = 0
+        self.reused = 0
+
+    @staticmethod
+    def _key(bug_id: str, content_hash: str) -> str:
+        return f"{bug_id}\x1f{content_hash}"
+
+    def _ensure_loaded(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded or (
+                self._load_attempted_at is not None and now - self._load_attempted_at < TRIAGE_REUSE_RETRY_SECONDS
+            ):
+                return
+            self._load_attempted_at = now
+            try:
+                bloom = BloomFilter(self._capacity, self._error_rate)
+                for bug_id, content_hash in iter_triage_keys():
+                    bloom.add(self._key(bug_id, content_hash))
+            except Exception as e:
+                logger.debug(f"Could not load triage history keys: {e}")
+                return
+            # Keys added while the database was unavailable are kept
+            for key in self._pending:
+                bloom.add(key)
+            self._bloom = bloom
+            self._pending = []
+            self._loaded = True
+            logger.info(f"Loaded {bloom.count} triage history keys into the reuse filter")
+
+    def might_contain(self, bug_id: str, content_hash: str) -> bool:
+        """Whether a stored result may exist for the bug content."""
+        self._ensure_loaded()
+        found = self._key(bug_id, content_hash) in self._bloom
+        with self._lock:
+            if found:
+                self.positives += 1
+            else:
+                self.negatives += 1
+        return found
+
+    def add(self, bug_id: str, content_hash: str) -> None:
+        """Record a newly saved result."""
+        key = self._key(bug_id, content_hash)
+        self._bloom.add(key)
+        with self._lock:
+            if not self._loaded:
+                self._pending.append(key)
+
+    def record_reuse(self) -> None:
+        """Count a stored result returned instead of retriaging."""
+        with self._lock:
+            self.reused += 1
+
+    def reset(self) -> None:
+        """Empty the filter and counters (mainly used in tests)."""
+        with self._lock:
+            self._bloom = BloomFilter(self._capacity, self._error_rate)
+            self._loaded = False
+            self._load_attempted_at = None
+            self._pending = []
+            self.negatives = self.positives = self.reused = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Filter size and lookup counts for /metrics."""
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "keys": self._bloom.count,
+                "bytes": self._bloom.memory_bytes(),
+                "filter_negatives": self.negatives,
+                "filter_positives": self.positives,
+                "reused": self.reused,
+                # Positives that found no usable stored result (false positives or stale versions)
+                "misses_after_positive": self.positives - self.reused,
+            }
+
+
+triage_reuse_index = TriageReuseIndex(TRIAGE_REUSE_CAPACITY, TRIAGE_REUSE_ERROR_RATE)
+metrics_collector.register_cache("triage_reuse", triage_reuse_index)
+
+
+def find_reusable_result(
+    bug_id: str,
+    content_hash: str,
+    versions: Dict[str, str]
+) -> Optional[Dict[str, Any]]:
+    """
+    Get a stored triage result for an unchanged bug if the filter allows it
+
+    Args:
+        bug_id: Bug ID
+        content_hash: Hash from bug_content_hash
+        versions: Current {"roster": ..., "rules": ...} versions
+
+    Returns:
+        Stored triage result dictionary or None
+    """
+    if not triage_reuse_index.might_contain(bug_id, content_hash):
+        return None
+    try:
+        stored = find_reusable_triage(bug_id, content_hash, versions, TRIAGE_REUSE_MAX_AGE_HOURS)
+    except Exception as e:
+        logger.debug(f"Could not look up stored triage for bug {bug_id}: {e}")
+        return None
+    if stored:
+        triage_reuse_index.record_reuse()
+    return stored
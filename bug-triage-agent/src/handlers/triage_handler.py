@@ -2,26 +2,46 @@
 
 from typing import Dict, Any, List
 import logging
+import os
 from datetime import datetime, UTC
 import time
 import uuid
 
 from src.models.input_models import HandshakeMessage
-from src.models.output_models import HandshakeResponse, TriageResult, Classification, Priority, Assignment, SuggestedFix, ConfidenceScores
+from src.models.output_models import HandshakeResponse, TriageResult, Classification, Priority, Assignment, SuggestedFix, ConfidenceScores, CrashGroup, DuplicateOf
 from src.utils.validators import validate_input
 from src.utils.team_profile_loader import load_and_merge_profiles
 from src.utils.language_detector import detect_and_validate_language_file_type
 from src.utils.metrics import metrics_collector
-from src.engines.classification import classify_bug
+from src.utils.stack_trace_parser import compress_repeated_frames, exception_class, stack_fingerprint
+from src.utils.text_scanner import MAX_LOGS_BYTES, MAX_STACK_TRACE_BYTES, apply_byte_budget
+from src.engines.bug_model import predict_bug_classes
+from src.engines.classification import CLASSIFICATION_TIME_BUDGET_MS, classify_bug
 from src.engines.priority import assess_priority
-from src.engines.assignment import assign_bug
+from src.engines.assignment import assign_bug, extract_bug_module
+from src.engines.batch_assignment import assign_bugs_batch, assign_bugs_balanced
+from src.engines.bursts import BURST_DETECTION_ENABLED, burst_detector
+from src.engines.crash_groups import CRASH_GROUPING_ENABLED, crash_group_index
+from src.engines.duplicates import DUPLICATE_DETECTION_ENABLED, duplicate_index
 from src.engines.fix_suggestion import suggest_fix
+from src.engines.similar_bugs import find_similar_bugs_batch
+from src.engines.triage_reuse import (
+    TRIAGE_REUSE_ENABLED,
+    bug_content_hash,
+    find_reusable_result,
+    roster_version,
+    rules_version,
+    triage_reuse_index,
+)
 from src.database.severity_priority_rules import get_all_priority_rules
 from src.database.routing_rules import get_applicable_routing_rules
 from src.database.triage_history import save_triage_history
 
 logger = logging.getLogger("bug_triage_agent")
 
+# Batches at least this large are assigned with the vectorized score matrix
+BATCH_ASSIGNMENT_MIN_BUGS = int(os.getenv("BATCH_ASSIGNMENT_MIN_BUGS", "20"))
+
 
 def process_triage_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -77,8 +97,13 @@ def process_triage_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
             logger.warning(f"Could not load severity rules: {e}. Continuing without rules.")
             severity_rules = []
         
-        # Process each bug
-        triage_results = []
+        # Balanced assignments depend on the whole batch, so they are never reused
+        reuse_results = TRIAGE_REUSE_ENABLED and message.task.assignment_mode != "balanced"
+        versions = {"roster": roster_version(team_profiles), "rules": rules_version(severity_rules)}
+        roster_ids = {profile.get("member_id") for profile in team_profiles}
+        
+        # Prepare each bug
+        prepared_bugs = []
         warnings = []  # Collect warnings for missing optional fields
         
         for bug_input in message.task.bugs:
@@ -119,19 +144,121 @@ def process_triage_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
                 bug_dict = bug_input.model_dump()
             else:
                 bug_dict = bug_input.dict() if hasattr(bug_input, 'dict') else bug_input
+            
+            # Collapse repeated frames (deep recursion) first, so the byte budget
+            # only truncates traces that are still oversized once compressed
+            if bug_dict.get("stack_trace"):
+                bug_dict["stack_trace"] = compress_repeated_frames(bug_dict["stack_trace"])
+            
+            # Hold oversized free-text fields to their byte budgets
+            for field, max_bytes in (("stack_trace", MAX_STACK_TRACE_BYTES), ("logs", MAX_LOGS_BYTES)):
+                bug_dict[field], omitted = apply_byte_budget(bug_dict.get(field), max_bytes)
+                if omitted:
+                    warning_msg = f"Bug {bug_input.bug_id}: {field} exceeded {max_bytes} bytes; {omitted} bytes were truncated from the middle."
+                    warnings.append(warning_msg)
+                    logger.warning(warning_msg)
+            
+            # Another bug_id reporting the same incident (checked for retriaged bugs
+            # too, so the bug stays indexed and duplicate_of is current)
+            duplicate = None
+            if DUPLICATE_DETECTION_ENABLED:
+                duplicate = duplicate_index.check(bug_input.bug_id, bug_dict)
+            if duplicate and duplicate.assignment and duplicate.assignment.get("assigned_to_member_id") not in roster_ids:
+                # The canonical assignee is not in this request's roster, so score it instead
+                duplicate = duplicate._replace(assignment=None)
+            
+            # A retriaged bug with unchanged content reuses its stored result, unless
+            # it now copies the assignment of a duplicate
+            content_hash = bug_content_hash(bug_dict)
+            stored_result = None
+            if reuse_results and not (duplicate and duplicate.assignment):
+                stored_result = find_reusable_result(bug_input.bug_id, content_hash, versions)
+            prepared_bugs.append((bug_input, bug_dict, content_hash, stored_result, duplicate))
+        
+        # Nearest resolved historical bugs for the batch (known fixes and resolvers)
+        fresh_bugs = [prepared for prepared in prepared_bugs if prepared[3] is None]
+        batch_bug_dicts = [bug_dict for _, bug_dict, _, _, _ in fresh_bugs]
+        batch_similar_bugs = find_similar_bugs_batch(batch_bug_dicts)
+        similar_bugs_iter = iter(batch_similar_bugs)
+        
+        # Confirmed duplicates copy the canonical bug's assignment instead of being scored
+        scored_bug_dicts = []
+        scored_similar_bugs = []
+        for (_, bug_dict, _, _, duplicate), similar_bugs in zip(fresh_bugs, batch_similar_bugs):
+            if not (duplicate and duplicate.assignment):
+                scored_bug_dicts.append(bug_dict)
+                scored_similar_bugs.append(similar_bugs)
+        
+        # Balance the whole batch across members, or assign large batches in one vectorized pass
+        batch_assignments = None
+        if message.task.assignment_mode == "balanced":
+            batch_assignments = iter(assign_bugs_balanced(scored_bug_dicts, team_profiles, similar_bugs=scored_similar_bugs))
+        elif len(scored_bug_dicts) >= BATCH_ASSIGNMENT_MIN_BUGS:
+            batch_assignments = iter(assign_bugs_batch(scored_bug_dicts, team_profiles, similar_bugs=scored_similar_bugs))
+        
+        # Trained-model predictions for the batch in one vectorized pass (None -> rule engine)
+        model_predictions = iter(predict_bug_classes(batch_bug_dicts))
+        
+        # Process each bug
+        triage_results = []
+        
+        for bug_input, bug_dict, content_hash, stored_result, duplicate in prepared_bugs:
             code_context_dict = bug_dict.get("code_context")
             
-            # Classify bug
-            classification_result = classify_bug(bug_dict, code_context_dict)
+            if stored_result is not None:
+                # Classification, assignment and fix are reused and no history document
+                # is written; the occurrence is still counted below and the fields that
+                # depend on other bugs (crash group, bursts, priority) are recomputed
+                classification_result = {
+                    **stored_result["classification"],
+                    "confidence": stored_result["confidence_scores"]["classification_confidence"]
+                }
+            else:
+                similar_bugs = next(similar_bugs_iter)
+                
+                # Classify bug
+                classification_result = classify_bug(bug_dict, code_context_dict, next(model_predictions))
+                metrics_collector.record_classification_tier(classification_result.get("tier", "unknown"))
+                if classification_result.get("tier") == "budget_exceeded":
+                    warnings.append(
+                        f"Bug {bug_input.bug_id}: classification exceeded its {CLASSIFICATION_TIME_BUDGET_MS:.0f} ms "
+                        f"time budget; category and type are based on partial pattern matching."
+                    )
+            
+            # Count the crash among earlier bugs with the same stack fingerprint
+            fingerprint = stack_fingerprint(bug_dict.get("stack_trace")) if CRASH_GROUPING_ENABLED else None
+            crash_group = crash_group_index.observe(fingerprint, bug_input.bug_id) if fingerprint else None
+            
+            # Recent reports of the same module, category and crash
+            module = extract_bug_module(bug_dict)
+            burst_reports = None
+            if BURST_DETECTION_ENABLED:
+                if fingerprint is None and bug_dict.get("stack_trace"):
+                    fingerprint = stack_fingerprint(bug_dict["stack_trace"])
+                burst_reports = burst_detector.observe(module, classification_result["category"], fingerprint)
             
             # Assess priority
-            priority_result = assess_priority(bug_dict, classification_result, severity_rules)
+            priority_result = assess_priority(
+                bug_dict, classification_result, severity_rules,
+                crash_group.occurrences if crash_group else None,
+                burst_reports
+            )
             
             # Assign bug
-            assignment_result = assign_bug(bug_dict, team_profiles)
+            if stored_result is not None:
+                assignment_result = dict(stored_result["assignment"])
+            elif duplicate and duplicate.assignment:
+                assignment_result = dict(duplicate.assignment)
+            elif batch_assignments is not None:
+                assignment_result = next(batch_assignments)
+            else:
+                assignment_result = assign_bug(bug_dict, team_profiles, similar_bugs=similar_bugs)
             
             # Suggest fix
-            fix_result = suggest_fix(bug_dict, classification_result, code_context_dict)
+            if stored_result is not None:
+                fix_result = stored_result["suggested_fix"]
+            else:
+                fix_result = suggest_fix(bug_dict, classification_result, code_context_dict, similar_bugs, module)
             
             # Calculate overall confidence
             overall_confidence = (
@@ -155,7 +282,8 @@ def process_triage_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
                 assignment=Assignment(
                     assigned_to_member_id=assignment_result["assigned_to_member_id"],
                     assigned_to_name=assignment_result["assigned_to_name"],
-                    confidence=assignment_result["confidence"]
+                    confidence=assignment_result["confidence"],
+                    alternates=assignment_result.get("alternates")
                 ),
                 suggested_fix=SuggestedFix(
                     approach=fix_result["approach"],
@@ -166,17 +294,56 @@ def process_triage_request(request_data: Dict[str, Any]) -> Dict[str, Any]:
                     priority_confidence=priority_result.get("confidence", 0.5),
                     assignee_confidence=assignment_result.get("confidence", 0.5),
                     overall_confidence=overall_confidence
-                )
+                ),
+                duplicate_of=DuplicateOf(
+                    bug_id=duplicate.bug_id,
+                    similarity=duplicate.similarity,
+                    assignment_copied=duplicate.assignment is not None
+                ) if duplicate else None,
+                crash_group=CrashGroup(**crash_group._asdict()) if crash_group else None
             )
             
             triage_results.append(triage_result)
+            metrics_collector.record_triage(
+                classification_result["type"], module,
+                exception_class(bug_dict.get("stack_trace")), assignment_result["assigned_to_member_id"]
+            )
+            if DUPLICATE_DETECTION_ENABLED:
+                duplicate_index.record_assignment(bug_input.bug_id, assignment_result)
+            if crash_group:
+                crash_group_index.record_decision(fingerprint, {
+                    "bug_id": bug_input.bug_id,
+                    "category": classification_result["category"],
+                    "type": classification_result["type"],
+                    "priority": priority_result["level"],
+                    "assigned_to_member_id": assignment_result["assigned_to_member_id"]
+                })
+            
+            if stored_result is not None:
+                continue
             
             # Save to triage history
             try:
-                save_triage_history(bug_dict, classification_result, priority_result, assignment_result, fix_result)
+                saved = save_triage_history(
+                    bug_dict, classification_result, priority_result, assignment_result, fix_result,
+                    content_hash=content_hash,
+                    versions=versions,
+                    raw_output=triage_result.model_dump()
+                )
+                if saved:
+                    triage_reuse_index.add(bug_input.bug_id, content_hash)
             except Exception as e:
                 logger.warning(f"Could not save triage history: {e}")
         
+        # Persist new duplicate-index signatures and crash occurrences, one write each,
+        # and snapshot the burst sketch when it is due
+        if DUPLICATE_DETECTION_ENABLED:
+            duplicate_index.flush()
+        if CRASH_GROUPING_ENABLED:
+            crash_group_index.flush()
+        if BURST_DETECTION_ENABLED:
+            burst_detector.flush()
+        
         # Create response
         response_dict = {
             "message_id": str(uuid.uuid4()),
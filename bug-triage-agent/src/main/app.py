@@ -129,6 +129,15 @@ async def metrics():
     return metrics_collector.snapshot()
 
 
+@app.get("/rule-packs")
+async def rule_packs():
+    """
+    Return the active classification rule set version and its compile time.
+    """
+    from src.engines.rule_packs import rule_set_manager
+    return rule_set_manager.status()
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
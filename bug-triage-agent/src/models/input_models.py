@@ -71,6 +71,7 @@ class TaskAssignment(BaseModel):
     """Task assignment object"""
     bugs: List[BugInput] = Field(..., description="Array of bug objects to triage")
     team_profiles: List[TeamProfile] = Field(..., description="Array of team member profiles")
+    assignment_mode: Optional[str] = Field(None, description="Assignment mode: independent (default) or balanced")
 
     @field_validator('bugs')
     @classmethod
@@ -88,6 +89,14 @@ class TaskAssignment(BaseModel):
             raise ValueError("team_profiles array cannot be empty")
         return v
 
+    @field_validator('assignment_mode')
+    @classmethod
+    def validate_assignment_mode(cls, v):
+        """Validate assignment mode"""
+        if v is not None and v not in ["independent", "balanced"]:
+            raise ValueError("assignment_mode must be 'independent' or 'balanced'")
+        return v
+
 
 class HandshakeMessage(BaseModel):
     """Handshake message structure"""
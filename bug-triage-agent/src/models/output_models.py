@@ -1,6 +1,6 @@
 """Output schema models for Bug Triage Agent"""
 
-from typing import Optional
+from typing import Any, Dict, Optional, List
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -26,11 +26,20 @@ class Priority(BaseModel):
         return v
 
 
+class AlternateAssignee(BaseModel):
+    """Runner-up assignee object"""
+    member_id: str = Field(..., description="ID from team_profiles")
+    name: str = Field(..., description="Name from team_profiles")
+    score: float = Field(..., description="Raw assignment score")
+    confidence: float = Field(..., description="Confidence score (0.0 to 1.0)")
+
+
 class Assignment(BaseModel):
     """Assignment object"""
     assigned_to_member_id: str = Field(..., description="ID from team_profiles")
     assigned_to_name: str = Field(..., description="Name from team_profiles")
     confidence: float = Field(..., description="Confidence score (0.0 to 1.0)")
+    alternates: Optional[List[AlternateAssignee]] = Field(None, description="Next-best assignees, best first")
 
     @field_validator('confidence')
     @classmethod
@@ -64,6 +73,21 @@ class ConfidenceScores(BaseModel):
         return v
 
 
+class DuplicateOf(BaseModel):
+    """Near-duplicate hint object"""
+    bug_id: str = Field(..., description="Canonical bug this bug duplicates")
+    similarity: float = Field(..., description="Estimated Jaccard similarity of title, description and stack trace (0.0 to 1.0)")
+    assignment_copied: bool = Field(False, description="Whether the canonical bug's assignment was reused")
+
+
+class CrashGroup(BaseModel):
+    """Crash group object (bugs sharing a stack trace fingerprint)"""
+    fingerprint: str = Field(..., description="Hash of the exception name and top in-app frames")
+    occurrences: int = Field(..., description="Times the fingerprint has been seen, including this bug")
+    previous_bug_id: Optional[str] = Field(None, description="Last earlier bug with the fingerprint")
+    previous_decision: Optional[Dict[str, Any]] = Field(None, description="Triage decision made for that bug")
+
+
 class TriageResult(BaseModel):
     """Triage result object"""
     bug_id: str = Field(..., description="Matches input bug_id")
@@ -72,6 +96,8 @@ class TriageResult(BaseModel):
     assignment: Assignment = Field(..., description="Team member assignment")
     suggested_fix: Optional[SuggestedFix] = Field(None, description="Fix recommendation")
     confidence_scores: ConfidenceScores = Field(..., description="Detailed confidence metrics")
+    duplicate_of: Optional[DuplicateOf] = Field(None, description="Earlier bug reporting the same incident")
+    crash_group: Optional[CrashGroup] = Field(None, description="Recurring crash the bug belongs to")
 
 
 class TriageResponse(BaseModel):
@@ -89,6 +115,7 @@ class HandshakeResponse(BaseModel):
     status: str = Field(..., description="Status: completed, failed, or in_progress")
     timestamp: str = Field(..., description="ISO8601 timestamp")
     results: TriageResponse = Field(..., description="Triage results")
+    warnings: Optional[List[str]] = Field(None, description="Warnings about missing or truncated input fields")
 
     @field_validator('status')
     @classmethod
@@ -0,0 +1,80 @@
+"""Atomic, versioned writes of the .npy artifacts built by the offline scripts"""
+
+import json
+import os
+import shutil
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+
+# Array subdirectories kept per artifact directory: the newest, plus the
+# previous one for services still loading it
+ARTIFACT_VERSIONS_KEPT = 2
+
+
+def save_array(path: Path, array: np.ndarray) -> None:
+    """
+    Write an array beside its target and rename it into place
+
+    A loading service never sees a partial file, and a memory map of the
+    previous file keeps reading the old contents.
+
+    Args:
+        path: Target .npy path
+        array: Array to write
+    """
+    temporary = path.with_name(path.stem + ".tmp.npy")
+    np.save(temporary, array)
+    os.replace(temporary, path)
+
+
+def new_artifact_version(directory: Path) -> str:
+    """
+    Create the array subdirectory for a new build
+
+    Args:
+        directory: Artifact directory
+
+    Returns:
+        Version name (e.g. 20260105T093000123456Z), which sorts by build time
+    """
+    version = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%fZ")
+    (directory / version).mkdir(parents=True, exist_ok=True)
+    return version
+
+
+def publish_artifact(directory: Path, meta: Dict[str, Any]) -> None:
+    """
+    Point loaders at a finished build by replacing meta.json, then prune old builds
+
+    meta.json is replaced last, so a loader reading it never pairs arrays
+    from two builds. Subdirectories beyond ARTIFACT_VERSIONS_KEPT are removed.
+
+    Args:
+        directory: Artifact directory
+        meta: Metadata with the "version" returned by new_artifact_version
+    """
+    temporary = directory / "meta.json.tmp"
+    temporary.write_text(json.dumps(meta, indent=2, default=str), encoding="utf-8")
+    os.replace(temporary, directory / "meta.json")
+
+    builds = sorted(path for path in directory.iterdir() if path.is_dir() and path.name.endswith("Z"))
+    for stale in builds[:-ARTIFACT_VERSIONS_KEPT]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+
+def read_artifact_meta(directory: Path) -> Dict[str, Any]:
+    """
+    Read meta.json of the published build
+
+    Raises:
+        OSError: If nothing has been published
+    """
+    return json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+
+
+def artifact_path(directory: Path, meta: Dict[str, Any], name: str) -> Path:
+    """Path of an array file within the build meta.json names."""
+    return directory / meta["version"] / name
@@ -3,6 +3,8 @@
 import re
 from typing import Dict, Any, List, Optional
 
+from src.utils.module_resolver import get_module_resolver
+
 
 def parse_code_snippet(snippet: str) -> Dict[str, Any]:
     """
@@ -156,15 +158,7 @@ def analyze_file_path(file_path: str) -> Dict[str, Any]:
     path_lower = file_path.lower()
     
     # Detect module from path
-    module = None
-    if '/auth' in path_lower or '\\auth' in path_lower:
-        module = "auth"
-    elif '/api' in path_lower or '\\api' in path_lower:
-        module = "api"
-    elif '/db' in path_lower or '/database' in path_lower or '\\db' in path_lower:
-        module = "database"
-    elif '/ui' in path_lower or '/frontend' in path_lower:
-        module = "ui"
+    module = get_module_resolver().resolve(file_path)
     
     # Detect if test file
     is_test = 'test' in path_lower or 'spec' in path_lower
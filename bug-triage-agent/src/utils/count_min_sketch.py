@@ -0,0 +1,127 @@
+"""Time-decayed count-min sketch"""
+
+import hashlib
+import math
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Largest decay exponent held in the table before it is rescaled
+# (e**40 keeps float64 counts far from overflow)
+_MAX_EXPONENT = 40.0
+
+
+class DecayingCountMinSketch:
+    """
+    Count-min sketch whose counts halve every half_life_seconds.
+
+    Decay is applied forward: an event at time t adds 2**((t - landmark) /
+    half_life) to its cells, and estimates are scaled back by the same factor
+    at query time, so adding and estimating touch one cell per row. The table
+    is rescaled to a new landmark once the exponent grows large, which costs
+    O(width * depth) about every 40 half-lives.
+
+    Memory is fixed at width * depth float64 counters whatever the number of
+    distinct keys. Estimates never undercount; with conservative updates they
+    overcount by at most e / width of the total decayed count with
+    probability 1 - e**-depth.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, half_life_seconds: float = 300.0) -> None:
+        if width < 1 or depth < 1 or depth > 16:
+            raise ValueError("width must be positive and depth between 1 and 16")
+        if half_life_seconds <= 0:
+            raise ValueError("half_life_seconds must be positive")
+        self.width = width
+        self.depth = depth
+        self.half_life_seconds = float(half_life_seconds)
+        self._rate = math.log(2) / self.half_life_seconds
+        self._rows = np.arange(depth)
+        self._table = np.zeros((depth, width), dtype=np.float64)
+        # Set by the first event, so replayed or test timestamps need no warm-up
+        self._landmark: Optional[float] = None
+
+    def _columns(self, key: str) -> np.ndarray:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype=np.uint32) % self.width
+
+    def _exponent(self, now: float) -> float:
+        if self._landmark is None:
+            self._landmark = now
+        # Events far older than the landmark carry negligible weight either way
+        exponent = max((now - self._landmark) * self._rate, -_MAX_EXPONENT)
+        if exponent > _MAX_EXPONENT:
+            self._table *= math.exp(-exponent)
+            self._landmark = now
+            exponent = 0.0
+        return exponent
+
+    def add(self, key: str, count: float = 1.0, now: Optional[float] = None) -> float:
+        """
+        Count an event for a key
+
+        Args:
+            key: Key
+            count: Weight of the event
+            now: Event time in epoch seconds (defaults to the current time)
+
+        Returns:
+            Decayed count estimate for the key, including this event
+        """
+        now = time.time() if now is None else now
+        scale = math.exp(self._exponent(now))
+        columns = self._columns(key)
+        cells = self._table[self._rows, columns]
+        # Conservative update: raise only the cells below the new estimate
+        estimate = cells.min() + count * scale
+        self._table[self._rows, columns] = np.maximum(cells, estimate)
+        return float(estimate / scale)
+
+    def estimate(self, key: str, now: Optional[float] = None) -> float:
+        """Decayed count estimate for a key at time now (defaults to the current time)."""
+        now = time.time() if now is None else now
+        scale = math.exp(self._exponent(now))
+        return float(self._table[self._rows, self._columns(key)].min() / scale)
+
+    def total(self, now: Optional[float] = None) -> float:
+        """Upper bound on the decayed count of all events (the largest row sum)."""
+        now = time.time() if now is None else now
+        scale = math.exp(self._exponent(now))
+        return float(self._table.sum(axis=1).max() / scale)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the counter table."""
+        return self._table.nbytes
+
+    def to_state(self) -> Dict[str, Any]:
+        """Serializable state, for snapshots."""
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "half_life_seconds": self.half_life_seconds,
+            "landmark": self._landmark if self._landmark is not None else time.time(),
+            "table": self._table.tobytes(),
+        }
+
+    def merge_state(self, state: Dict[str, Any]) -> None:
+        """
+        Add the counts of a snapshot taken from a sketch of the same shape
+
+        Args:
+            state: Result of to_state
+
+        Raises:
+            ValueError: If the snapshot's width, depth or half-life differ
+        """
+        if (state["width"], state["depth"], float(state["half_life_seconds"])) != (
+            self.width, self.depth, self.half_life_seconds
+        ):
+            raise ValueError("snapshot shape does not match the sketch")
+        table = np.frombuffer(state["table"], dtype=np.float64).reshape(self.depth, self.width)
+        # Re-express both tables relative to the later landmark (factors <= 1, so nothing overflows)
+        landmark = max(self._landmark if self._landmark is not None else state["landmark"], state["landmark"])
+        if self._landmark is not None:
+            self._table *= math.exp((self._landmark - landmark) * self._rate)
+        self._table += table * math.exp((state["landmark"] - landmark) * self._rate)
+        self._landmark = landmark
@@ -0,0 +1,132 @@
+"""Multi-keyword matching utilities (Aho-Corasick)"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Sequence, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds every keyword in a single scan of the text."""
+
+    def __init__(self, keywords: Sequence[str]) -> None:
+        self.keywords: List[str] = list(keywords)
+        self._transitions: List[Dict[str, int]] = [{}]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        # The empty string occurs in every text, like ``"" in text``
+        self._always: Tuple[int, ...] = tuple(i for i, kw in enumerate(self.keywords) if kw == "")
+        self._build()
+
+    def _build(self) -> None:
+        goto = self._transitions
+        outputs: List[List[int]] = [[]]
+
+        # Trie of all keywords
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            if keyword:
+                outputs[state].append(keyword_id)
+
+        # Breadth-first failure links, folded into a complete transition table
+        fail = [0] * len(goto)
+        alphabet = {char for keyword in self.keywords for char in keyword}
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state].extend(outputs[fail[state]])
+            for char, next_state in list(goto[state].items()):
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+            for char in alphabet:
+                if char not in goto[state]:
+                    target = goto[fail[state]].get(char, 0)
+                    if target:
+                        goto[state][char] = target
+
+        self._outputs = [tuple(sorted(set(found))) for found in outputs]
+
+    def find(self, text: str) -> Set[int]:
+        """
+        Find the ids of all keywords that occur in text
+
+        Args:
+            text: Text to scan (match is case-sensitive)
+
+        Returns:
+            Set of keyword indices into ``keywords``
+        """
+        found: Set[int] = set(self._always)
+        transitions = self._transitions
+        outputs = self._outputs
+        state = 0
+        for char in text:
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+class RosterKeywordIndex:
+    """Compiled framework/domain vocabulary of a roster, mapped back to members."""
+
+    def __init__(self, member_keywords: Sequence[Sequence[str]]) -> None:
+        vocabulary: Dict[str, int] = {}
+        self.member_keyword_ids: List[List[int]] = []
+        for keywords in member_keywords:
+            ids = []
+            for keyword in keywords:
+                if keyword not in vocabulary:
+                    vocabulary[keyword] = len(vocabulary)
+                ids.append(vocabulary[keyword])
+            self.member_keyword_ids.append(ids)
+        self.vocabulary = vocabulary
+        self.automaton = KeywordAutomaton(list(vocabulary))
+
+    def keyword_hits(self, text: str) -> Set[int]:
+        """Return vocabulary ids of keywords present in text."""
+        return self.automaton.find(text)
+
+    def member_hits(self, text: str) -> List[int]:
+        """
+        Count keyword hits per member with one scan of text
+
+        Args:
+            text: Lowercased bug description
+
+        Returns:
+            Hit count for each member, in roster order (duplicates count twice)
+        """
+        hits = self.keyword_hits(text)
+        return [sum(1 for keyword_id in ids if keyword_id in hits) for ids in self.member_keyword_ids]
+
+
+@lru_cache(maxsize=32)
+def _compile_roster_index(member_keywords: Tuple[Tuple[str, ...], ...]) -> RosterKeywordIndex:
+    return RosterKeywordIndex(member_keywords)
+
+
+def get_roster_keyword_index(member_keywords: Sequence[Sequence[str]]) -> RosterKeywordIndex:
+    """
+    Get the compiled keyword index for a roster version
+
+    The roster's keyword lists are the version key, so an unchanged roster
+    reuses the automaton compiled for a previous request.
+
+    Args:
+        member_keywords: Lowercased keywords for each member, in roster order
+
+    Returns:
+        Compiled RosterKeywordIndex
+    """
+    return _compile_roster_index(tuple(tuple(keywords) for keywords in member_keywords))
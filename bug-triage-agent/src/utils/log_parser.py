@@ -0,0 +1,178 @@
+"""Streaming extraction of warning, error and exception records from logs"""
+
+import io
+import json
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+# Levels kept for classification
+KEPT_LEVELS = {"WARN", "ERROR", "FATAL"}
+
+# Distinct records kept per log; later new messages are only counted
+MAX_DISTINCT_RECORDS = 500
+
+# Only this many leading characters are searched for a level token
+LEVEL_PREFIX_CHARS = 80
+
+_LEVEL_ALIASES = {
+    "TRACE": "TRACE", "DEBUG": "DEBUG", "INFO": "INFO", "NOTICE": "INFO",
+    "WARN": "WARN", "WARNING": "WARN",
+    "ERROR": "ERROR", "ERR": "ERROR", "SEVERE": "ERROR",
+    "FATAL": "FATAL", "CRITICAL": "FATAL", "CRIT": "FATAL", "PANIC": "FATAL", "EMERG": "FATAL",
+}
+
+# "2024-05-01 12:00:00,123 [main] ERROR com.acme.Auth - token expired".
+# Uppercase only, so prose such as "an error occurred" is not a level.
+_LEVEL_TOKEN = re.compile(r"\b(" + "|".join(sorted(_LEVEL_ALIASES, key=len, reverse=True)) + r")\b")
+
+# key=value or key="quoted value"
+_LOGFMT_PAIR = re.compile(r'([\w.]+)=("(?:[^"\\]|\\.)*"|\S*)')
+
+_EXCEPTION_LINE = re.compile(
+    r'^\s*(?:Caused by:\s*|Exception in thread "[^"]*"\s+)?'
+    r"[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*(?:Exception|Error|Panic)\b(?::.*)?$"
+    r"|^\s*Traceback \(most recent call last\)"
+    r"|^\s*panic:"
+)
+
+# Digits, hex ids and UUIDs are masked so repeated messages deduplicate
+_VOLATILE = re.compile(r"\b(?:0x[0-9a-f]+|[0-9a-f]{8}-[0-9a-f-]{27}|\d+)\b", re.IGNORECASE)
+
+_LEVEL_KEYS = ("level", "severity", "lvl", "log.level", "loglevel")
+_MESSAGE_KEYS = ("msg", "message", "error", "err", "exception")
+
+
+class LogRecord(NamedTuple):
+    """One kept log record; level is None for bare exception lines"""
+    level: Optional[str]
+    message: str
+    count: int = 1
+
+
+def parse_log_line(line: str) -> Tuple[bool, Optional[LogRecord]]:
+    """
+    Parse one log line
+
+    Recognizes JSON lines, logfmt and plain lines with a timestamp/level
+    prefix, plus bare exception lines.
+
+    Args:
+        line: Log line
+
+    Returns:
+        Tuple of (whether the line carried a log level, record or None)
+    """
+    stripped = line.strip()
+    if not stripped:
+        return False, None
+
+    if stripped.startswith("{"):
+        try:
+            entry = json.loads(stripped)
+        except ValueError:
+            entry = None
+        if isinstance(entry, dict):
+            return True, _record_from_fields(entry)
+
+    if "=" in stripped:
+        fields = {key.lower(): value.strip('"') for key, value in _LOGFMT_PAIR.findall(stripped)}
+        if any(key in fields for key in _LEVEL_KEYS) and any(key in fields for key in _MESSAGE_KEYS):
+            return True, _record_from_fields(fields)
+
+    # Exception lines are kept but do not make a log structured on their own
+    if _EXCEPTION_LINE.match(stripped):
+        return False, LogRecord(None, stripped)
+
+    match = _LEVEL_TOKEN.search(stripped, 0, LEVEL_PREFIX_CHARS)
+    if match:
+        level = _LEVEL_ALIASES[match.group(1)]
+        message = stripped[match.end():].lstrip(" \t-:]|")
+        return True, LogRecord(level, message) if level in KEPT_LEVELS else None
+
+    return False, None
+
+
+def _record_from_fields(fields: Dict) -> Optional[LogRecord]:
+    level = next((fields[key] for key in _LEVEL_KEYS if key in fields), None)
+    level = _normalize_level(level)
+    if level not in KEPT_LEVELS:
+        return None
+
+    parts = []
+    for key in _MESSAGE_KEYS:
+        value = fields.get(key)
+        if isinstance(value, dict):
+            value = value.get("message") or value.get("type")
+        if value and isinstance(value, str) and value not in parts:
+            parts.append(value)
+    return LogRecord(level, " ".join(parts))
+
+
+def _normalize_level(level: Union[str, int, None]) -> Optional[str]:
+    # pino/bunyan numeric levels
+    if isinstance(level, (int, float)):
+        return "FATAL" if level >= 60 else "ERROR" if level >= 50 else "WARN" if level >= 40 else "INFO"
+    if isinstance(level, str):
+        return _LEVEL_ALIASES.get(level.strip().upper())
+    return None
+
+
+def extract_error_records(
+    logs: Union[str, Iterable[str]],
+    max_records: int = MAX_DISTINCT_RECORDS
+) -> Tuple[List[LogRecord], bool]:
+    """
+    Stream through logs keeping WARN/ERROR/FATAL records and exception lines
+
+    Lines are read one at a time; repeated messages (ignoring numbers and
+    ids) are kept once with a count.
+
+    Args:
+        logs: Log text or an iterable of lines (e.g. an open file)
+        max_records: Distinct records kept
+
+    Returns:
+        Tuple of (records in first-seen order, whether any line carried a log level)
+    """
+    lines = io.StringIO(logs) if isinstance(logs, str) else logs
+    records: Dict[Tuple[Optional[str], str], List] = {}
+    structured = False
+
+    for line in lines:
+        recognized, record = parse_log_line(line)
+        structured = structured or recognized
+        if record is None:
+            continue
+        key = (record.level, _VOLATILE.sub("#", record.message.lower()))
+        if key in records:
+            records[key][1] += 1
+        elif len(records) < max_records:
+            records[key] = [record, 1]
+
+    return [record._replace(count=count) for record, count in records.values()], structured
+
+
+def reduce_logs(logs: Optional[str]) -> Optional[str]:
+    """
+    Reduce logs to their deduplicated warning, error and exception records
+
+    Logs without any leveled (prefixed, JSON or logfmt) line are returned unchanged.
+
+    Args:
+        logs: Log text
+
+    Returns:
+        One line per kept record ("LEVEL message × N"), or the original logs
+    """
+    if not logs:
+        return logs
+
+    records, structured = extract_error_records(logs)
+    if not structured:
+        return logs
+
+    lines = []
+    for record in records:
+        line = f"{record.level} {record.message}" if record.level else record.message
+        lines.append(f"{line} × {record.count}" if record.count > 1 else line)
+    return "\n".join(lines)
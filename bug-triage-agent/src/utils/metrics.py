@@ -2,9 +2,26 @@
 
 from __future__ import annotations
 
+import os
 import time
 from threading import Lock
-from typing import Any, Dict
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from src.utils.space_saving import SpaceSaving, merged_top
+
+# Items counted per heavy-hitter tracker; any item above 1/capacity of the
+# traffic is guaranteed to be tracked
+HEAVY_HITTER_CAPACITY = int(os.getenv("HEAVY_HITTER_CAPACITY", "200"))
+
+# Items reported per tracker in snapshots
+HEAVY_HITTER_TOP = 20
+
+# Heavy hitters are counted per window of this many seconds; snapshots cover
+# the current and the previous window, so they reflect recent traffic
+HEAVY_HITTER_WINDOW_SECONDS = float(os.getenv("HEAVY_HITTER_WINDOW_SECONDS", "3600"))
+
+HEAVY_HITTER_DIMENSIONS = ("error_types", "modules", "exception_classes", "assignees")
 
 
 class MetricsCollector:
@@ -13,6 +30,7 @@ class MetricsCollector:
     def __init__(self) -> None:
         self._lock = Lock()
         self._service_start_ts = time.time()
+        self._caches: Dict[str, Any] = {}
         self.reset()
 
     def reset(self) -> None:
@@ -31,6 +49,27 @@ class MetricsCollector:
             self.healthy_health_checks = 0
             self.last_health_status: str = "unknown"
             self.last_health_check_ts: float | None = None
+            self.classification_tiers: Counter[str] = Counter()
+            self.heavy_hitters = self._new_heavy_hitters()
+            self.previous_heavy_hitters = self._new_heavy_hitters()
+            self._heavy_hitter_window_start = time.monotonic()
+
+    @staticmethod
+    def _new_heavy_hitters() -> Dict[str, SpaceSaving]:
+        return {dimension: SpaceSaving(HEAVY_HITTER_CAPACITY) for dimension in HEAVY_HITTER_DIMENSIONS}
+
+    def _rotate_heavy_hitters(self) -> None:
+        # Caller holds the lock
+        now = time.monotonic()
+        elapsed = now - self._heavy_hitter_window_start
+        if elapsed < HEAVY_HITTER_WINDOW_SECONDS:
+            return
+        # After a window with no traffic, the previous window is empty too
+        self.previous_heavy_hitters = (
+            self.heavy_hitters if elapsed < 2 * HEAVY_HITTER_WINDOW_SECONDS else self._new_heavy_hitters()
+        )
+        self.heavy_hitters = self._new_heavy_hitters()
+        self._heavy_hitter_window_start = now
 
     def record_request(
         self,
@@ -65,6 +104,30 @@ class MetricsCollector:
             self.last_health_status = status
             self.last_health_check_ts = time.time()
 
+    def record_classification_tier(self, tier: str) -> None:
+        """Record which classification tier decided a bug."""
+        with self._lock:
+            self.classification_tiers[tier] += 1
+
+    def record_triage(
+        self,
+        error_type: Optional[str],
+        module: Optional[str],
+        exception_class: Optional[str],
+        assignee: Optional[str],
+    ) -> None:
+        """Count a triaged bug's error type, module, exception class and assignee (None values are skipped)."""
+        with self._lock:
+            self._rotate_heavy_hitters()
+            for dimension, value in zip(HEAVY_HITTER_DIMENSIONS, (error_type, module, exception_class, assignee)):
+                if value:
+                    self.heavy_hitters[dimension].add(value)
+
+    def register_cache(self, name: str, cache: Any) -> None:
+        """Report a cache's ``stats()`` under ``caches`` in snapshots."""
+        with self._lock:
+            self._caches[name] = cache
+
     def uptime_seconds(self) -> float:
         """Return service uptime in seconds."""
         return time.time() - self._service_start_ts
@@ -81,6 +144,8 @@ class MetricsCollector:
             health_success_rate = (
                 self.healthy_health_checks / self.health_checks if self.health_checks else 0.0
             )
+            classified = sum(self.classification_tiers.values())
+            self._rotate_heavy_hitters()
 
             return {
                 "totals": {
@@ -104,6 +169,22 @@ class MetricsCollector:
                     "last_status": self.last_health_status,
                     "last_checked_at": self._format_ts(self.last_health_check_ts),
                 },
+                "classification_tiers": {
+                    "counts": dict(self.classification_tiers),
+                    "hit_rates": {
+                        tier: round(count / classified, 3) for tier, count in self.classification_tiers.items()
+                    },
+                },
+                "heavy_hitters": {
+                    dimension: [
+                        {"value": value, "count": count, "max_overcount": error}
+                        for value, count, error in merged_top(
+                            (self.previous_heavy_hitters[dimension], self.heavy_hitters[dimension]), HEAVY_HITTER_TOP
+                        )
+                    ]
+                    for dimension in HEAVY_HITTER_DIMENSIONS
+                },
+                "caches": {name: cache.stats() for name, cache in self._caches.items()},
                 "last_request_at": self._format_ts(self.last_request_ts),
                 "uptime_seconds": round(self.uptime_seconds(), 2),
             }
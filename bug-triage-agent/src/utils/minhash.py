@@ -0,0 +1,114 @@
+"""MinHash signatures and banded locality-sensitive hashing"""
+
+import zlib
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class MinHasher:
+    """
+    MinHash over string shingles. The fraction of equal positions in two
+    signatures estimates the Jaccard similarity of their shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # Coefficients below 2**32 keep a * hash + b inside uint64
+        self._a = rng.integers(1, int(_MAX_HASH), num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MAX_HASH), num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: Iterable[str]) -> np.ndarray:
+        """
+        Compute the signature of a shingle set
+
+        Args:
+            shingles: Shingles (duplicates are ignored)
+
+        Returns:
+            Uint32 array of num_perm minimum hash values
+        """
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in set(shingles)), dtype=np.uint64)
+        if not len(hashes):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        permuted = ((hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+class LSHIndex:
+    """
+    Banded LSH over MinHash signatures. Signatures are split into bands of
+    equal rows; keys that agree on every row of at least one band are
+    candidates, which are then scored on their full signatures.
+    """
+
+    def __init__(self, num_perm: int, bands: int) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, key: str, signature: np.ndarray) -> None:
+        """Index a signature under key (a key already indexed is left unchanged)."""
+        if key in self._signatures:
+            return
+        self._signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(key)
+
+    def remove(self, key: str) -> None:
+        """Drop a key and its band entries (an unknown key is ignored)."""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band_key)
+            if bucket is None or key not in bucket:
+                continue
+            bucket.remove(key)
+            if not bucket:
+                del buckets[band_key]
+
+    def query(self, signature: np.ndarray, threshold: float) -> List[Tuple[str, float]]:
+        """
+        Find indexed keys similar to a signature
+
+        Args:
+            signature: MinHash signature
+            threshold: Minimum estimated Jaccard similarity
+
+        Returns:
+            (key, similarity) pairs, most similar first
+        """
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        matches = [(key, signature_similarity(signature, self._signatures[key])) for key in candidates]
+        return sorted(
+            [(key, similarity) for key, similarity in matches if similarity >= threshold],
+            key=lambda match: (-match[1], match[0])
+        )
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the stored signatures."""
+        return sum(signature.nbytes for signature in self._signatures.values())
@@ -0,0 +1,169 @@
+"""File path to module resolution backed by module_ownership"""
+
+import hashlib
+import logging
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.database.module_ownership import get_module_path_patterns
+from src.utils.keyword_matcher import KeywordAutomaton
+from src.utils.refresh_cache import RefreshingLoader
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+# Built-in patterns, checked in order when no stored pattern matches.
+# "**/name" matches a path segment starting with "name" anywhere in the path.
+DEFAULT_MODULE_PATTERNS: List[Tuple[str, str]] = [
+    ("**/auth", "auth"),
+    ("**/api", "api"),
+    ("**/db", "database"),
+    ("**/database", "database"),
+    ("**/ui", "ui"),
+    ("**/frontend", "ui"),
+    ("**/user", "user"),
+    ("**/payment", "payment"),
+]
+
+# Seconds between checks of module_ownership for a new pattern version
+MODULE_RESOLVER_REFRESH_SECONDS = int(os.getenv("MODULE_RESOLVER_REFRESH_SECONDS", "300"))
+
+_TERMINAL = ""
+
+
+def normalize_path(file_path: str) -> str:
+    """Lowercase a path, use forward slashes and strip leading ./ and /"""
+    path = file_path.strip().lower().replace("\\", "/")
+    while path.startswith("./"):
+        path = path[2:]
+    return path.lstrip("/")
+
+
+class ModuleResolver:
+    """
+    Compiled path matcher: a character trie for anchored prefixes (longest
+    prefix wins) plus one automaton for "**/name" patterns (first rule wins).
+    Both resolve a path in a single pass over its characters.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[str, str]],
+        owners: Optional[Dict[str, List[str]]] = None,
+        version: str = "default"
+    ) -> None:
+        self.version = version
+        self.owners: Dict[str, List[str]] = dict(owners or {})
+        self._trie: Dict[str, Any] = {}
+        segment_patterns: List[str] = []
+        self._segment_modules: List[str] = []
+
+        for pattern, module in rules:
+            normalized = normalize_path(pattern)
+            if normalized.startswith("**/"):
+                segment_patterns.append("/" + normalized[3:].rstrip("*").rstrip("/"))
+                self._segment_modules.append(module)
+            else:
+                self._insert_prefix(normalized.rstrip("*"), module)
+
+        self._segments = KeywordAutomaton(segment_patterns)
+
+    def _insert_prefix(self, prefix: str, module: str) -> None:
+        node = self._trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        # Earlier rules win when two rules share a prefix
+        node.setdefault(_TERMINAL, module)
+
+    def resolve(self, file_path: str) -> Optional[str]:
+        """
+        Resolve a file path to a module name
+
+        Args:
+            file_path: File path string
+
+        Returns:
+            Module name or None
+        """
+        if not file_path:
+            return None
+
+        path = normalize_path(file_path)
+
+        # Longest anchored prefix
+        module = None
+        node = self._trie
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            module = node.get(_TERMINAL, module)
+        if module:
+            return module
+
+        # First "**/name" rule found anywhere in the path
+        matches = self._segments.find("/" + path)
+        if matches:
+            return self._segment_modules[min(matches)]
+        return None
+
+    def get_owners(self, module: Optional[str]) -> List[str]:
+        """Get owner member_ids recorded for a module"""
+        return self.owners.get(module, []) if module else []
+
+
+def build_module_resolver(ownership_docs: List[Dict[str, Any]]) -> ModuleResolver:
+    """
+    Compile module_ownership documents into a resolver
+
+    Stored path patterns take precedence over DEFAULT_MODULE_PATTERNS.
+
+    Args:
+        ownership_docs: Documents with module_name, path_patterns and owners
+
+    Returns:
+        Compiled ModuleResolver
+    """
+    rules: List[Tuple[str, str]] = []
+    owners: Dict[str, List[str]] = {}
+    digest = hashlib.sha1()
+    for doc in sorted(ownership_docs, key=lambda d: d["module_name"]):
+        module = doc["module_name"]
+        patterns = doc.get("path_patterns") or []
+        owners[module] = list(doc.get("owners") or [])
+        rules.extend((pattern, module) for pattern in patterns)
+        digest.update(repr((module, patterns, owners[module])).encode("utf-8"))
+    rules.extend(DEFAULT_MODULE_PATTERNS)
+    return ModuleResolver(rules, owners, version=digest.hexdigest()[:12])
+
+
+_DEFAULT_RESOLVER = ModuleResolver(DEFAULT_MODULE_PATTERNS)
+_resolver_cache = RefreshingLoader(
+    "module resolver",
+    lambda: build_module_resolver(get_module_path_patterns()),
+    _DEFAULT_RESOLVER,
+    MODULE_RESOLVER_REFRESH_SECONDS,
+)
+
+
+def get_module_resolver(use_database: bool = True) -> ModuleResolver:
+    """
+    Get the module resolver for the current module_ownership version
+
+    The database is consulted at most every MODULE_RESOLVER_REFRESH_SECONDS;
+    the resolver is only recompiled when the stored patterns change.
+
+    Args:
+        use_database: Whether to include patterns stored in module_ownership
+
+    Returns:
+        ModuleResolver instance
+    """
+    if not use_database:
+        return _DEFAULT_RESOLVER
+    return _resolver_cache.get()
+
+
+def reset_module_resolver() -> None:
+    """Drop the cached resolver so the next call reloads it (mainly used in tests)."""
+    _resolver_cache.reset()
@@ -0,0 +1,209 @@
+"""Path -> owner weight index built from CODEOWNERS and git history"""
+
+import hashlib
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.database.module_ownership import get_ownership_weight_documents
+from src.utils.module_resolver import normalize_path
+from src.utils.refresh_cache import RefreshingLoader
+
+
+# Seconds between checks of module_ownership for a new ownership index
+OWNERSHIP_INDEX_REFRESH_SECONDS = int(os.getenv("OWNERSHIP_INDEX_REFRESH_SECONDS", "600"))
+
+
+# A CODEOWNERS rule: (path prefix, anchored to the repository root, file order, owner weights)
+OwnershipRule = Tuple[str, bool, int, Dict[str, float]]
+
+
+def _prefixes(path: str) -> Iterator[Tuple[int, str]]:
+    """Yield (matched length, prefix) for a path itself, then each parent directory up to the root"""
+    yield len(path), path
+    end = path.rfind("/")
+    while end >= 0:
+        yield end + 1, path[:end + 1]
+        end = path.rfind("/", 0, end)
+    yield 0, ""
+
+
+class OwnershipIndex:
+    """
+    Compact path matcher from path prefixes and CODEOWNERS rules to owner weights.
+
+    Weights are stored in flat typed arrays (CSR layout) with interned
+    member ids. History prefixes resolve to the longest indexed prefix, one
+    hash probe per directory level. CODEOWNERS rules resolve like GitHub
+    does: the last matching rule in file order wins, and unanchored rules
+    ("docs/") match at any depth, which probes each path suffix as well.
+    The more specific of the two matches is used; matches of the same
+    directory are averaged.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[Tuple[str, Dict[str, float]]],
+        version: str = "empty",
+        rules: Iterable[OwnershipRule] = ()
+    ) -> None:
+        self.version = version
+        self._member_ids: Dict[str, int] = {}
+        self._member_names: List[str] = []
+        self._slots: Dict[str, int] = {}
+        # prefix -> (rule order, slot), for rules matched from the root and at any depth
+        self._anchored_rules: Dict[str, Tuple[int, int]] = {}
+        self._unanchored_rules: Dict[str, Tuple[int, int]] = {}
+        self._offsets = array("I", [0])
+        self._members = array("I")
+        self._weights = array("f")
+
+        for prefix, owner_weights in entries:
+            self._slots[normalize_path(prefix)] = self._add_weights(owner_weights)
+        for prefix, anchored, order, owner_weights in rules:
+            prefix = normalize_path(prefix)
+            table = self._anchored_rules if anchored or not prefix else self._unanchored_rules
+            table[prefix] = (order, self._add_weights(owner_weights))
+
+    def _add_weights(self, owner_weights: Dict[str, float]) -> int:
+        for member_id, weight in owner_weights.items():
+            if member_id not in self._member_ids:
+                self._member_ids[member_id] = len(self._member_names)
+                self._member_names.append(member_id)
+            self._members.append(self._member_ids[member_id])
+            self._weights.append(weight)
+        self._offsets.append(len(self._members))
+        return len(self._offsets) - 2
+
+    def __len__(self) -> int:
+        return len(self._slots) + len(self._anchored_rules) + len(self._unanchored_rules)
+
+    def _find_rule(self, path: str) -> Optional[Tuple[int, int]]:
+        """(matched length, slot) of the last CODEOWNERS rule in file order that matches"""
+        best: Optional[Tuple[int, int, int]] = None
+        for length, prefix in _prefixes(path):
+            rule = self._anchored_rules.get(prefix)
+            if rule is not None and (best is None or rule[0] > best[0]):
+                best = (rule[0], length, rule[1])
+        if self._unanchored_rules:
+            start = 0
+            while start < len(path):
+                for length, prefix in _prefixes(path[start:]):
+                    rule = self._unanchored_rules.get(prefix) if prefix else None
+                    if rule is not None and (best is None or rule[0] > best[0]):
+                        best = (rule[0], start + length, rule[1])
+                start = path.find("/", start) + 1 or len(path)
+        return (best[1], best[2]) if best else None
+
+    def _find_slots(self, file_path: str) -> List[int]:
+        path = normalize_path(file_path)
+        prefix_match = None
+        if self._slots:
+            prefix_match = next(
+                ((length, self._slots[prefix]) for length, prefix in _prefixes(path) if prefix in self._slots), None
+            )
+        rule_match = self._find_rule(path) if self._anchored_rules or self._unanchored_rules else None
+        if prefix_match is None or rule_match is None:
+            match = prefix_match or rule_match
+            return [match[1]] if match else []
+        if prefix_match[0] == rule_match[0]:
+            return [rule_match[1], prefix_match[1]]
+        return [max(prefix_match, rule_match)[1]]
+
+    def owner_weights(self, file_path: str) -> Dict[str, float]:
+        """
+        Get owner weights for the best match of a file path
+
+        Args:
+            file_path: File path string
+
+        Returns:
+            Mapping of member_id to weight (0.0 to 1.0), empty if not indexed
+        """
+        if not file_path or not len(self):
+            return {}
+        slots = self._find_slots(file_path)
+        weights: Dict[str, float] = {}
+        for slot in slots:
+            for i in range(self._offsets[slot], self._offsets[slot + 1]):
+                member = self._member_names[self._members[i]]
+                weights[member] = weights.get(member, 0.0) + float(self._weights[i]) / len(slots)
+        return weights
+
+    def owner_weight(self, file_path: str, member_id: str) -> float:
+        """
+        Get one member's ownership weight for a file path
+
+        Args:
+            file_path: File path string
+            member_id: Team member ID
+
+        Returns:
+            Weight between 0.0 and 1.0 (0.0 if not an owner)
+        """
+        if not file_path or member_id not in self._member_ids:
+            return 0.0
+        slots = self._find_slots(file_path)
+        member = self._member_ids[member_id]
+        weight = 0.0
+        for slot in slots:
+            for i in range(self._offsets[slot], self._offsets[slot + 1]):
+                if self._members[i] == member:
+                    weight += float(self._weights[i]) / len(slots)
+        return weight
+
+
+def build_ownership_index(documents: List[Dict]) -> OwnershipIndex:
+    """
+    Compile module_ownership ownership documents into an index
+
+    Args:
+        documents: Documents with path_prefix and owner_weights
+            ([{member_id, weight}, ...]); CODEOWNERS rules also carry
+            rule_order and anchored
+
+    Returns:
+        Compiled OwnershipIndex
+    """
+    entries = []
+    rules = []
+    digest = hashlib.sha1()
+    for doc in sorted(documents, key=lambda d: (d.get("rule_order", -1), d["path_prefix"])):
+        weights = {item["member_id"]: float(item["weight"]) for item in doc.get("owner_weights") or []}
+        if doc.get("rule_order") is None:
+            entries.append((doc["path_prefix"], weights))
+        else:
+            rules.append((doc["path_prefix"], bool(doc.get("anchored", True)), doc["rule_order"], weights))
+        digest.update(repr((
+            doc["path_prefix"], doc.get("rule_order"), doc.get("anchored"), sorted(weights.items())
+        )).encode("utf-8"))
+    return OwnershipIndex(entries, version=digest.hexdigest()[:12], rules=rules)
+
+
+_EMPTY_INDEX = OwnershipIndex([])
+_index_cache = RefreshingLoader(
+    "ownership index",
+    lambda: build_ownership_index(get_ownership_weight_documents()),
+    _EMPTY_INDEX,
+    OWNERSHIP_INDEX_REFRESH_SECONDS,
+)
+
+
+def get_ownership_index(use_database: bool = True) -> OwnershipIndex:
+    """
+    Get the ownership index for the current module_ownership version
+
+    Args:
+        use_database: Whether to load the index from module_ownership
+
+    Returns:
+        OwnershipIndex instance (empty without a database)
+    """
+    if not use_database:
+        return _EMPTY_INDEX
+    return _index_cache.get()
+
+
+def reset_ownership_index() -> None:
+    """Drop the cached index so the next call reloads it (mainly used in tests)."""
+    _index_cache.reset()
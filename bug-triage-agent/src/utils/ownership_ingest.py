@@ -0,0 +1,255 @@
+"""Offline ingestion of CODEOWNERS and git history into ownership documents"""
+
+import logging
+import subprocess
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger("bug_triage_agent")
+
+
+CODEOWNERS_LOCATIONS = ["CODEOWNERS", ".github/CODEOWNERS", "docs/CODEOWNERS", ".gitlab/CODEOWNERS"]
+
+# Marks the start of each commit in the streamed git log output
+_COMMIT_MARKER = "\x1e"
+
+
+class CodeownersRule(NamedTuple):
+    """A prefix-shaped CODEOWNERS rule"""
+    prefix: str
+    owners: List[str]
+    # Matched from the repository root ("/docs/", "src/auth/") rather than
+    # at any depth ("docs/", "**/docs/", "setup.py")
+    anchored: bool = True
+
+
+class OwnershipEntries(NamedTuple):
+    """Ingested ownership: history-weighted path prefixes and CODEOWNERS rules in file order"""
+    prefixes: Dict[str, Dict[str, float]]
+    rules: List[Tuple[str, bool, Dict[str, float]]]
+
+
+def find_codeowners(repo_path: str) -> Optional[Path]:
+    """
+    Find the CODEOWNERS file of a repository
+
+    Args:
+        repo_path: Repository root
+
+    Returns:
+        Path to CODEOWNERS or None if the repository has none
+    """
+    for location in CODEOWNERS_LOCATIONS:
+        candidate = Path(repo_path) / location
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def parse_codeowners(lines: Iterable[str]) -> List[CodeownersRule]:
+    """
+    Parse CODEOWNERS rules into path prefix rules
+
+    Only patterns that reduce to a path prefix are kept ("/src/auth/",
+    "/src/auth", "docs/**", "docs/", "**/docs/", "*"); extension globs such
+    as "*.js" cannot be expressed as a prefix and are skipped. As in
+    .gitignore, a pattern with a slash at its start or in its middle is
+    anchored to the repository root; any other pattern matches at any depth.
+
+    Args:
+        lines: CODEOWNERS file lines
+
+    Returns:
+        Rules in file order (the last matching rule wins)
+    """
+    rules = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("["):
+            continue
+        pattern, *owners = line.split()
+        anchored = "/" in pattern.rstrip("/")
+        if pattern.startswith("**/"):
+            pattern = pattern[3:]
+            anchored = False
+        prefix = codeowners_pattern_to_prefix(pattern)
+        if prefix is None:
+            logger.debug(f"Skipping CODEOWNERS pattern without a path prefix: {pattern}")
+            continue
+        if owners:
+            rules.append(CodeownersRule(prefix, owners, anchored or not prefix))
+    return rules
+
+
+def codeowners_pattern_to_prefix(pattern: str) -> Optional[str]:
+    """Convert a CODEOWNERS pattern to a path prefix, or None if it is not prefix-shaped"""
+    prefix = pattern.lstrip("/")
+    while prefix.endswith("*"):
+        prefix = prefix.rstrip("*")
+    if any(char in prefix for char in "*?[]!"):
+        return None
+    # "/src/auth" owns the directory like "/src/auth/"; names with an extension are files
+    if prefix and not prefix.endswith("/") and "." not in prefix.rsplit("/", 1)[-1]:
+        prefix += "/"
+    return prefix
+
+
+def iter_git_log(repo_path: str, since: Optional[str] = None) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Stream (author email, changed paths) per commit from ``git log --name-only``
+
+    Output is read line by line, so only one commit's file list is held in
+    memory regardless of history size.
+
+    Args:
+        repo_path: Repository root
+        since: Optional ``git log --since`` value
+
+    Yields:
+        Tuples of (author email, list of changed paths)
+    """
+    command = ["git", "-C", str(repo_path), "log", "--no-merges", "--name-only", f"--format={_COMMIT_MARKER}%ae"]
+    if since:
+        command.append(f"--since={since}")
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, errors="replace")
+    author = None
+    paths: List[str] = []
+    try:
+        for line in process.stdout:
+            line = line.rstrip("\n")
+            if line.startswith(_COMMIT_MARKER):
+                if author is not None and paths:
+                    yield author, paths
+                author, paths = line[len(_COMMIT_MARKER):].strip().lower(), []
+            elif line:
+                paths.append(line)
+        if author is not None and paths:
+            yield author, paths
+    finally:
+        process.stdout.close()
+        if process.wait() != 0:
+            logger.warning(f"git log exited with status {process.returncode}")
+
+
+class GitOwnershipAccumulator:
+    """
+    Counts touched files per (directory prefix, author). Memory is bounded by
+    the number of directories up to ``max_depth`` times the authors, not by
+    the length of the history.
+    """
+
+    def __init__(self, max_depth: int = 3) -> None:
+        self.max_depth = max_depth
+        self.counts: Dict[str, Counter] = defaultdict(Counter)
+        self.commits = 0
+
+    def add_commit(self, author: str, paths: Iterable[str]) -> None:
+        """Record one commit's changed paths for its author."""
+        self.commits += 1
+        prefixes = set()
+        for path in paths:
+            parts = path.strip("/").split("/")[:-1]
+            for depth in range(1, min(len(parts), self.max_depth) + 1):
+                prefixes.add("/".join(parts[:depth]) + "/")
+        for prefix in prefixes:
+            self.counts[prefix][author] += 1
+
+
+def _top_weights(weights: Dict[str, float], top_owners: int) -> Dict[str, float]:
+    top = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:top_owners]
+    return {member: round(weight, 4) for member, weight in top}
+
+
+def build_ownership_entries(
+    codeowners_rules: List[CodeownersRule],
+    accumulator: Optional[GitOwnershipAccumulator],
+    identity_map: Dict[str, str],
+    min_commits: int = 3,
+    top_owners: int = 5
+) -> OwnershipEntries:
+    """
+    Weight the owners of CODEOWNERS rules and of git history prefixes
+
+    CODEOWNERS owners share a weight of 1.0 per rule; a pattern repeated
+    later in the file replaces the earlier rule. Git authors are weighted by
+    their share of commits under the prefix. The two sources are combined
+    at lookup time (see OwnershipIndex). Only the ``top_owners`` heaviest
+    owners of each rule and prefix are kept.
+
+    Args:
+        codeowners_rules: Output of parse_codeowners
+        accumulator: Git history counts, or None to use CODEOWNERS only
+        identity_map: Lowercased email/handle -> member_id
+        min_commits: Minimum commits for a prefix to be indexed from history
+        top_owners: Owners kept per rule and prefix
+
+    Returns:
+        OwnershipEntries with the history prefixes and the rules in file order
+    """
+    codeowners_weights: Dict[Tuple[str, bool], Dict[str, float]] = {}
+    for prefix, owners, anchored in codeowners_rules:
+        members = [map_identity(owner, identity_map) for owner in owners]
+        weights: Dict[str, float] = defaultdict(float)
+        for member in members:
+            weights[member] += 1.0 / len(members)
+        # Re-inserting moves a repeated pattern to its last position in the file
+        codeowners_weights.pop((prefix, anchored), None)
+        codeowners_weights[(prefix, anchored)] = _top_weights(weights, top_owners)
+
+    git_weights: Dict[str, Dict[str, float]] = {}
+    if accumulator is not None:
+        for prefix, counter in accumulator.counts.items():
+            total = sum(counter.values())
+            if total < min_commits:
+                continue
+            weights: Dict[str, float] = defaultdict(float)
+            for author, count in counter.items():
+                weights[map_identity(author, identity_map)] += count / total
+            git_weights[prefix] = _top_weights(weights, top_owners)
+
+    rules = [(prefix, anchored, weights) for (prefix, anchored), weights in codeowners_weights.items()]
+    return OwnershipEntries(git_weights, rules)
+
+
+def map_identity(identity: str, identity_map: Dict[str, str]) -> str:
+    """Map a git email or CODEOWNERS handle to a member_id (unmapped identities are kept as-is)"""
+    key = identity.strip().lower()
+    if key in identity_map:
+        return identity_map[key]
+    return identity_map.get(key.lstrip("@"), key.lstrip("@"))
+
+
+def _ownership_document(module_name: str, prefix: str, weights: Dict[str, float]) -> Dict:
+    ranked = sorted(weights.items(), key=lambda item: (-item[1], item[0]))
+    return {
+        "module_name": module_name,
+        "path_prefix": prefix,
+        "owners": [member for member, _ in ranked],
+        "owner_weights": [{"member_id": member, "weight": weight} for member, weight in ranked],
+        "source": "ingest",
+    }
+
+
+def to_ownership_documents(entries: OwnershipEntries) -> List[Dict]:
+    """
+    Convert ownership entries to module_ownership documents
+
+    Args:
+        entries: Output of build_ownership_entries
+
+    Returns:
+        History documents keyed by ``module_name = "path:<prefix>"``, then
+        one document per CODEOWNERS rule keyed by ``"codeowners:/<prefix>"``
+        (anchored) or ``"codeowners:**/<prefix>"``, with its rule_order
+    """
+    documents = [
+        _ownership_document(f"path:{prefix}", prefix, weights)
+        for prefix, weights in sorted(entries.prefixes.items())
+    ]
+    for order, (prefix, anchored, weights) in enumerate(entries.rules):
+        document = _ownership_document(f"codeowners:{'/' if anchored else '**/'}{prefix}", prefix, weights)
+        document.update({"anchored": anchored, "rule_order": order})
+        documents.append(document)
+    return documents
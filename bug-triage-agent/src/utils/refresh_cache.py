@@ -0,0 +1,63 @@
+"""Periodically refreshed, versioned in-memory caches for database-backed data"""
+
+import logging
+import time
+from threading import Lock
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger("bug_triage_agent")
+
+T = TypeVar("T")
+
+
+class RefreshingLoader(Generic[T]):
+    """
+    Holds a value built from the database and reloads it at most once per
+    refresh interval. A reload that returns the same ``version`` keeps the
+    current object; a failed reload keeps serving the last good value, so an
+    unavailable database costs one attempt per interval rather than per call.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load: Callable[[], T],
+        default: T,
+        refresh_seconds: float,
+        version: Callable[[T], Any] = lambda value: getattr(value, "version", None),
+    ) -> None:
+        self.name = name
+        self._load = load
+        self._default = default
+        self._refresh_seconds = refresh_seconds
+        self._version = version
+        self._lock = Lock()
+        self._value: T = default
+        self._checked_at: Optional[float] = None
+
+    def get(self) -> T:
+        """Return the cached value, reloading it if the refresh interval has passed."""
+        with self._lock:
+            now = time.monotonic()
+            if self._checked_at is not None and now - self._checked_at < self._refresh_seconds:
+                return self._value
+            self._checked_at = now
+            try:
+                value = self._load()
+                if self._version(value) != self._version(self._value):
+                    logger.info(f"Loaded {self.name} version {self._version(value)}")
+                    self._value = value
+            except Exception as e:
+                logger.debug(f"Could not load {self.name}: {e}")
+            return self._value
+
+    def set(self, value: T) -> None:
+        """Replace the cached value (e.g. after an incremental update)."""
+        with self._lock:
+            self._value = value
+
+    def reset(self) -> None:
+        """Drop the cached value so the next call reloads it (mainly used in tests)."""
+        with self._lock:
+            self._value = self._default
+            self._checked_at = None
@@ -0,0 +1,216 @@
+"""Load-time checks and guarded compilation for classification regex patterns"""
+
+import os
+import re
+from typing import List, Optional, Pattern, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Longest span all wildcard gaps (".*", ".+", ".{m,n}") of a guarded pattern
+# may cover together. Matches are scanned in windows that share only
+# SCAN_OVERLAP_CHARS characters, so longer gaps were already unreliable.
+# Chained gaps backtrack in proportion to the product of their bounds, so
+# the unbounded ones share what the bounded ones leave (two ".*" get half
+# each), which keeps a search near linear in the window size.
+PATTERN_MAX_GAP_CHARS = int(os.getenv("PATTERN_MAX_GAP_CHARS", "256"))
+
+# Most unbounded repeats a pattern may chain (each one multiplies backtracking)
+MAX_UNBOUNDED_REPEATS = 2
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+if hasattr(sre_parse, "POSSESSIVE_REPEAT"):
+    _REPEATS.add(sre_parse.POSSESSIVE_REPEAT)
+
+
+class UnsafePatternError(re.error):
+    """A pattern that can backtrack catastrophically on crafted input"""
+
+
+def lint_pattern(pattern: str) -> List[str]:
+    """
+    Find constructs that can make a pattern backtrack catastrophically
+
+    Flags nested unbounded quantifiers ("(a+)+"), unbounded repeats of
+    alternations whose branches can start with the same character
+    ("(a|ab)*"), backreferences, more than MAX_UNBOUNDED_REPEATS unbounded
+    repeats in one pattern, and bounded wildcard gaps (".{0,500}") that
+    together span more than PATTERN_MAX_GAP_CHARS characters.
+
+    Args:
+        pattern: Regex source
+
+    Returns:
+        Problem descriptions (empty if the pattern is safe)
+
+    Raises:
+        re.error: If the pattern does not parse
+    """
+    problems: List[str] = []
+    parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    unbounded = _walk(parsed, problems, inside_repeat=False)
+    if unbounded > MAX_UNBOUNDED_REPEATS:
+        problems.append(f"{unbounded} unbounded repeats (at most {MAX_UNBOUNDED_REPEATS} allowed)")
+    _, bounded_span = _wildcard_gaps(parsed)
+    if bounded_span > PATTERN_MAX_GAP_CHARS:
+        problems.append(f"wildcard gaps span {bounded_span} characters (at most {PATTERN_MAX_GAP_CHARS} allowed)")
+    return problems
+
+
+def _walk(items, problems: List[str], inside_repeat: bool) -> int:
+    """Record problems under a parsed (sub)pattern and count its unbounded repeats"""
+    unbounded = 0
+    for op, av in items:
+        if op in _REPEATS:
+            low, high, sub = av
+            is_unbounded = high == sre_parse.MAXREPEAT
+            if is_unbounded:
+                unbounded += 1
+                if inside_repeat:
+                    problems.append("nested unbounded quantifier")
+                if _has_overlapping_branch(sub):
+                    problems.append("unbounded repeat of overlapping alternatives")
+            unbounded += _walk(sub, problems, inside_repeat or is_unbounded)
+        elif op is sre_parse.SUBPATTERN:
+            unbounded += _walk(av[-1], problems, inside_repeat)
+        elif op is sre_parse.BRANCH:
+            for branch in av[1]:
+                unbounded += _walk(branch, problems, inside_repeat)
+        elif op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS):
+            problems.append("backreference")
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            unbounded += _walk(av[1], problems, inside_repeat)
+        elif getattr(sre_parse, "ATOMIC_GROUP", None) is op:
+            unbounded += _walk(av, problems, inside_repeat)
+    return unbounded
+
+
+def _wildcard_gaps(items) -> Tuple[int, int]:
+    """Count a parsed (sub)pattern's unbounded wildcards and total the bounds of its bounded ones"""
+    unbounded = bounded_span = 0
+    for op, av in items:
+        if op in _REPEATS:
+            low, high, sub = av
+            if len(sub) == 1 and sub[0][0] is sre_parse.ANY:
+                if high == sre_parse.MAXREPEAT:
+                    unbounded += 1
+                else:
+                    bounded_span += high
+                continue
+            nested = [_wildcard_gaps(sub)]
+        elif op is sre_parse.SUBPATTERN:
+            nested = [_wildcard_gaps(av[-1])]
+        elif op is sre_parse.BRANCH:
+            nested = [_wildcard_gaps(branch) for branch in av[1]]
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            nested = [_wildcard_gaps(av[1])]
+        elif getattr(sre_parse, "ATOMIC_GROUP", None) is op:
+            nested = [_wildcard_gaps(av)]
+        else:
+            continue
+        for sub_unbounded, sub_span in nested:
+            unbounded += sub_unbounded
+            bounded_span += sub_span
+    return unbounded, bounded_span
+
+
+def _has_overlapping_branch(items) -> bool:
+    """Whether a repeated subpattern contains alternatives that can start alike"""
+    for op, av in items:
+        if op is sre_parse.BRANCH:
+            seen: Set[str] = set()
+            for branch in av[1]:
+                first = _first_chars(branch)
+                if first is None or seen & first:
+                    return True
+                seen |= first
+        elif op is sre_parse.SUBPATTERN and _has_overlapping_branch(av[-1]):
+            return True
+    return False
+
+
+def _first_chars(items) -> Optional[Set[str]]:
+    """Lowercase characters a (sub)pattern can start with, or None if unknown or empty"""
+    if not items:
+        return None
+    op, av = items[0]
+    if op is sre_parse.LITERAL:
+        return {chr(av).lower()}
+    if op is sre_parse.SUBPATTERN:
+        return _first_chars(av[-1])
+    if op in _REPEATS and av[0] > 0:
+        return _first_chars(av[2])
+    return None
+
+
+def bound_wildcards(pattern: str, max_gap: int = PATTERN_MAX_GAP_CHARS) -> str:
+    """
+    Rewrite unbounded wildcards (".*", ".+" and their lazy forms) outside
+    character classes so that all wildcard gaps together span at most
+    max_gap characters
+
+    The unbounded wildcards share equally what the pattern's bounded
+    wildcard gaps leave of max_gap, with at least one character each.
+
+    Args:
+        pattern: Regex source
+        max_gap: Longest span of all wildcard gaps together
+
+    Returns:
+        Rewritten regex source
+
+    Raises:
+        re.error: If the pattern does not parse
+    """
+    unbounded, bounded_span = _wildcard_gaps(sre_parse.parse(pattern))
+    gap = max(1, (max_gap - bounded_span) // max(unbounded, 1))
+    out: List[str] = []
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # A "]" right after "[" or "[^" is a literal member
+            lead = 2 if pattern[i + 1:i + 2] == "^" else 1
+            if pattern[i + lead:i + lead + 1] == "]":
+                out.append(pattern[i:i + lead + 1])
+                i += lead + 1
+                continue
+        elif char == "." and pattern[i + 1:i + 2] in ("*", "+"):
+            low = 0 if pattern[i + 1] == "*" else 1
+            out.append(f".{{{low},{gap}}}")
+            i += 2
+            continue
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+
+def compile_guarded(pattern: str, flags: int = re.IGNORECASE) -> Pattern[str]:
+    """
+    Lint a pattern, bound its wildcards and compile it
+
+    Args:
+        pattern: Regex source
+        flags: re flags
+
+    Returns:
+        Compiled pattern
+
+    Raises:
+        UnsafePatternError: If lint_pattern finds a problem
+        re.error: If the pattern does not parse
+    """
+    problems = lint_pattern(pattern)
+    if problems:
+        raise UnsafePatternError(f"unsafe pattern {pattern!r}: {'; '.join(problems)}")
+    return re.compile(bound_wildcards(pattern), flags)
@@ -0,0 +1,128 @@
+"""Space-Saving heavy-hitter tracking"""
+
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+
+class SpaceSaving:
+    """
+    Approximate top-k counter in fixed memory (Metwally et al. Space-Saving).
+
+    At most capacity items are counted. An unseen item replaces the item
+    with the smallest count and inherits that count as its error, so every
+    count overestimates by at most its error, and any item seen more than
+    total / capacity times is guaranteed to be tracked. Items are kept in
+    buckets by count, so each add is O(1).
+    """
+
+    def __init__(self, capacity: int = 200) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # count -> items with that count, oldest first (dicts keep insertion order)
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._min_count = 0
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _move(self, item: Hashable, old_count: int, new_count: int) -> None:
+        bucket = self._buckets[old_count]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[old_count]
+            if self._min_count == old_count:
+                self._min_count = new_count
+        self._buckets.setdefault(new_count, {})[item] = None
+        self._counts[item] = new_count
+
+    def add(self, item: Hashable) -> None:
+        """Count one occurrence of an item."""
+        self.total += 1
+        count = self._counts.get(item)
+        if count is not None:
+            self._move(item, count, count + 1)
+            return
+
+        if len(self._counts) < self.capacity:
+            self._counts[item] = 1
+            self._errors[item] = 0
+            self._buckets.setdefault(1, {})[item] = None
+            self._min_count = 1
+            return
+
+        # Replace the longest-held item with the smallest count
+        min_count = self._min_count
+        bucket = self._buckets[min_count]
+        evicted = next(iter(bucket))
+        del bucket[evicted], self._counts[evicted], self._errors[evicted]
+        bucket[item] = None
+        self._counts[item] = min_count
+        self._errors[item] = min_count
+        self._move(item, min_count, min_count + 1)
+
+    def estimate(self, item: Hashable) -> Tuple[int, int]:
+        """
+        Count and error of any item, tracked or not
+
+        An untracked item was seen at most as often as the smallest tracked
+        count once the tracker is full, and never otherwise.
+
+        Args:
+            item: Item
+
+        Returns:
+            (count, error); the true count lies between count - error and count
+        """
+        count = self._counts.get(item)
+        if count is not None:
+            return count, self._errors[item]
+        floor = self._min_count if len(self._counts) >= self.capacity else 0
+        return floor, floor
+
+    def top(self, n: int) -> List[Tuple[Hashable, int, int]]:
+        """
+        The n most frequent items
+
+        Args:
+            n: Number of items
+
+        Returns:
+            (item, count, error) tuples, highest count first; the true count
+            lies between count - error and count
+        """
+        ranked = sorted(self._counts.items(), key=lambda entry: (-entry[1], self._errors[entry[0]]))
+        return [(item, count, self._errors[item]) for item, count in ranked[:n]]
+
+    def clear(self) -> None:
+        """Drop all counts."""
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        self._buckets = {}
+        self._min_count = 0
+
+
+def merged_top(trackers: Sequence[SpaceSaving], n: int) -> List[Tuple[Hashable, int, int]]:
+    """
+    The n most frequent items across several trackers (e.g. consecutive windows)
+
+    Counts and errors are summed per item, with each tracker's estimate()
+    standing in for items it does not hold, so the bounds of top() still apply.
+
+    Args:
+        trackers: Trackers over disjoint parts of the stream
+        n: Number of items
+
+    Returns:
+        (item, count, error) tuples, highest count first
+    """
+    items = dict.fromkeys(item for tracker in trackers for item in tracker._counts)
+    merged = []
+    for item in items:
+        estimates = [tracker.estimate(item) for tracker in trackers]
+        merged.append((item, sum(count for count, _ in estimates), sum(error for _, error in estimates)))
+    merged.sort(key=lambda entry: (-entry[1], entry[2]))
+    return merged[:n]
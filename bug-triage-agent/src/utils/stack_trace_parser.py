@@ -0,0 +1,302 @@
+"""Stack trace parsing and frame-to-module attribution"""
+
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from src.utils.module_resolver import ModuleResolver, get_module_resolver
+
+
+class StackFrame(NamedTuple):
+    """One parsed stack frame"""
+    language: str
+    symbol: Optional[str]
+    file: Optional[str]
+    line: Optional[int]
+
+
+# Ordered: the first pattern that matches a line wins
+FRAME_PATTERNS: List[Tuple[str, "re.Pattern[str]"]] = [
+    # at com.acme.auth.AuthService.login(AuthService.java:42)
+    ("java", re.compile(
+        r"^\s*at\s+(?P<symbol>[\w$.<>/]+)\((?P<file>[\w$.-]+\.(?:java|kt|scala|groovy)|Unknown Source|Native Method)"
+        r"(?::(?P<line>\d+))?\)"
+    )),
+    # at Acme.Auth.AuthService.Login(String user) in C:\src\Auth\AuthService.cs:line 42
+    ("dotnet", re.compile(
+        r"^\s*at\s+(?P<symbol>[^\s(]+)\([^)]*\)(?:\s+in\s+(?P<file>.+?):line\s+(?P<line>\d+))?\s*$"
+    )),
+    # at login (/app/src/auth/login.ts:10:5)  |  at /app/src/auth/login.js:10:5
+    ("javascript", re.compile(
+        r"^\s*at\s+(?:(?P<symbol>.+?)\s+\()?(?P<file>[^()\s]+?):(?P<line>\d+):\d+\)?\s*$"
+    )),
+    # File "/app/auth/views.py", line 42, in login
+    ("python", re.compile(
+        r'^\s*File\s+"(?P<file>[^"]+)",\s+line\s+(?P<line>\d+)(?:,\s+in\s+(?P<symbol>\S+))?'
+    )),
+    # \t/go/src/github.com/acme/auth/token.go:42 +0x1d
+    ("go", re.compile(r"^\s*(?P<file>\S+\.go):(?P<line>\d+)(?:\s+\+0x[0-9a-fA-F]+)?\s*$")),
+]
+
+# Trailing repeat count left on a frame by compress_repeated_frames
+_REPEAT_SUFFIX = re.compile(r"\s+×\s+\d+\s*$")
+
+# http(s) URLs lose their host too; webpack:/// and file:// only their scheme
+_URL_PREFIX = re.compile(r"^(?:https?://[^/]*|[a-z][\w+.-]*:/+)", re.IGNORECASE)
+
+# In-app frames (innermost first) that make up a stack fingerprint
+STACK_FINGERPRINT_FRAMES = int(os.getenv("STACK_FINGERPRINT_FRAMES", "5"))
+
+# Runtime, standard library and framework frames, left out of fingerprints:
+# Java/.NET by package or namespace, everything else by file path
+_LIBRARY_SYMBOL = re.compile(
+    r"^(?:java|javax|jdk|sun|com\.sun|kotlin|kotlinx|scala|groovy|org\.springframework|org\.apache|"
+    r"org\.hibernate|io\.netty|System|Microsoft)\."
+)
+_LIBRARY_FILE = re.compile(
+    r"node_modules|site-packages|dist-packages|/lib/python\d|<frozen |^node:|^internal/|"
+    r"(?:^|/)go/src/(?:runtime|reflect|sync|net|testing)/"
+)
+
+# Parts of a frame that differ between builds or runs of the same crash
+_ADDRESS = re.compile(r"(?:/)?0x[0-9a-fA-F]+")
+_GENERATED_NUMBER = re.compile(r"\$\d+")
+_EXCEPTION_NAME = re.compile(r"\b(?:[A-Za-z_$][\w$]*\.)*([A-Z][\w$]*(?:Exception|Error|Panic|Fault))\b")
+
+# Parsed traces kept per trace hash
+STACK_TRACE_CACHE_SIZE = 1024
+
+# Longest cycle of frames (in lines) collapsed by compress_repeated_frames
+STACK_TRACE_MAX_CYCLE_LINES = int(os.getenv("STACK_TRACE_MAX_CYCLE_LINES", "8"))
+
+# Minimum consecutive repetitions before a frame or cycle is collapsed
+STACK_TRACE_MIN_REPEATS = 3
+
+_cache_lock = Lock()
+_frame_cache: "OrderedDict[bytes, Tuple[StackFrame, ...]]" = OrderedDict()
+_vote_cache: "OrderedDict[Tuple[bytes, str], Dict[str, float]]" = OrderedDict()
+
+
+def trace_digest(stack_trace: str) -> bytes:
+    """Hash a stack trace for cache keys"""
+    return hashlib.blake2b(stack_trace.encode("utf-8", "replace"), digest_size=16).digest()
+
+
+def parse_stack_trace(stack_trace: Optional[str]) -> Tuple[StackFrame, ...]:
+    """
+    Parse Java, Python, JavaScript/TypeScript, Go and .NET stack frames
+
+    Args:
+        stack_trace: Stack trace text
+
+    Returns:
+        Parsed frames, innermost first as they appear in the trace
+    """
+    if not stack_trace:
+        return ()
+
+    digest = trace_digest(stack_trace)
+    with _cache_lock:
+        if digest in _frame_cache:
+            _frame_cache.move_to_end(digest)
+            return _frame_cache[digest]
+
+    frames = []
+    for raw_line in stack_trace.splitlines():
+        raw_line = _REPEAT_SUFFIX.sub("", raw_line)
+        for language, pattern in FRAME_PATTERNS:
+            match = pattern.match(raw_line)
+            if match:
+                line = match.group("line")
+                frames.append(StackFrame(
+                    language,
+                    match.groupdict().get("symbol"),
+                    match.group("file"),
+                    int(line) if line else None
+                ))
+                break
+    parsed = tuple(frames)
+
+    with _cache_lock:
+        _frame_cache[digest] = parsed
+        if len(_frame_cache) > STACK_TRACE_CACHE_SIZE:
+            _frame_cache.popitem(last=False)
+    return parsed
+
+
+def compress_repeated_frames(
+    stack_trace: Optional[str],
+    max_cycle_lines: int = STACK_TRACE_MAX_CYCLE_LINES,
+    min_repeats: int = STACK_TRACE_MIN_REPEATS
+) -> Optional[str]:
+    """
+    Collapse consecutive repeated frames and frame cycles
+
+    A frame repeated N times becomes "frame × N"; a repeated cycle of up
+    to ``max_cycle_lines`` lines (e.g. mutual recursion, or Python frames
+    with their source line) is kept once followed by "[previous k lines × N]".
+    Runs are found in one pass: each position tries every cycle length up
+    to the bound and jumps past the longest run it finds.
+
+    Args:
+        stack_trace: Stack trace text
+        max_cycle_lines: Longest cycle to detect
+        min_repeats: Repetitions needed before a run is collapsed
+
+    Returns:
+        Compressed stack trace (unchanged if nothing repeats)
+    """
+    if not stack_trace:
+        return stack_trace
+
+    lines = stack_trace.splitlines()
+    line_count = len(lines)
+    output = []
+    start = 0
+    while start < line_count:
+        best_period, best_repeats = 0, 1
+        for period in range(1, max_cycle_lines + 1):
+            if start + period * min_repeats > line_count:
+                break
+            cycle = lines[start:start + period]
+            repeats = 1
+            end = start + period
+            while end + period <= line_count and lines[end:end + period] == cycle:
+                repeats += 1
+                end += period
+            # Prefer the run covering the most lines, then the shortest cycle
+            if repeats >= min_repeats and period * repeats > best_period * best_repeats:
+                best_period, best_repeats = period, repeats
+
+        if best_period == 0:
+            output.append(lines[start])
+            start += 1
+            continue
+
+        if best_period == 1:
+            output.append(f"{lines[start]} × {best_repeats}")
+        else:
+            first = lines[start]
+            indent = first[:len(first) - len(first.lstrip())]
+            output.extend(lines[start:start + best_period])
+            output.append(f"{indent}[previous {best_period} lines × {best_repeats}]")
+        start += best_period * best_repeats
+
+    if len(output) == line_count:
+        return stack_trace
+    return "\n".join(output)
+
+
+def frame_path(frame: StackFrame) -> Optional[str]:
+    """
+    Get a path-like location for a frame to run through the module resolver
+
+    File paths are used as-is (URLs lose their scheme and host); Java and
+    .NET frames without a directory fall back to their package or namespace.
+    """
+    if frame.file and ("/" in frame.file or "\\" in frame.file):
+        return _URL_PREFIX.sub("", frame.file)
+
+    if frame.symbol and frame.language in ("java", "dotnet"):
+        # com.acme.auth.AuthService.login -> com/acme/auth/AuthService
+        parts = frame.symbol.split("$")[0].split(".")[:-1]
+        if parts:
+            return "/".join(parts)
+    return frame.file
+
+
+def innermost_first(frames: Tuple[StackFrame, ...]) -> List[StackFrame]:
+    """Order frames from the crash site outwards (Python prints the innermost frame last)."""
+    if frames and frames[0].language == "python":
+        return list(reversed(frames))
+    return list(frames)
+
+
+def get_module_votes(
+    stack_trace: Optional[str],
+    resolver: Optional[ModuleResolver] = None,
+    use_database: bool = True
+) -> Dict[str, float]:
+    """
+    Attribute stack frames to modules
+
+    Each frame's file or package is resolved to a module; frames nearer the
+    crash carry more weight (1 / (1 + position), innermost frame first, so
+    Python tracebacks are read bottom-up).
+
+    Args:
+        stack_trace: Stack trace text
+        resolver: Module resolver (defaults to the shared resolver)
+        use_database: Whether the default resolver may use module_ownership
+
+    Returns:
+        Mapping of module name to vote share, summing to 1.0 (empty if no frame resolves)
+    """
+    if not stack_trace:
+        return {}
+    resolver = resolver or get_module_resolver(use_database)
+
+    key = (trace_digest(stack_trace), resolver.version)
+    with _cache_lock:
+        if key in _vote_cache:
+            _vote_cache.move_to_end(key)
+            return dict(_vote_cache[key])
+
+    votes: Dict[str, float] = {}
+    for position, frame in enumerate(innermost_first(parse_stack_trace(stack_trace))):
+        module = resolver.resolve(frame_path(frame) or "")
+        if module:
+            votes[module] = votes.get(module, 0.0) + 1.0 / (1 + position)
+    total = sum(votes.values())
+    votes = {module: weight / total for module, weight in sorted(votes.items(), key=lambda item: -item[1])}
+
+    with _cache_lock:
+        _vote_cache[key] = votes
+        if len(_vote_cache) > STACK_TRACE_CACHE_SIZE:
+            _vote_cache.popitem(last=False)
+    return dict(votes)
+
+
+def is_library_frame(frame: StackFrame) -> bool:
+    """Whether a frame belongs to the runtime, standard library or a third-party package"""
+    if frame.language in ("java", "dotnet") and frame.symbol:
+        return bool(_LIBRARY_SYMBOL.match(frame.symbol))
+    return bool(frame.file and _LIBRARY_FILE.search(frame.file.replace("\\", "/")))
+
+
+def exception_class(text: Optional[str]) -> Optional[str]:
+    """Unqualified name of the first exception class mentioned in text (e.g. a stack trace)."""
+    match = _EXCEPTION_NAME.search(text or "")
+    return match.group(1) if match else None
+
+
+def stack_fingerprint(stack_trace: Optional[str], max_frames: int = STACK_FINGERPRINT_FRAMES) -> Optional[str]:
+    """
+    Fingerprint a crash from its exception name and top in-app frames
+
+    Line numbers, addresses, generated lambda/anonymous class numbers and
+    directories above the last two path components are dropped, so the
+    same crash in another build or deployment gets the same fingerprint.
+    Traces with no in-app frame use their top frames instead.
+
+    Args:
+        stack_trace: Stack trace text
+        max_frames: Number of frames hashed
+
+    Returns:
+        16-character hex fingerprint, or None if no frame was parsed
+    """
+    frames = innermost_first(parse_stack_trace(stack_trace))
+    if not frames:
+        return None
+    top = [frame for frame in frames if not is_library_frame(frame)][:max_frames] or frames[:max_frames]
+
+    parts = [exception_class(stack_trace) or ""]
+    for frame in top:
+        symbol = _GENERATED_NUMBER.sub("$", _ADDRESS.sub("", frame.symbol or ""))
+        location = "/".join(_URL_PREFIX.sub("", (frame.file or "").replace("\\", "/")).split("/")[-2:])
+        parts.append(f"{symbol}@{location}")
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=8).hexdigest()
@@ -0,0 +1,151 @@
+"""Size budgets and windowed pattern scanning for large bug text fields"""
+
+import os
+import re
+import time
+from typing import Iterator, Optional, Pattern, Tuple, Union
+
+# Per-field byte budgets; larger values keep their head and tail
+MAX_STACK_TRACE_BYTES = int(os.getenv("MAX_STACK_TRACE_BYTES", str(256 * 1024)))
+MAX_LOGS_BYTES = int(os.getenv("MAX_LOGS_BYTES", str(1024 * 1024)))
+
+# Characters scanned per window, plus the lookahead shared with the next window.
+# Matches longer than the overlap can be missed at window boundaries.
+SCAN_WINDOW_CHARS = int(os.getenv("SCAN_WINDOW_CHARS", str(64 * 1024)))
+SCAN_OVERLAP_CHARS = int(os.getenv("SCAN_OVERLAP_CHARS", "1024"))
+
+TRUNCATION_MARKER = "\n... [{omitted} bytes truncated] ...\n"
+
+
+class ScanBudgetExceeded(Exception):
+    """Raised when a scan runs past its ScanBudget deadline"""
+
+
+class ScanBudget:
+    """
+    Wall-clock budget shared by every pattern scan of one bug
+
+    A running regex search cannot be interrupted, so the deadline is
+    checked before each pattern and each window; one search over one
+    window (kept linear by guarded patterns) is the most it can overrun.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.started = time.perf_counter()
+        self.deadline = self.started + seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the budget started"""
+        return time.perf_counter() - self.started
+
+    def check(self) -> None:
+        """
+        Raise if the deadline has passed
+
+        Raises:
+            ScanBudgetExceeded: If the budget is spent
+        """
+        if time.perf_counter() > self.deadline:
+            raise ScanBudgetExceeded(f"scan exceeded {self.seconds * 1000:.0f} ms budget")
+
+
+def apply_byte_budget(text: Optional[str], max_bytes: int) -> Tuple[Optional[str], int]:
+    """
+    Cut a text field down to a UTF-8 byte budget, keeping its head and tail
+
+    The first and last half of the budget are kept (the exception header
+    and the innermost frames or latest log lines) with a marker in between.
+
+    Args:
+        text: Field value
+        max_bytes: Byte budget (0 or less disables the budget)
+
+    Returns:
+        Tuple of (text within budget, number of bytes removed)
+    """
+    # A character is at most 4 bytes, so short text can skip the encode
+    if not text or max_bytes <= 0 or len(text) * 4 <= max_bytes:
+        return text, 0
+
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text, 0
+
+    half = max_bytes // 2
+    omitted = len(data) - 2 * half
+    # Partial multi-byte characters at the cut points are dropped
+    head = data[:half].decode("utf-8", "ignore")
+    tail = data[len(data) - half:].decode("utf-8", "ignore")
+    return head + TRUNCATION_MARKER.format(omitted=omitted) + tail, omitted
+
+
+def iter_windows(
+    text: str,
+    window: int = SCAN_WINDOW_CHARS,
+    overlap: int = SCAN_OVERLAP_CHARS
+) -> Iterator[Tuple[int, str]]:
+    """
+    Split text into windows that each own ``window`` characters and look
+    ``overlap`` characters ahead into the next one
+
+    Args:
+        text: Text to split
+        window: Characters owned by each window
+        overlap: Lookahead characters
+
+    Yields:
+        Tuples of (offset of the window in text, window text)
+    """
+    for start in range(0, len(text), window):
+        yield start, text[start:start + window + overlap]
+
+
+def count_matches(
+    pattern: Union[str, Pattern[str]],
+    text: str,
+    window: int = SCAN_WINDOW_CHARS,
+    overlap: int = SCAN_OVERLAP_CHARS,
+    budget: Optional[ScanBudget] = None
+) -> int:
+    """
+    Count non-overlapping case-insensitive matches of a pattern
+
+    Text longer than one window is scanned window by window so a pattern
+    such as "sql.*injection" never runs over more than one window plus
+    overlap. A match is only counted by the window it starts in, and not
+    if an earlier match already covered its start, so counts equal
+    ``len(re.findall(...))`` for matches shorter than the overlap.
+
+    Args:
+        pattern: Regex pattern (compiled with re.IGNORECASE when a string)
+        text: Text to scan
+        window: Characters owned by each window
+        overlap: Lookahead characters
+        budget: Optional budget checked before each window
+
+    Returns:
+        Number of matches
+
+    Raises:
+        ScanBudgetExceeded: If the budget runs out
+    """
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern, re.IGNORECASE)
+    if budget is not None:
+        budget.check()
+    if len(text) <= window + overlap:
+        return len(pattern.findall(text))
+
+    count = 0
+    resume = 0
+    for offset, chunk in iter_windows(text, window, overlap):
+        if budget is not None and offset:
+            budget.check()
+        for match in pattern.finditer(chunk, max(resume - offset, 0)):
+            if match.start() >= window:
+                break
+            count += 1
+            # Empty matches advance by one like re.findall
+            resume = offset + max(match.end(), match.start() + 1)
+    return count
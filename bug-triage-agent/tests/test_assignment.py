@@ -0,0 +1,44 @@
+"""Tests for assignment engine"""
+
+from src.engines.assignment import assign_bug, ASSIGNMENT_ALTERNATES
+from src.models.output_models import Assignment
+
+
+def _profile(member_id, languages, frameworks=None, current_load=None):
+    return {
+        "member_id": member_id,
+        "name": member_id.upper(),
+        "skills": {"languages": languages, "frameworks": frameworks or [], "domains": []},
+        "modules_owned": [],
+        "current_load": current_load
+    }
+
+
+def test_assign_bug_returns_ranked_alternates():
+    """Runner-up members are returned best first, without the assignee"""
+    profiles = [
+        _profile("dev-01", ["python"]),
+        _profile("dev-02", ["java"], ["spring"]),
+        _profile("dev-03", ["java"]),
+        _profile("dev-04", ["java"], current_load=0),
+        _profile("dev-05", ["java"], ["spring"], current_load=0),
+    ]
+    bug = {"bug_id": "B1", "title": "t", "description": "spring context fails", "language": "java"}
+
+    result = assign_bug(bug, profiles, db_available=False)
+
+    assert result["assigned_to_member_id"] == "dev-05"
+    assert [alt["member_id"] for alt in result["alternates"]] == ["dev-02", "dev-04", "dev-03"][:ASSIGNMENT_ALTERNATES]
+    assert result["alternates"][0]["score"] == 6.0
+    assert Assignment(**result).alternates[0].confidence == 0.6
+
+
+def test_assign_bug_alternates_skip_zero_scores():
+    """Members that do not score are never offered as alternates"""
+    profiles = [_profile("dev-01", ["java"]), _profile("dev-02", ["go"])]
+    bug = {"bug_id": "B1", "title": "t", "description": "d", "language": "java"}
+
+    result = assign_bug(bug, profiles, db_available=False)
+
+    assert result["assigned_to_member_id"] == "dev-01"
+    assert result["alternates"] == []
@@ -0,0 +1,197 @@
+"""Tests for vectorized batch assignment"""
+
+from unittest.mock import patch
+
+from src.engines.assignment import assign_bug, calculate_assignment_score, extract_module_from_path
+from src.utils.module_resolver import reset_module_resolver
+from src.utils.ownership_index import reset_ownership_index
+from src.engines.batch_assignment import (
+    assign_bugs_balanced,
+    assign_bugs_batch,
+    build_score_matrix,
+    compute_member_capacities,
+)
+
+
+TEAM_PROFILES = [
+    {
+        "member_id": "dev-01",
+        "name": "Hassan Raza",
+        "skills": {"languages": ["java", "python"], "frameworks": ["spring"], "domains": ["backend", "auth"]},
+        "modules_owned": ["auth"],
+        "current_load": 2
+    },
+    {
+        "member_id": "dev-02",
+        "name": "Sara Ahmed",
+        "skills": {"languages": ["javascript"], "frameworks": ["react"], "domains": ["ui"]},
+        "modules_owned": None,
+        "current_load": 0
+    },
+    {
+        "member_id": "dev-03",
+        "name": "Ali Khan",
+        "skills": ["python", "go"],
+        "modules_owned": ["payment", "api"],
+        "current_load": 7
+    }
+]
+
+BUGS = [
+    {"bug_id": "B1", "title": "NPE", "description": "Spring auth backend crash", "language": "java",
+     "code_context": {"file_path": "src/auth/AuthService.java"}},
+    {"bug_id": "B2", "title": "UI", "description": "React ui layout broken", "language": "JavaScript"},
+    {"bug_id": "B3", "title": "Payments", "description": "python payment flow", "language": "python",
+     "code_context": {"file_path": "services/payment/charge.py"}},
+    {"bug_id": "B4", "title": "Unknown", "description": "nothing matches", "language": "rust"},
+]
+
+
+def _scalar_scores(db_available):
+    rows = []
+    for bug in BUGS:
+        module = extract_module_from_path((bug.get("code_context") or {}).get("file_path", ""), db_available)
+        rows.append([
+            calculate_assignment_score(bug, profile, bug.get("language"), module, db_available)
+            for profile in TEAM_PROFILES
+        ])
+    return rows
+
+
+def test_score_matrix_matches_scalar_scores():
+    """Every matrix cell equals calculate_assignment_score"""
+    matrix = build_score_matrix(BUGS, TEAM_PROFILES, db_available=False)
+    assert matrix.shape == (len(BUGS), len(TEAM_PROFILES))
+    assert matrix.tolist() == _scalar_scores(False)
+
+
+@patch("src.engines.assignment.check_routing_rules", return_value=None)
+@patch("src.engines.batch_assignment.check_routing_rules", return_value=None)
+@patch("src.engines.assignment.get_developer_load")
+@patch("src.engines.batch_assignment.get_developer_load")
+@patch("src.engines.assignment.get_team_member")
+@patch("src.engines.batch_assignment.get_team_member")
+def test_score_matrix_matches_scalar_scores_with_database(
+    batch_member, scalar_member, batch_load, scalar_load, *_routing
+):
+    """Database-backed terms are applied identically"""
+    db_members = {
+        "dev-02": {"skills": {"languages": ["rust"]}, "modules_owned": ["auth"]},
+        "dev-03": {"skills": {"languages": ["java"]}, "modules_owned": []},
+    }
+    loads = {"dev-01": {"current_load_score": 0.9}, "dev-02": {"current_load_score": 0.1}}
+    for mock in (batch_member, scalar_member):
+        mock.side_effect = db_members.get
+    for mock in (batch_load, scalar_load):
+        mock.side_effect = loads.get
+
+    ownership = [{"module_name": "payment", "path_patterns": [], "owners": ["dev-01"]}]
+    path_weights = [{"path_prefix": "src/auth/", "owner_weights": [
+        {"member_id": "dev-02", "weight": 0.3}, {"member_id": "dev-03", "weight": 0.7}
+    ]}]
+    reset_module_resolver()
+    reset_ownership_index()
+    try:
+        with patch("src.utils.module_resolver.get_module_path_patterns", return_value=ownership), \
+                patch("src.utils.ownership_index.get_ownership_weight_documents", return_value=path_weights):
+            matrix = build_score_matrix(BUGS, TEAM_PROFILES, db_available=True)
+            assert matrix.tolist() == _scalar_scores(True)
+            assert matrix[2, 0] == 5.0 + 3.5 - 1.5
+            assert matrix[0, 2] > 0
+            assert assign_bugs_batch(BUGS, TEAM_PROFILES) == [assign_bug(bug, TEAM_PROFILES) for bug in BUGS]
+    finally:
+        reset_module_resolver()
+        reset_ownership_index()
+
+
+def test_assign_bugs_batch_matches_assign_bug():
+    """Batch mode picks the same member and confidence as assign_bug"""
+    expected = [assign_bug(bug, TEAM_PROFILES, db_available=False) for bug in BUGS]
+    assert assign_bugs_batch(BUGS, TEAM_PROFILES, db_available=False) == expected
+
+
+def test_assign_bugs_batch_empty_roster():
+    """An empty roster falls back to an unknown assignee"""
+    result = assign_bugs_batch(BUGS[:1], [], db_available=False)
+    assert result[0]["assigned_to_member_id"] == "unknown"
+
+
+def test_balanced_assignment_spreads_load():
+    """A batch that favours one member is spread across the roster"""
+    profiles = [
+        {"member_id": "dev-01", "name": "A", "skills": {"languages": ["java"]}, "current_load": 0},
+        {"member_id": "dev-02", "name": "B", "skills": {"languages": ["java"]}, "current_load": 3},
+    ]
+    bugs = [
+        {"bug_id": f"B{i}", "title": "t", "description": "d", "language": "java"}
+        for i in range(10)
+    ]
+    independent = assign_bugs_batch(bugs, profiles, db_available=False)
+    assert {a["assigned_to_member_id"] for a in independent} == {"dev-01"}
+
+    balanced = assign_bugs_balanced(bugs, profiles, db_available=False)
+    counts = {}
+    for assignment in balanced:
+        counts[assignment["assigned_to_member_id"]] = counts.get(assignment["assigned_to_member_id"], 0) + 1
+    assert counts == {"dev-01": 6, "dev-02": 4}
+
+
+def test_balanced_assignment_keeps_best_match_when_capacity_allows():
+    """With enough headroom every bug keeps its best-scoring member"""
+    expected = assign_bugs_batch(BUGS, TEAM_PROFILES, db_available=False)
+    assert assign_bugs_balanced(BUGS, TEAM_PROFILES, db_available=False) == expected
+
+
+def test_balanced_assignment_respects_time_budget():
+    """An exhausted budget still assigns every bug"""
+    result = assign_bugs_balanced(BUGS, TEAM_PROFILES, db_available=False, time_budget_seconds=0.0)
+    assert len(result) == len(BUGS)
+    assert all(a["assigned_to_member_id"] != "unknown" for a in result)
+
+
+def test_member_capacities_cover_batch():
+    """Capacities follow headroom and always cover the batch"""
+    member_data = [{"load_score": None}, {"load_score": 0.5}, {"load_score": None}]
+    capacities = compute_member_capacities(TEAM_PROFILES, member_data, 20)
+    assert capacities.sum() >= 20
+    assert capacities[0] > capacities[2]
+
+
+def test_score_matrix_matches_scalar_scores_with_similar_bugs(tmp_path):
+    """Resolvers of similar historical bugs are scored identically"""
+    from src.engines.similar_bugs import build_similar_bug_index, embed_bugs, load_similar_bug_index, quantize
+
+    codes, scales = quantize(embed_bugs(BUGS[:3]))
+    build_similar_bug_index(tmp_path, codes, scales, ["H-1", "H-2", "H-3"], ["dev-02", "dev-03", "dev-02"])
+    index = load_similar_bug_index(tmp_path)
+    with patch("src.engines.similar_bugs.get_similar_bug_index", return_value=index), \
+            patch("src.engines.similar_bugs.get_bug_resolutions", return_value={}):
+        matrix = build_score_matrix(BUGS, TEAM_PROFILES, db_available=False)
+        assert matrix.tolist() == _scalar_scores(False)
+        assert matrix[0, 1] > build_score_matrix(BUGS, TEAM_PROFILES, False, similar_bugs=[[]] * len(BUGS))[0, 1]
+        assert assign_bugs_batch(BUGS, TEAM_PROFILES, db_available=False) == [
+            assign_bug(bug, TEAM_PROFILES, db_available=False) for bug in BUGS
+        ]
+
+
+def test_score_matrix_matches_scalar_scores_with_expertise():
+    """The expertise matrix term is scored identically"""
+    from src.engines.expertise import ExpertiseMatrix, update_expertise_arrays
+
+    events = [
+        ("BUG-1", "resolved", "dev-02", {"category": "Runtime Error", "module": "auth", "language": "java"}, 3.0),
+        ("BUG-2", "resolved", "dev-02", {"category": "Runtime Error", "module": "auth", "language": "Java"}, 5.0),
+        ("BUG-3", "resolved", "dev-01", {"category": "Runtime Error", "module": "auth", "language": "java"}, 20.0),
+        ("BUG-4", "assigned", "dev-03", {"category": "Performance", "module": "payment", "language": "python"}, None),
+        ("BUG-5", "resolved", "dev-09", {"category": "UX/UI Issue", "module": None, "language": "javascript"}, 1.0),
+    ]
+    expertise = ExpertiseMatrix("test", *update_expertise_arrays(None, events))
+    with patch("src.engines.assignment.get_expertise_matrix", return_value=expertise), \
+            patch("src.engines.batch_assignment.get_expertise_matrix", return_value=expertise):
+        matrix = build_score_matrix(BUGS, TEAM_PROFILES, db_available=False)
+        assert matrix.tolist() == _scalar_scores(False)
+        assert assign_bugs_batch(BUGS, TEAM_PROFILES, db_available=False) == [
+            assign_bug(bug, TEAM_PROFILES, db_available=False) for bug in BUGS
+        ]
+    with patch("src.engines.batch_assignment.get_expertise_matrix", return_value=None):
+        assert matrix[0, 1] > build_score_matrix(BUGS, TEAM_PROFILES, db_available=False)[0, 1]
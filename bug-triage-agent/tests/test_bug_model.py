@@ -0,0 +1,122 @@
+"""Tests for the hashed-feature naive Bayes bug classifier"""
+
+import numpy as np
+
+from src.engines import bug_model
+from src.engines.bug_model import (
+    HEADS,
+    NaiveBayesCounts,
+    bug_text,
+    featurize_text,
+    fit_examples,
+    load_bug_model,
+    load_model_counts,
+    load_training_ledger,
+    save_model,
+)
+from src.engines.classification import classification_cache, classify_bug
+
+TRAINING = [
+    ({"title": "Checkout page layout broken on mobile", "description": "buttons overlap the footer"}, "UX/UI Issue", "Layout Issue"),
+    ({"title": "Navbar misaligned", "description": "layout overlaps logo on mobile screens"}, "UX/UI Issue", "Layout Issue"),
+    ({"title": "Report export takes minutes", "description": "export query latency grows with rows"}, "Performance", "Slow Query"),
+    ({"title": "Dashboard query slow", "description": "aggregation query latency above 10s"}, "Performance", "Slow Query"),
+]
+
+
+def train(directory, examples, n_features=1024):
+    heads = {head: NaiveBayesCounts(n_features) for head in HEADS}
+    rows = [featurize_text(bug_text(bug), n_features) for bug, _, _ in examples]
+    heads["category"].partial_fit(rows, [category for _, category, _ in examples])
+    heads["type"].partial_fit(rows, [bug_type for _, _, bug_type in examples])
+    return save_model(directory, heads, {"documents": len(examples)})
+
+
+def test_featurize_hashes_unigrams_and_bigrams():
+    """Repeated tokens are weighted sublinearly into sorted unique indices"""
+    indices, values = featurize_text("Query slow slow", 64)
+    assert list(indices) == sorted(set(indices))
+    assert len(indices) <= 4 and values.max() > values.min()
+    assert len(featurize_text("", 64)[0]) == 0
+
+
+def test_batch_prediction_from_memory_mapped_model(tmp_path):
+    """A saved model loads as memory maps and predicts a whole batch"""
+    train(tmp_path, TRAINING)
+    model = load_bug_model(tmp_path)
+    assert model.heads["category"].log_likelihood.filename is not None
+
+    predictions = model.predict([
+        {"title": "Settings page layout overlaps on mobile"},
+        {"title": "Search query latency is slow"},
+        {"title": ""},
+    ], min_confidence=0.6)
+    assert predictions[0].category == "UX/UI Issue" and predictions[0].type == "Layout Issue"
+    assert predictions[1].category == "Performance"
+    assert predictions[2] is None
+
+
+def test_incremental_retraining_adds_classes(tmp_path):
+    """Retraining continues from stored counts and can add new labels"""
+    train(tmp_path, TRAINING)
+    heads, meta = load_model_counts(tmp_path)
+    rows = [featurize_text("login token rejected unauthorized", meta["n_features"])]
+    heads["category"].partial_fit(rows, ["Security"])
+    heads["type"].partial_fit(rows, ["Authentication Error"])
+    save_model(tmp_path, heads, meta)
+
+    heads, meta = load_model_counts(tmp_path)
+    assert heads["category"].classes == ["UX/UI Issue", "Performance", "Security"]
+    assert heads["category"].class_counts.tolist() == [2, 2, 1]
+
+
+def test_retraining_replaces_an_edited_bug(tmp_path):
+    """An edited, relabelled bug counts once, as in a full build"""
+    examples = [(f"H-{i}", bug, category, bug_type) for i, (bug, category, bug_type) in enumerate(TRAINING)]
+    heads = {head: NaiveBayesCounts(1024) for head in HEADS}
+    ledger = {}
+    assert fit_examples(heads, ledger, examples) == (4, 0)
+    save_model(tmp_path, heads, {}, ledger)
+
+    heads, _ = load_model_counts(tmp_path)
+    ledger = load_training_ledger(tmp_path)
+    edited = ("H-0", {"title": "Checkout query slow", "description": "latency grows"}, "Performance", "Slow Query")
+    assert fit_examples(heads, ledger, [edited, examples[3]]) == (1, 1)
+    assert fit_examples(heads, ledger, [("H-1", TRAINING[1][0], None, None)]) == (0, 1)
+
+    full = {head: NaiveBayesCounts(1024) for head in HEADS}
+    fit_examples(full, {}, [edited, examples[2], examples[3]])
+    assert heads["category"].classes == full["category"].classes == ["Performance"]
+    assert heads["type"].classes == full["type"].classes == ["Slow Query"]
+    for head in HEADS:
+        assert heads[head].class_counts.tolist() == full[head].class_counts.tolist() == [3]
+        assert np.allclose(heads[head].feature_counts, full[head].feature_counts, atol=1e-5)
+    assert sorted(ledger) == ["H-0", "H-2", "H-3"]
+
+
+def test_retraining_publishes_a_new_array_directory(tmp_path):
+    """A loaded model keeps its own build's classes and arrays after a retrain"""
+    train(tmp_path, TRAINING)
+    first = load_bug_model(tmp_path)
+    train(tmp_path, TRAINING[:1])
+
+    second = load_bug_model(tmp_path)
+    assert second.version != first.version
+    assert first.heads["category"].classes == ["UX/UI Issue", "Performance"]
+    assert first.heads["category"].log_prior.shape == (2,)
+    assert second.heads["category"].classes == ["UX/UI Issue"]
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_dir()) == [first.version, second.version]
+
+
+def test_confident_prediction_is_a_classification_tier(tmp_path, monkeypatch):
+    """A model prediction replaces the pattern tiers; no model falls back to them"""
+    train(tmp_path, TRAINING)
+    model = load_bug_model(tmp_path)
+    monkeypatch.setattr(bug_model, "get_bug_model", lambda: model)
+    classification_cache.clear()
+
+    bug = {"bug_id": "BUG-1", "title": "Profile page layout overlaps on mobile", "description": "overlap"}
+    prediction = bug_model.predict_bug_classes([bug])[0]
+    result = classify_bug(bug, None, prediction)
+    assert result["tier"] == "model" and result["category"] == "UX/UI Issue" and result["type"] == "Layout Issue"
+    assert classify_bug(bug)["tier"] != "model"
@@ -0,0 +1,59 @@
+"""Tests for burst detection with a time-decayed count-min sketch"""
+
+import pytest
+
+from src.engines.bursts import BurstDetector
+from src.engines.priority import assess_priority, escalate_for_burst
+from src.utils.count_min_sketch import DecayingCountMinSketch
+
+
+def test_sketch_counts_decay_with_half_life():
+    """Counts halve every half-life, never undercount and keep memory fixed"""
+    sketch = DecayingCountMinSketch(width=256, depth=4, half_life_seconds=60)
+    start = 1_000_000.0
+    for _ in range(100):
+        sketch.add("payment|Runtime Error|abc", now=start)
+    for i in range(5000):
+        sketch.add(f"other-{i}", now=start)
+
+    assert sketch.estimate("payment|Runtime Error|abc", now=start) >= 100
+    assert sketch.estimate("payment|Runtime Error|abc", now=start + 60) == pytest.approx(50, abs=20)
+    assert sketch.estimate("never-seen", now=start + 6000) < 1
+    assert sketch.memory_bytes() == 256 * 4 * 8
+
+    # Rescaling to a new landmark far in the future keeps estimates consistent
+    assert sketch.add("late", now=start + 60 * 100) == pytest.approx(1.0)
+
+
+def test_detector_restores_snapshot(monkeypatch):
+    """A new detector merges the saved snapshot, so bursts survive restarts"""
+    saved = {}
+    monkeypatch.setattr("src.engines.bursts.BURST_SNAPSHOT_SECONDS", 0)
+    monkeypatch.setattr("src.engines.bursts.get_sketch_snapshot", lambda name: saved.get(name))
+    monkeypatch.setattr("src.engines.bursts.save_sketch_snapshot", lambda name, state: saved.update({name: state}))
+
+    detector = BurstDetector()
+    for _ in range(30):
+        count = detector.observe("payment", "Runtime Error", "abc")
+    assert count == pytest.approx(30, rel=0.01)
+    detector.flush()
+    assert "bursts" in saved
+
+    restarted = BurstDetector()
+    assert restarted.observe("payment", "Runtime Error", "abc") == pytest.approx(31, rel=0.01)
+    assert restarted.observe("payment", "Performance", "abc") == pytest.approx(1, rel=0.01)
+    assert restarted.stats()["loaded"] is True
+
+
+def test_burst_escalates_priority(monkeypatch):
+    """Each burst threshold reached raises priority one level"""
+    monkeypatch.setattr("src.engines.priority.BURST_ESCALATION_REPORTS", [5, 20])
+    assert escalate_for_burst("low", 4.9) == "low"
+    assert escalate_for_burst("low", 5) == "medium"
+    assert escalate_for_burst("medium", 25) == "critical"
+
+    classification = {"category": "Logic Error", "type": "Logic Issue"}
+    result = assess_priority({}, classification, None, burst_reports=6.2)
+    assert result["level"] == "high"
+    assert "escalated from medium for a burst of about 6 similar reports" in result["justification"]
+    assert assess_priority({}, classification, None, burst_reports=1.0)["level"] == "medium"
@@ -94,3 +94,32 @@ def test_calculate_confidence_with_code_context():
 
 
 
+
+
+def test_classify_bug_stops_at_summary_tier():
+    """A decisive title/description skips the stack trace and logs"""
+    bug = {
+        "title": "SQL injection in search",
+        "description": "Search box is vulnerable",
+        "logs": "request slow, timeout, latency high, slow again",
+    }
+    result = classify_bug(bug)
+    assert result["tier"] == "summary"
+    assert result["category"] == "Security"
+    assert result["type"] == "SQL Injection"
+
+
+def test_classify_bug_tiers():
+    """Exception tokens decide first; undecided bugs fall through to later tiers"""
+    assert classify_bug({"title": "Crash", "description": "x", "stack_trace": "KeyError: 'id'"})["tier"] == "exception"
+
+    traces = classify_bug({"title": "Checkout", "description": "Fails", "logs": "the request took too long: timeout"})
+    assert (traces["tier"], traces["category"]) == ("traces", "Performance")
+
+    hinted = classify_bug(
+        {"title": "Checkout", "description": "Fails sometimes"},
+        {"file_path": "src/auth/session.py", "snippet": None},
+    )
+    assert (hinted["tier"], hinted["category"]) == ("code_context", "Security")
+
+    assert classify_bug({"title": "Checkout", "description": "Fails sometimes"})["tier"] == "default"
@@ -0,0 +1,88 @@
+"""Tests for crash grouping by stack trace fingerprint"""
+
+from src.engines.crash_groups import CrashGroupIndex, crash_group_index
+from src.engines.priority import assess_priority, escalate_for_recurrence
+from src.handlers.triage_handler import process_triage_request
+
+TRACE = """java.lang.IllegalStateException: pool exhausted
+\tat com.acme.db.Pool.acquire(Pool.java:{line})
+\tat com.acme.orders.OrderRepository.save(OrderRepository.java:31)"""
+
+
+def make_request(bug_id, line):
+    return {
+        "message_id": f"msg-{bug_id}",
+        "sender": "supervisor",
+        "recipient": "bug_triage_agent",
+        "type": "task_assignment",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "task": {
+            "bugs": [{
+                "bug_id": bug_id,
+                "title": f"Order save failed ({bug_id})",
+                "description": f"Saving order {bug_id} failed in the {line} worker",
+                "stack_trace": TRACE.format(line=line),
+            }],
+            "team_profiles": [{"member_id": "dev-1", "name": "Dev One", "skills": {"languages": ["Java"]}}],
+        },
+    }
+
+
+def test_index_counts_occurrences_and_keeps_last_decision(monkeypatch):
+    """Each new bug adds one occurrence; the previous decision is returned"""
+    written = []
+    monkeypatch.setattr("src.engines.crash_groups.iter_crash_fingerprints", lambda since: iter(
+        [{"fingerprint": "f1", "count": 4, "last_bug_id": "OLD", "last_decision": {"priority": "low"}}]
+    ))
+    monkeypatch.setattr("src.engines.crash_groups.bulk_record_crash_occurrences", lambda docs: written.append(docs))
+    index = CrashGroupIndex()
+
+    group = index.observe("f1", "B1")
+    assert (group.occurrences, group.previous_bug_id, group.previous_decision) == (5, "OLD", {"priority": "low"})
+    index.record_decision("f1", {"priority": "medium"})
+    assert index.observe("f1", "B1").occurrences == 5
+    assert index.observe("f1", "B2").previous_decision == {"priority": "medium"}
+    assert index.observe("f2", "B3").occurrences == 1
+
+    index.flush()
+    docs = {doc["fingerprint"]: doc for doc in written[0]}
+    assert docs["f1"]["new_occurrences"] == 2 and docs["f1"]["last_bug_id"] == "B2"
+    assert docs["f2"]["new_occurrences"] == 1
+    assert index.stats()["fingerprints"] == 2
+
+
+def test_recurrence_escalates_priority(monkeypatch):
+    """Each escalation threshold reached raises priority one level"""
+    monkeypatch.setattr("src.engines.priority.CRASH_ESCALATION_OCCURRENCES", [3, 5])
+    assert escalate_for_recurrence("low", 2) == "low"
+    assert escalate_for_recurrence("low", 3) == "medium"
+    assert escalate_for_recurrence("medium", 9) == "critical"
+    assert escalate_for_recurrence("critical", 9) == "critical"
+
+    result = assess_priority({}, {"category": "Logic Error", "type": "Logic Issue"}, None, occurrences=3)
+    assert result["level"] == "high"
+    assert "escalated from medium for a crash seen 3 times" in result["justification"]
+
+
+def test_handler_groups_recurring_crashes(monkeypatch):
+    """Bugs with the same fingerprint share a crash group whose count escalates priority"""
+    monkeypatch.setattr("src.handlers.triage_handler.save_triage_history", lambda *args, **kwargs: True)
+    monkeypatch.setattr("src.handlers.triage_handler.find_reusable_result", lambda *args: None)
+    monkeypatch.setattr("src.handlers.triage_handler.DUPLICATE_DETECTION_ENABLED", False)
+    monkeypatch.setattr("src.engines.crash_groups.iter_crash_fingerprints", lambda since: iter(()))
+    monkeypatch.setattr("src.engines.crash_groups.bulk_record_crash_occurrences", lambda docs: len(docs))
+    monkeypatch.setattr("src.engines.priority.CRASH_ESCALATION_OCCURRENCES", [3])
+    crash_group_index.reset()
+
+    results = [
+        process_triage_request(make_request(f"BUG-{n}", 40 + n))["results"]["triage"][0]
+        for n in range(3)
+    ]
+    groups = [result["crash_group"] for result in results]
+    assert len({group["fingerprint"] for group in groups}) == 1
+    assert [group["occurrences"] for group in groups] == [1, 2, 3]
+    assert groups[2]["previous_bug_id"] == "BUG-1"
+    assert groups[2]["previous_decision"]["priority"] == results[1]["priority"]["level"]
+    levels = ["critical", "high", "medium", "low"]
+    assert levels.index(results[2]["priority"]["level"]) == levels.index(results[1]["priority"]["level"]) - 1
+    crash_group_index.reset()
@@ -18,6 +18,10 @@ from src.database.developer_load import (
     get_developer_load,
     update_developer_load
 )
+from src.database.triage_history import (
+    iter_triage_labels,
+    save_triage_history
+)
 
 
 @pytest.fixture
@@ -114,3 +118,18 @@ def test_get_developer_load(mock_get_collection, mock_collection):
 
 
 
+
+
+@patch('src.database.triage_history.get_triage_history_collection')
+def test_triage_labels_skip_model_decisions(mock_get_collection, mock_collection):
+    """The classification tier is stored, and model decisions are not returned as labels"""
+    mock_get_collection.return_value = mock_collection
+    
+    save_triage_history({"bug_id": "BUG-1"}, {"category": "Security", "tier": "model"}, {}, {}, {})
+    stored = mock_collection.insert_one.call_args[0][0]
+    assert stored["classification"]["tier"] == "model"
+    
+    mock_collection.find.return_value.sort.return_value.batch_size.return_value = iter([])
+    list(iter_triage_labels(exclude_tiers=("model", "default")))
+    query = mock_collection.find.call_args[0][0]
+    assert query["classification.tier"] == {"$type": "string", "$nin": ["model", "default"]}
@@ -0,0 +1,134 @@
+"""Tests for MinHash/LSH near-duplicate detection"""
+
+from datetime import datetime, timedelta, UTC
+
+from src.engines.duplicates import DuplicateIndex, bug_shingles, duplicate_index
+from src.handlers.triage_handler import process_triage_request
+from src.utils.minhash import LSHIndex, MinHasher, signature_similarity
+
+INCIDENT = {
+    "title": "Checkout fails with NullPointerException",
+    "description": "Submitting the cart throws when the coupon code field is left empty on checkout",
+    "stack_trace": "java.lang.NullPointerException\n  at com.shop.cart.CouponService.apply(CouponService.java:42)\n"
+                   "  at com.shop.cart.CheckoutController.submit(CheckoutController.java:88)",
+}
+
+
+def make_request(bug_id, bug):
+    return {
+        "message_id": f"msg-{bug_id}",
+        "sender": "supervisor",
+        "recipient": "bug_triage_agent",
+        "type": "task_assignment",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "task": {
+            "bugs": [{"bug_id": bug_id, **bug}],
+            "team_profiles": [
+                {"member_id": "dev-1", "name": "Dev One", "skills": {"languages": ["Java"]}},
+                {"member_id": "dev-2", "name": "Dev Two", "skills": {"languages": ["Python"]}},
+            ],
+        },
+    }
+
+
+def test_minhash_estimates_jaccard_and_lsh_finds_near_duplicates():
+    """Signatures agree in proportion to shingle overlap; LSH surfaces only close sets"""
+    hasher = MinHasher(64)
+    base = {f"word{i}" for i in range(100)}
+    near = set(list(base)[:95]) | {"extra1", "extra2", "extra3", "extra4", "extra5"}
+    other = {f"other{i}" for i in range(100)}
+    assert abs(signature_similarity(hasher.signature(base), hasher.signature(near)) - 95 / 105) < 0.15
+
+    lsh = LSHIndex(64, 8)
+    lsh.add("base", hasher.signature(base))
+    lsh.add("other", hasher.signature(other))
+    assert [key for key, _ in lsh.query(hasher.signature(near), 0.7)] == ["base"]
+
+
+def test_lsh_remove_drops_key_from_every_band():
+    """A removed key is no longer a candidate, and empty buckets are dropped"""
+    hasher = MinHasher(64)
+    lsh = LSHIndex(64, 8)
+    signature = hasher.signature({f"word{i}" for i in range(50)})
+    lsh.add("base", signature)
+    lsh.remove("base")
+    lsh.remove("missing")
+    assert len(lsh) == 0 and lsh.query(signature, 0.0) == []
+    assert all(not buckets for buckets in lsh._buckets)
+
+
+def test_shingles_ignore_line_numbers():
+    """Reports differing only in line numbers and IDs shingle identically"""
+    moved = {**INCIDENT, "stack_trace": INCIDENT["stack_trace"].replace(":42)", ":57)").replace(":88)", ":91)")}
+    assert bug_shingles(moved) == bug_shingles(INCIDENT)
+    assert bug_shingles({"title": "crash"}) == set()
+
+
+def test_duplicate_index_links_to_canonical_and_persists(monkeypatch):
+    """Duplicates point at the first report and its assignment; new signatures are written in one batch"""
+    written = []
+    monkeypatch.setattr("src.engines.duplicates.iter_bug_signatures", lambda since: iter(()))
+    monkeypatch.setattr("src.engines.duplicates.bulk_upsert_bug_signatures", lambda docs: written.append(docs))
+    index = DuplicateIndex()
+
+    assert index.check("BUG-1", INCIDENT) is None
+    index.record_assignment("BUG-1", {"assigned_to_member_id": "dev-1", "assigned_to_name": "Dev One", "confidence": 0.8})
+    match = index.check("BUG-2", {**INCIDENT, "stack_trace": INCIDENT["stack_trace"].replace(":42)", ":57)")})
+    assert match.bug_id == "BUG-1" and match.confirmed and match.assignment["assigned_to_member_id"] == "dev-1"
+    hint = index.check("BUG-3", {**INCIDENT, "title": "Checkout fails with NullPointerException again"})
+    assert hint.bug_id == "BUG-1" and not hint.confirmed and hint.assignment is None
+    assert index.check("BUG-1", INCIDENT) is None
+    assert index.check("BUG-4", {"title": "Dark mode colors wrong", "description": "settings page text unreadable"}) is None
+
+    index.flush()
+    assert len(written) == 1
+    docs = {doc["bug_id"]: doc for doc in written[0]}
+    assert docs["BUG-1"]["assignment"]["assigned_to_member_id"] == "dev-1" and len(docs["BUG-1"]["signature"]) == 64
+    assert docs["BUG-2"]["canonical_bug_id"] == "BUG-1"
+    assert index.stats()["duplicate_hints"] == 2 and index.stats()["confirmed_duplicates"] == 1
+
+
+def test_duplicate_index_evicts_by_age_and_size(monkeypatch):
+    """Bugs outside the window, and the oldest beyond the size cap, stop matching"""
+    hasher = MinHasher(64)
+    signature = hasher.signature(bug_shingles(INCIDENT)).tolist()
+    stored = [
+        {"bug_id": "OLD-1", "signature": signature, "created_at": datetime.now(UTC) - timedelta(days=45)},
+        {"bug_id": "BUG-1", "signature": signature, "created_at": datetime.now(UTC) - timedelta(days=1),
+         "assignment": {"assigned_to_member_id": "dev-1"}},
+    ]
+    monkeypatch.setattr("src.engines.duplicates.iter_bug_signatures", lambda since: iter(stored))
+    monkeypatch.setattr("src.engines.duplicates.bulk_upsert_bug_signatures", lambda docs: len(docs))
+    monkeypatch.setattr("src.engines.duplicates.DUPLICATE_MAX_BUGS", 2)
+    index = DuplicateIndex()
+
+    assert index.check("BUG-2", INCIDENT).bug_id == "BUG-1"
+    assert index.stats()["bugs"] == 2 and index.stats()["evicted"] == 1
+    index.check("BUG-3", {"title": "Dark mode colors wrong", "description": "settings page text unreadable"})
+    index.check("BUG-4", {"title": "Search results empty", "description": "query with quotes returns nothing"})
+    assert index.stats()["bugs"] == 2 and index.stats()["evicted"] == 3
+    assert index.check("BUG-5", INCIDENT) is None
+
+
+def test_confirmed_duplicate_copies_canonical_assignment(monkeypatch):
+    """The handler returns a duplicate_of hint and skips assignment scoring for confirmed duplicates"""
+    scored = []
+    monkeypatch.setattr("src.handlers.triage_handler.save_triage_history", lambda *args, **kwargs: True)
+    monkeypatch.setattr("src.handlers.triage_handler.find_reusable_result", lambda *args: None)
+    monkeypatch.setattr(
+        "src.handlers.triage_handler.assign_bug",
+        lambda bug, team_profiles, similar_bugs=None: scored.append(bug["bug_id"]) or {
+            "assigned_to_member_id": "dev-1", "assigned_to_name": "Dev One", "confidence": 0.7
+        }
+    )
+    monkeypatch.setattr("src.engines.duplicates.iter_bug_signatures", lambda since: iter(()))
+    monkeypatch.setattr("src.engines.duplicates.bulk_upsert_bug_signatures", lambda docs: len(docs))
+    duplicate_index.reset()
+
+    first = process_triage_request(make_request("BUG-10", INCIDENT))["results"]["triage"][0]
+    second = process_triage_request(make_request("BUG-11", INCIDENT))["results"]["triage"][0]
+    assert first["duplicate_of"] is None
+    assert second["duplicate_of"] == {"bug_id": "BUG-10", "similarity": 1.0, "assignment_copied": True}
+    assert second["assignment"]["assigned_to_member_id"] == first["assignment"]["assigned_to_member_id"]
+    assert scored == ["BUG-10"]
+    duplicate_index.reset()
@@ -0,0 +1,81 @@
+"""Tests for effort estimation from historical resolution times"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.engines.effort_estimation import (
+    HISTOGRAM_EDGES, EffortEstimate, EffortIndex, format_effort, histogram_quantiles, _histogram_bin
+)
+from src.engines.fix_suggestion import estimate_effort
+
+
+def _resolution(hours, module="payment", language="java", day=1, bug_id=None):
+    _resolution.count += 1
+    return {
+        "bug_id": bug_id or f"BUG-{_resolution.count}", "category": "Runtime Error", "type": "NullPointerException",
+        "module": module, "language": language, "resolution_time_hours": hours, "updated_at": datetime(2026, 1, day)
+    }
+
+
+_resolution.count = 0
+
+
+def test_histogram_quantiles_track_exact_quantiles():
+    """Log-spaced bins keep interpolated quantiles within one bin width"""
+    hours = np.random.default_rng(0).lognormal(mean=1.0, sigma=1.0, size=5000)
+    counts = np.zeros(len(HISTOGRAM_EDGES) - 1, dtype=np.int32)
+    for value in hours:
+        counts[_histogram_bin(value)] += 1
+
+    for estimate, exact in zip(histogram_quantiles(counts), np.quantile(hours, [0.25, 0.5, 0.75])):
+        assert estimate == pytest.approx(exact, rel=0.1)
+
+
+def test_effort_index_falls_back_and_refreshes_incrementally(monkeypatch):
+    """Small buckets fall back to broader ones; refreshes only fetch updated resolutions, counted once"""
+    history = [_resolution(hours) for hours in (1, 2, 2, 3, 4, 5)] + [_resolution(40, module="search")]
+    calls = []
+
+    def fake_iter(since):
+        calls.append(since)
+        return iter([doc for doc in history if since is None or doc["updated_at"] >= since])
+
+    monkeypatch.setattr("src.engines.effort_estimation.iter_resolution_times", fake_iter)
+    monkeypatch.setattr("src.engines.effort_estimation.EFFORT_REFRESH_SECONDS", 0)
+    index = EffortIndex()
+
+    estimate = index.estimate("Runtime Error", "NullPointerException", "payment", "java")
+    assert estimate.bucket == ("Runtime Error", "NullPointerException", "payment", "java")
+    assert estimate.samples == 6
+    assert 1.5 <= estimate.p25 <= estimate.p50 <= estimate.p75 <= 5
+    # One search resolution is too few, so the (category, type) bucket answers
+    assert index.estimate("Runtime Error", "NullPointerException", "search", "java").bucket == (
+        "Runtime Error", "NullPointerException"
+    )
+    assert index.estimate("Security", "XSS", None, None) is None
+
+    history += [_resolution(40, module="search", day=day) for day in range(2, 6)]
+    assert index.estimate("Runtime Error", "NullPointerException", "search", "java").p50 > 30
+    index.estimate("Runtime Error", "NullPointerException", "search", "java")
+    assert calls == [None, datetime(2026, 1, 1), datetime(2026, 1, 1), datetime(2026, 1, 1), datetime(2026, 1, 5)]
+    assert index.stats()["resolutions"] == 11
+
+    # A backfilled bug shares the watermark; a corrected bug replaces its old time
+    corrected = _resolution(400, module="search", day=5, bug_id=history[-1]["bug_id"])
+    history += [_resolution(40, module="search", day=5), corrected]
+    estimate = index.estimate("Runtime Error", "NullPointerException", "search", "java")
+    assert estimate.samples == 6
+    assert index.stats()["resolutions"] == 12
+
+
+def test_format_effort_and_rule_fallback(monkeypatch):
+    """Learned estimates read like the rule-based ones; without history the rules apply"""
+    assert format_effort(EffortEstimate(1.6, 2.9, 5.8, 20, ())) == "2-6 hours (median 3 hours)"
+    assert format_effort(EffortEstimate(0.4, 0.8, 1.4, 20, ())) == "25 minutes - 1 hour (median 50 minutes)"
+    assert format_effort(EffortEstimate(66, 68, 70, 20, ())) == "about 3 days (median 3 days)"
+
+    monkeypatch.setattr("src.engines.fix_suggestion.effort_index", EffortIndex())
+    monkeypatch.setattr("src.engines.effort_estimation.iter_resolution_times", lambda since: iter(()))
+    assert estimate_effort("Configuration Error", "Missing Config", None) == "30 minutes - 2 hours"
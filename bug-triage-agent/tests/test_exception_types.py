@@ -0,0 +1,66 @@
+"""Tests for the exception class dictionary fast path"""
+
+from src.engines.exception_types import (
+    build_exception_table,
+    extract_exception_tokens,
+    get_exception_table,
+    lookup_exception_type,
+)
+from src.engines.classification import classify_bug, classify_type
+
+
+def test_packaged_table_loads():
+    """The packaged data file covers the major runtimes"""
+    table = get_exception_table()
+    assert len(table) > 400
+    assert table.lookup("java.lang.NullPointerException") == ("Runtime Error", "NullPointerException")
+    assert table.lookup("System.NullReferenceException") == ("Runtime Error", "NullPointerException")
+    assert table.lookup("KeyError") == ("Runtime Error", "Key Error")
+    assert table.lookup("java.net.SocketTimeoutException") == ("Performance", "Timeout")
+    assert table.lookup("com.acme.NotAnException") is None
+
+
+def test_tokenizer_skips_prose_and_frames():
+    """Only CamelCase identifiers are candidate exception tokens"""
+    trace = "Exception in thread \"main\" java.lang.IllegalStateException: bad state\n\tat com.acme.Foo.run(Foo.java:3)"
+    assert list(extract_exception_tokens(trace)) == ["Exception", "java.lang.IllegalStateException"]
+
+
+def test_panic_messages_before_class_names():
+    """Go and Rust panics and specific JS messages are recognized by phrase"""
+    go = "panic: runtime error: invalid memory address or nil pointer dereference"
+    rust = "thread 'main' panicked at 'called `Option::unwrap()` on a `None` value', src/main.rs:4:5"
+    js = "TypeError: Cannot read properties of undefined (reading 'id')"
+    assert lookup_exception_type([go]) == ("Runtime Error", "NullPointerException")
+    assert lookup_exception_type([rust]) == ("Runtime Error", "NullPointerException")
+    assert lookup_exception_type([js]) == ("Runtime Error", "NullPointerException")
+    assert lookup_exception_type([None, "TypeError: x.map is not iterable"]) == ("Runtime Error", "Type Error")
+    assert lookup_exception_type(["checkout is slow", None]) is None
+
+
+def test_custom_table():
+    """Tables compile from the JSON layout"""
+    table = build_exception_table({
+        "version": "test",
+        "exceptions": {"Security": {"Authentication Error": ["TokenRevokedException"]}},
+        "phrases": {"Performance": {"Timeout": ["Upstream Timed Out"]}},
+    })
+    assert table.version == "test"
+    assert table.match("com.acme.TokenRevokedException: revoked") == ("Security", "Authentication Error")
+    assert table.match("upstream timed out (110)") == ("Performance", "Timeout")
+
+
+def test_classify_bug_uses_exception_table():
+    """A known exception decides the classification without the regex scan"""
+    result = classify_bug({
+        "title": "Checkout is slow and broken",
+        "description": "Page does not work",
+        "stack_trace": "java.lang.ArithmeticException: / by zero\n\tat com.acme.Cart.total(Cart.java:12)",
+    })
+    assert (result["category"], result["type"]) == ("Runtime Error", "Arithmetic Error")
+
+
+def test_runtime_branch_matches_lowercased_text():
+    """The Runtime Error branch compares against lowercased text"""
+    text = "java.lang.nullpointerexception: type error while saving, typeerror in handler"
+    assert classify_type(text, "Runtime Error") == "NullPointerException"
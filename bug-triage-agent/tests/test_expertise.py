@@ -0,0 +1,78 @@
+"""Tests for the per-member expertise matrix"""
+
+import pytest
+
+from src.engines.expertise import (
+    ExpertiseMatrix, load_expertise_matrix, save_expertise_matrix, update_expertise_arrays
+)
+
+EVENTS = [
+    ("BUG-1", "resolved", "dev-01", {"category": "Runtime Error", "module": "payment", "language": "Java"}, 2.0),
+    ("BUG-2", "resolved", "dev-01", {"category": "Runtime Error", "module": "payment", "language": "java"}, 4.0),
+    ("BUG-3", "resolved", "dev-02", {"category": "Runtime Error", "module": "payment", "language": "java"}, 12.0),
+    ("BUG-4", "assigned", "dev-02", {"category": "Security", "module": "auth", "language": "python"}, None),
+]
+
+
+def test_expertise_scores_share_and_speed():
+    """The top member for a value scores 1.0, scaled by relative resolution speed"""
+    matrix = ExpertiseMatrix("test", *update_expertise_arrays(None, EVENTS))
+
+    # dev-01: all of the top count, resolves in 3h against a 6h average -> capped at 1.5
+    assert matrix.expertise("dev-01", "payment", None) == pytest.approx(1.5)
+    # dev-02: half the top count, 12h against 6h -> 0.5 speed
+    assert matrix.expertise("dev-02", "payment", None) == pytest.approx(0.25)
+    # Only an assignment for auth: a quarter of a resolution, with a neutral speed factor
+    assert matrix.expertise("dev-02", "auth", "PYTHON") == pytest.approx(0.5)
+    assert matrix.expertise("dev-09", "payment", "java") == 0.0
+    assert matrix.values["language"] == ["java", "python"]
+
+
+def test_incremental_update_matches_full_build(tmp_path):
+    """Appending new history to a saved matrix equals building from all of it"""
+    members, values, arrays, assignments = update_expertise_arrays(None, EVENTS[:2])
+    save_expertise_matrix(tmp_path, members, values, arrays, assignments, {"resolved": "65a1f0c2e4b0a1b2c3d4e5f6"})
+    base = load_expertise_matrix(tmp_path, with_assignments=True)
+    assert base.watermarks == {"resolved": "65a1f0c2e4b0a1b2c3d4e5f6"}
+
+    incremental = ExpertiseMatrix("incremental", *update_expertise_arrays(base, EVENTS[2:]))
+    full = ExpertiseMatrix("full", *update_expertise_arrays(None, EVENTS))
+    assert incremental.members == full.members
+    for facet in ("category", "module", "language"):
+        for name in ("counts", "resolved", "hours", "assigned"):
+            assert incremental.arrays[facet][name].tolist() == full.arrays[facet][name].tolist()
+
+    # Each save writes a new array subdirectory; only the last two are kept
+    for _ in range(3):
+        save_expertise_matrix(tmp_path, members, values, arrays, assignments, {})
+    latest = load_expertise_matrix(tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_dir())[-1] == latest.version
+    assert len([path for path in tmp_path.iterdir() if path.is_dir()]) == 2
+
+    scores = full.score_matrix(["payment", None, "auth"], ["java", "python", None], ["dev-02", "dev-07", "dev-01"])
+    assert scores.tolist() == [
+        [full.expertise(member, module, language) for member in ("dev-02", "dev-07", "dev-01")]
+        for module, language in (("payment", "java"), (None, "python"), ("auth", None))
+    ]
+
+
+def test_each_bug_counts_once(tmp_path):
+    """A reassignment replaces the earlier assignment, and a resolution replaces a stored assignment"""
+    payment = {"module": "payment", "language": "go"}
+    events = [
+        ("BUG-1", "assigned", "dev-01", payment, None),
+        ("BUG-1", "assigned", "dev-02", payment, None),
+        ("BUG-2", "assigned", "dev-01", payment, None),
+    ]
+    save_expertise_matrix(tmp_path, *update_expertise_arrays(None, events), {})
+    base = load_expertise_matrix(tmp_path, with_assignments=True)
+    assert set(base.assignments) == {"BUG-1", "BUG-2"}
+    assert load_expertise_matrix(tmp_path).assignments == {}
+
+    members, values, arrays, assignments = update_expertise_arrays(
+        base, [("BUG-2", "resolved", "dev-03", payment, 5.0)]
+    )
+    assert members == ["dev-01", "dev-02", "dev-03"]
+    assert arrays["module"]["assigned"][:, 0].tolist() == [0, 1, 0]
+    assert arrays["module"]["counts"][:, 0].tolist() == [0, 0, 1]
+    assert set(assignments) == {"BUG-1"}
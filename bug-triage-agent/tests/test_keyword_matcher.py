@@ -0,0 +1,36 @@
+"""Tests for the Aho-Corasick keyword matcher"""
+
+import random
+
+from src.utils.keyword_matcher import KeywordAutomaton, RosterKeywordIndex, get_roster_keyword_index
+
+
+def test_automaton_finds_overlapping_keywords():
+    """Keywords that overlap or nest are all reported"""
+    automaton = KeywordAutomaton(["he", "she", "his", "hers", "react"])
+    found = {automaton.keywords[i] for i in automaton.find("ushers use react")}
+    assert found == {"he", "she", "hers", "react"}
+
+
+def test_automaton_matches_substring_semantics():
+    """Results agree with ``keyword in text`` on random input"""
+    rng = random.Random(7)
+    for _ in range(200):
+        keywords = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 4))) for _ in range(8)]
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 30)))
+        automaton = KeywordAutomaton(keywords)
+        expected = {i for i, keyword in enumerate(keywords) if keyword in text}
+        assert automaton.find(text) == expected
+
+
+def test_roster_index_counts_duplicate_keywords():
+    """Member hits count each listed keyword, like the per-keyword loop"""
+    index = RosterKeywordIndex([["spring", "backend", "backend"], ["react"], []])
+    assert index.member_hits("spring backend service") == [3, 0, 0]
+
+
+def test_roster_index_is_cached_per_version():
+    """An unchanged roster reuses the compiled automaton"""
+    first = get_roster_keyword_index([["django"], ["vue"]])
+    assert get_roster_keyword_index([["django"], ["vue"]]) is first
+    assert get_roster_keyword_index([["django"], ["angular"]]) is not first
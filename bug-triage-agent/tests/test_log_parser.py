@@ -0,0 +1,62 @@
+"""Tests for structured log reduction"""
+
+from src.utils.log_parser import extract_error_records, parse_log_line, reduce_logs
+from src.engines.classification import classify_bug
+
+
+PLAIN_LOGS = """2024-05-01 12:00:00,101 [main] INFO  com.acme.Server - started on port 8080
+2024-05-01 12:00:01,202 [http-1] WARN  com.acme.Pool - pool 80% used
+2024-05-01 12:00:02,303 [http-2] ERROR com.acme.Auth - request 4411 timed out after 30s
+2024-05-01 12:00:03,404 [http-3] ERROR com.acme.Auth - request 4412 timed out after 30s
+2024-05-01 12:00:04,505 [http-3] DEBUG com.acme.Auth - retrying
+java.net.SocketTimeoutException: Read timed out
+\tat java.net.SocketInputStream.read(SocketInputStream.java:150)"""
+
+
+def test_plain_prefixed_lines():
+    """Timestamp/level lines are kept from WARN up and deduplicated"""
+    records, structured = extract_error_records(PLAIN_LOGS)
+    assert structured
+    assert [(record.level, record.count) for record in records] == [("WARN", 1), ("ERROR", 2), (None, 1)]
+    assert records[1].message == "com.acme.Auth - request 4411 timed out after 30s"
+    assert records[2].message == "java.net.SocketTimeoutException: Read timed out"
+
+
+def test_json_and_logfmt_lines():
+    """JSON lines (including numeric levels) and logfmt are recognized"""
+    assert parse_log_line('{"level": "error", "msg": "db down", "err": {"message": "ECONNREFUSED"}}') == (
+        True, ("ERROR", "db down ECONNREFUSED", 1)
+    )
+    assert parse_log_line('{"level": 50, "msg": "payment failed"}')[1].level == "ERROR"
+    assert parse_log_line('{"level": 30, "msg": "ok"}') == (True, None)
+    assert parse_log_line('ts=2024-05-01T12:00:00Z level=warning msg="slow query" duration=2.1s')[1] == (
+        "WARN", "slow query", 1
+    )
+    assert parse_log_line("just some text") == (False, None)
+
+
+def test_reduce_logs():
+    """Reduced logs render one line per record with counts"""
+    assert reduce_logs(PLAIN_LOGS).splitlines() == [
+        "WARN com.acme.Pool - pool 80% used",
+        "ERROR com.acme.Auth - request 4411 timed out after 30s × 2",
+        "java.net.SocketTimeoutException: Read timed out",
+    ]
+    unstructured = "connection reset\nretry failed"
+    assert reduce_logs(unstructured) is unstructured
+    assert reduce_logs(None) is None
+
+
+def test_info_noise_does_not_drive_classification():
+    """Chatty INFO lines are dropped before classification"""
+    logs = "INFO slow start, css rendering layout styling\n" * 200 + "ERROR NullPointerException in TokenService"
+    result = classify_bug({"title": "Login fails", "description": "Users cannot log in", "logs": logs})
+    assert result["category"] == "Runtime Error"
+
+
+def test_prose_is_not_a_level():
+    """Lowercase level words in free text leave the logs unstructured"""
+    logs = "an error occurred while saving\nwarning: disk nearly full"
+    assert reduce_logs(logs) is logs
+    mixed = "connection reset by peer\nTypeError: x is undefined"
+    assert reduce_logs(mixed) is mixed
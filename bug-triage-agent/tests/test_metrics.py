@@ -1,6 +1,7 @@
 """Unit tests for the metrics collector."""
 
 from src.utils.metrics import MetricsCollector
+from src.utils.space_saving import SpaceSaving, merged_top
 
 
 def test_metrics_collector_records_success_and_failure():
@@ -32,3 +33,83 @@ def test_metrics_collector_reset():
     assert snapshot["totals"]["requests"] == 0
     assert snapshot["totals"]["bugs_processed"] == 0
 
+
+
+def test_metrics_collector_classification_tiers():
+    collector = MetricsCollector()
+    for tier in ["exception", "exception", "summary", "traces"]:
+        collector.record_classification_tier(tier)
+
+    tiers = collector.snapshot()["classification_tiers"]
+    assert tiers["counts"] == {"exception": 2, "summary": 1, "traces": 1}
+    assert tiers["hit_rates"]["exception"] == 0.5
+
+    collector.reset()
+    assert collector.snapshot()["classification_tiers"] == {"counts": {}, "hit_rates": {}}
+
+
+def test_space_saving_bounds_counts():
+    """Tracked counts overestimate by at most their error, in fixed capacity"""
+    tracker = SpaceSaving(capacity=3)
+    stream = ["a"] * 5 + ["b", "c", "d", "e"] + ["a", "b", "b"]
+    for item in stream:
+        tracker.add(item)
+
+    assert len(tracker) == 3
+    assert tracker.total == len(stream)
+    top = tracker.top(2)
+    assert top[0] == ("a", 6, 0)
+    for item, count, error in tracker.top(3):
+        assert count - error <= stream.count(item) <= count
+
+
+def test_metrics_collector_heavy_hitters():
+    collector = MetricsCollector()
+    for member in ["m1", "m1", "m2"]:
+        collector.record_triage("Null Pointer Exception", "payment", "NullPointerException", member)
+    collector.record_triage("Timeout", None, None, "m2")
+    collector.record_triage("Timeout", "search", None, "m2")
+
+    hitters = collector.snapshot()["heavy_hitters"]
+    assert hitters["error_types"][0] == {"value": "Null Pointer Exception", "count": 3, "max_overcount": 0}
+    assert [entry["value"] for entry in hitters["modules"]] == ["payment", "search"]
+    assert hitters["exception_classes"] == [{"value": "NullPointerException", "count": 3, "max_overcount": 0}]
+    assert hitters["assignees"][0]["value"] == "m2"
+
+    collector.reset()
+    assert collector.snapshot()["heavy_hitters"]["assignees"] == []
+
+
+def test_heavy_hitters_cover_current_and_previous_window(monkeypatch):
+    monkeypatch.setattr("src.utils.metrics.HEAVY_HITTER_WINDOW_SECONDS", 60)
+    collector = MetricsCollector()
+    for _ in range(3):
+        collector.record_triage("Timeout", "search", None, "m1")
+
+    collector._heavy_hitter_window_start -= 60
+    collector.record_triage("Timeout", "payment", None, "m2")
+    hitters = collector.snapshot()["heavy_hitters"]
+    assert hitters["error_types"] == [{"value": "Timeout", "count": 4, "max_overcount": 0}]
+    assert [entry["value"] for entry in hitters["modules"]] == ["search", "payment"]
+
+    collector._heavy_hitter_window_start -= 60
+    collector.record_triage("Type Error", "payment", None, "m2")
+    assert [entry["value"] for entry in collector.snapshot()["heavy_hitters"]["modules"]] == ["payment"]
+
+    collector._heavy_hitter_window_start -= 120
+    assert collector.snapshot()["heavy_hitters"]["modules"] == []
+
+
+def test_merged_top_keeps_error_bounds():
+    first, second = SpaceSaving(2), SpaceSaving(2)
+    stream_first = ["a", "a", "a", "b", "c"]
+    stream_second = ["c", "c", "a"]
+    for item in stream_first:
+        first.add(item)
+    for item in stream_second:
+        second.add(item)
+    stream = stream_first + stream_second
+    merged = merged_top([first, second], 3)
+    assert merged[0][0] == "a"
+    for item, count, error in merged:
+        assert count - error <= stream.count(item) <= count
@@ -0,0 +1,62 @@
+"""Tests for module resolution from file paths"""
+
+from unittest.mock import patch
+
+from src.utils.module_resolver import (
+    ModuleResolver,
+    build_module_resolver,
+    get_module_resolver,
+    reset_module_resolver,
+)
+from src.utils.code_analyzer import analyze_file_path
+from src.engines.assignment import extract_module_from_path
+
+
+def test_default_patterns_match_previous_behaviour():
+    """Built-in patterns keep the old substring rules and their order"""
+    resolver = get_module_resolver(use_database=False)
+    assert resolver.resolve("src/auth/AuthService.java") == "auth"
+    assert resolver.resolve("C:\\app\\api\\handler.cs") == "api"
+    assert resolver.resolve("app/database/pool.py") == "database"
+    assert resolver.resolve("web/frontend/App.tsx") == "ui"
+    assert resolver.resolve("svc/api/auth/login.py") == "auth"
+    assert resolver.resolve("lib/payment_gateway.rb") == "payment"
+    assert resolver.resolve("lib/billing/charge.rb") is None
+    assert resolver.resolve("") is None
+
+
+def test_longest_prefix_wins_over_segment_patterns():
+    """Stored anchored prefixes resolve before built-in patterns"""
+    resolver = build_module_resolver([
+        {"module_name": "billing", "path_patterns": ["services/billing/"], "owners": ["dev-02"]},
+        {"module_name": "billing-api", "path_patterns": ["/services/billing/api/**"], "owners": []},
+        {"module_name": "search", "path_patterns": ["**/search"], "owners": ["dev-03"]},
+    ])
+    assert resolver.resolve("services/billing/invoice.go") == "billing"
+    assert resolver.resolve("./services/billing/api/routes.go") == "billing-api"
+    assert resolver.resolve("pkg/search/api/index.go") == "search"
+    assert resolver.resolve("services/auth/token.go") == "auth"
+    assert resolver.get_owners("billing") == ["dev-02"]
+    assert resolver.get_owners(None) == []
+
+
+def test_resolver_is_cached_per_version():
+    """The database is consulted once per refresh window and unchanged patterns keep the resolver"""
+    docs = [{"module_name": "billing", "path_patterns": ["billing/"], "owners": ["dev-02"]}]
+    reset_module_resolver()
+    try:
+        with patch("src.utils.module_resolver.get_module_path_patterns", return_value=docs) as loader:
+            first = get_module_resolver()
+            assert get_module_resolver() is first
+            assert loader.call_count == 1
+        assert first.resolve("billing/x.py") == "billing"
+    finally:
+        reset_module_resolver()
+
+
+def test_call_sites_share_resolver():
+    """Assignment and code analysis resolve modules the same way"""
+    path = "src/user/profile.py"
+    assert extract_module_from_path(path, use_database=False) == "user"
+    with patch("src.utils.code_analyzer.get_module_resolver", return_value=ModuleResolver([("**/user", "user")])):
+        assert analyze_file_path(path)["module"] == "user"
@@ -0,0 +1,123 @@
+"""Tests for ownership ingestion and the ownership index"""
+
+import subprocess
+
+from src.utils.ownership_index import OwnershipIndex, build_ownership_index
+from src.utils.ownership_ingest import (
+    CodeownersRule,
+    GitOwnershipAccumulator,
+    OwnershipEntries,
+    build_ownership_entries,
+    iter_git_log,
+    parse_codeowners,
+    to_ownership_documents,
+)
+
+
+def test_parse_codeowners_keeps_prefix_rules():
+    """Prefix-shaped patterns are kept and extension globs skipped"""
+    rules = parse_codeowners([
+        "# Global owners",
+        "*       @lead",
+        "/src/auth/   @hassan sara@example.com",
+        "docs/**  @writer  # docs",
+        "*.js    @frontend",
+        "/src/payments  @ali",
+        "/setup.py  @lead",
+        "**/fixtures/  @qa",
+        "",
+    ])
+    assert rules == [
+        CodeownersRule("", ["@lead"]),
+        CodeownersRule("src/auth/", ["@hassan", "sara@example.com"]),
+        CodeownersRule("docs/", ["@writer"]),
+        CodeownersRule("src/payments/", ["@ali"]),
+        CodeownersRule("setup.py", ["@lead"]),
+        CodeownersRule("fixtures/", ["@qa"], anchored=False),
+    ]
+
+    # A directory pattern without a trailing slash owns the files below it
+    entries = build_ownership_entries(rules[3:5], None, {"ali": "dev-01", "lead": "dev-01"})
+    index = build_ownership_index(to_ownership_documents(entries))
+    assert index.owner_weights("src/payments/charge.py") == {"dev-01": 1.0}
+    assert index.owner_weights("setup.py") == {"dev-01": 1.0}
+
+
+def test_build_entries_combines_codeowners_and_history():
+    """CODEOWNERS and commit shares are averaged per prefix"""
+    accumulator = GitOwnershipAccumulator(max_depth=2)
+    for _ in range(3):
+        accumulator.add_commit("hassan@example.com", ["src/auth/login.py", "src/auth/token.py"])
+    accumulator.add_commit("sara@example.com", ["src/auth/session.py"])
+
+    identity_map = {"hassan@example.com": "dev-01", "sara@example.com": "dev-02", "hassan": "dev-01"}
+    entries = build_ownership_entries([CodeownersRule("src/auth/", ["@hassan"])], accumulator, identity_map)
+    assert entries.prefixes["src/auth/"] == {"dev-01": 0.75, "dev-02": 0.25}
+    assert entries.rules == [("src/auth/", True, {"dev-01": 1.0})]
+
+    index = build_ownership_index(to_ownership_documents(entries))
+    assert index.owner_weights("src/auth/login.py") == {"dev-01": 0.875, "dev-02": 0.125}
+    assert index.owner_weights("src/cart.py") == {"dev-01": 0.75, "dev-02": 0.25}
+
+
+def test_codeowners_last_matching_rule_wins():
+    """Later rules override earlier ones, and unanchored rules match at any depth"""
+    rules = parse_codeowners([
+        "/src/  @core",
+        "docs/  @writer",
+        "*  @lead",
+        "/src/auth/  @security",
+        "/docs/  @editor",
+        "/src/  @platform",
+    ])
+    index = build_ownership_index(to_ownership_documents(build_ownership_entries(rules, None, {})))
+
+    assert index.owner_weights("src/cart.py") == {"platform": 1.0}
+    assert index.owner_weights("src/auth/login.py") == {"platform": 1.0}
+    assert index.owner_weights("README.md") == {"lead": 1.0}
+    assert index.owner_weights("docs/index.md") == {"editor": 1.0}
+    assert index.owner_weights("a/docs/x.md") == {"lead": 1.0}
+
+    rules = parse_codeowners(["*  @lead", "docs/  @writer", "/src/auth/  @security"])
+    index = build_ownership_index(to_ownership_documents(build_ownership_entries(rules, None, {})))
+    assert index.owner_weights("a/docs/x.md") == {"writer": 1.0}
+    assert index.owner_weight("pkg/docs/api/x.md", "writer") == 1.0
+    assert index.owner_weights("adocs/x.md") == {"lead": 1.0}
+    assert index.owner_weights("src/auth/login.py") == {"security": 1.0}
+
+
+def test_ownership_index_longest_prefix_lookup():
+    """Lookups use the deepest indexed directory and fall back to the root rule"""
+    documents = to_ownership_documents(OwnershipEntries({
+        "": {"lead": 1.0},
+        "src/": {"dev-01": 0.75, "dev-02": 0.25},
+        "src/auth/": {"dev-02": 1.0},
+    }, []))
+    index = build_ownership_index(documents)
+
+    assert index.owner_weight("src/auth/login.py", "dev-02") == 1.0
+    assert index.owner_weight("src/auth/login.py", "dev-01") == 0.0
+    assert index.owner_weights("src\\payments\\charge.py") == {"dev-01": 0.75, "dev-02": 0.25}
+    assert index.owner_weights("README.md") == {"lead": 1.0}
+    assert OwnershipIndex([]).owner_weight("src/a.py", "dev-01") == 0.0
+
+
+def test_iter_git_log_streams_commits(tmp_path):
+    """Commits are read from git log with their author and changed files"""
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=T", "-c", "user.email=t@example.com", "-C", str(tmp_path), *args],
+            check=True, capture_output=True
+        )
+
+    git("init", "-q")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.py").write_text("a = 1\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "first")
+    (tmp_path / "src" / "b.py").write_text("b = 1\n")
+    git("add", ".")
+    git("commit", "-q", "-m", "second")
+
+    commits = list(iter_git_log(str(tmp_path)))
+    assert commits == [("t@example.com", ["src/b.py"]), ("t@example.com", ["src/a.py"])]
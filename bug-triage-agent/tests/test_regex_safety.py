@@ -0,0 +1,78 @@
+"""Tests for ReDoS-safe pattern compilation and the per-bug scan budget"""
+
+import time
+
+import pytest
+
+from src.engines import classification
+from src.engines.classification import classification_cache, classify_bug
+from src.engines.rule_packs import RuleSetManager
+from src.utils.regex_safety import UnsafePatternError, bound_wildcards, compile_guarded, lint_pattern
+from src.utils.text_scanner import ScanBudget, ScanBudgetExceeded, count_matches
+
+
+def test_lint_flags_catastrophic_patterns():
+    """Nested quantifiers, overlapping repeated alternatives and backreferences are rejected"""
+    assert "nested unbounded quantifier" in lint_pattern(r"(\w+\s?)+$")
+    assert "unbounded repeat of overlapping alternatives" in lint_pattern(r"(a|ab)*c")
+    assert "backreference" in lint_pattern(r"(x)\1")
+    assert lint_pattern(r"a.*b.*c.*d") == ["3 unbounded repeats (at most 2 allowed)"]
+    assert lint_pattern(r"cross.?site.*scripting") == []
+    assert lint_pattern(r"(?:foo|bar)+") == []
+    with pytest.raises(UnsafePatternError):
+        compile_guarded(r"(a+)+b")
+
+
+def test_wildcards_are_bounded_outside_classes():
+    """Only unescaped wildcards outside character classes are rewritten"""
+    assert bound_wildcards(r"sql.*injection", 100) == r"sql.{0,100}injection"
+    assert bound_wildcards(r"a.+?b", 100) == r"a.{1,100}?b"
+    assert bound_wildcards(r"[.*]x\.*y", 100) == r"[.*]x\.*y"
+    assert compile_guarded(r"sql.*injection").search("SQL query allows injection")
+
+
+def test_chained_wildcards_share_the_gap_bound():
+    """Several gaps in one pattern together span at most the bound"""
+    assert bound_wildcards(r"setting.*not.*found", 256) == r"setting.{0,128}not.{0,128}found"
+    assert bound_wildcards(r"a.{0,100}b.+c", 256) == r"a.{0,100}b.{1,156}c"
+    assert lint_pattern(r"a.{0,200}b.{0,200}c") == ["wildcard gaps span 400 characters (at most 256 allowed)"]
+
+    text = "setting not " * (200_000 // 12)
+    pattern = compile_guarded(r"setting.*not.*found")
+    started = time.perf_counter()
+    assert count_matches(pattern, text) == 0
+    assert time.perf_counter() - started < 1.0
+
+
+def test_unsafe_rule_set_is_rejected(monkeypatch):
+    """A stored rule set with a catastrophic pattern never becomes active"""
+    manager = RuleSetManager(refresh_seconds=3600)
+    document = {"version": 5, "packs": {"shared": {"categories": {"Security": [r"(a+)+$"]}, "types": {}}}}
+    monkeypatch.setattr("src.engines.rule_packs.get_newer_rule_set", lambda version: document)
+
+    assert not manager.refresh()
+    assert manager.active.version == 0
+    assert "nested unbounded quantifier" in manager.status()["last_error"]
+
+
+def test_budget_stops_windowed_scan():
+    """An expired budget aborts a scan before its next window"""
+    budget = ScanBudget(0)
+    time.sleep(0.001)
+    with pytest.raises(ScanBudgetExceeded):
+        count_matches("x", "x" * 10, budget=budget)
+
+
+def test_adversarial_bug_is_bounded(monkeypatch):
+    """A crafted description cannot stall classification"""
+    bug = {"bug_id": "BUG-1", "title": "sql", "description": "sql " * 60000}
+    started = time.perf_counter()
+    result = classify_bug(bug)
+    assert time.perf_counter() - started < 5
+
+    monkeypatch.setattr(classification, "CLASSIFICATION_TIME_BUDGET_MS", -1)
+    classification_cache.clear()
+    result = classify_bug(bug)
+    assert result["tier"] == "budget_exceeded"
+    assert result["category"] == "Logic Error"
+    assert result["type"] == "Logic Error Issue"
@@ -0,0 +1,52 @@
+"""Tests for the LRU + TTL result cache and classification memoization"""
+
+from src.engines.classification import classification_cache, classify_bug
+from src.engines.rule_packs import LANGUAGE_RULE_PACKS, RuleSet, builtin_rule_packs, rule_set_manager
+from src.utils.metrics import metrics_collector
+from src.utils.result_cache import TTLCache
+
+
+def test_lru_eviction_by_count_and_bytes():
+    """The least recently used entry goes first, whichever cap is hit"""
+    cache = TTLCache(max_entries=2, max_bytes=100, ttl_seconds=60)
+    cache.put("a", 1, 10)
+    cache.put("b", 2, 10)
+    assert cache.get("a") == 1
+    cache.put("c", 3, 10)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.put("d", 4, 95)
+    assert len(cache) == 1 and cache.get("d") == 4
+    cache.put("e", 5, 500)
+    assert cache.get("e") is None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 3 and stats["bytes"] == 95
+    assert stats["hits"] == 4 and stats["misses"] == 2
+
+
+def test_entries_expire():
+    """Entries past their time to live are misses"""
+    cache = TTLCache(max_entries=10, max_bytes=1000, ttl_seconds=0)
+    cache.put("a", 1, 10)
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1 and len(cache) == 0
+
+
+def test_classification_is_memoized_by_content():
+    """Whitespace-only differences hit the cache; a new rule set version misses"""
+    classification_cache.clear()
+    bug = {"bug_id": "BUG-1", "title": "Login fails", "description": "Unauthorized  after\n\nSQL injection attempt"}
+    first = classify_bug(bug)
+    again = classify_bug({**bug, "bug_id": "BUG-2", "description": "Unauthorized after\nSQL injection   attempt "})
+    assert again == first
+    assert classification_cache.stats()["hits"] == 1
+
+    previous = rule_set_manager._active
+    rule_set_manager._active = RuleSet(7, builtin_rule_packs(), LANGUAGE_RULE_PACKS)
+    try:
+        assert classify_bug(bug)["category"] == first["category"]
+    finally:
+        rule_set_manager._active = previous
+    stats = metrics_collector.snapshot()["caches"]["classification"]
+    assert stats["misses"] == 2 and stats["entries"] == 2
@@ -0,0 +1,81 @@
+"""Tests for language-partitioned classification rule packs"""
+
+from src.engines.rule_packs import (
+    CATEGORY_PATTERNS,
+    LANGUAGE_RULE_PACKS,
+    SHARED_CATEGORY_PATTERNS,
+    RuleSetManager,
+    builtin_rule_packs,
+    get_rule_pack,
+    resolve_rule_pack_name,
+)
+from src.engines.classification import classify_category, score_categories
+
+
+def test_pack_resolution():
+    """Languages map to their runtime's pack; unknown languages scan everything"""
+    assert resolve_rule_pack_name("Java") == "jvm"
+    assert resolve_rule_pack_name("kotlin") == "jvm"
+    assert resolve_rule_pack_name("typescript") == "javascript"
+    assert resolve_rule_pack_name("go") == "shared"
+    assert resolve_rule_pack_name(None) == "all"
+    assert get_rule_pack("java") is get_rule_pack("scala")
+
+
+def test_packs_only_hold_matching_patterns():
+    """A Python pack never scans for JVM-only exceptions"""
+    python = {pattern.pattern for pattern in get_rule_pack("python").category_patterns["Runtime Error"]}
+    java = {pattern.pattern for pattern in get_rule_pack("java").category_patterns["Runtime Error"]}
+    assert "AttributeError" in python and "ArrayIndexOutOfBounds" not in python
+    assert "ArrayIndexOutOfBounds" in java and "AttributeError" not in java
+    assert "RuntimeException" in python and "RuntimeException" in java
+    assert [pattern.pattern for pattern in get_rule_pack("go").category_patterns["Runtime Error"]] == [
+        "RuntimeException", "TypeError", "is not defined"
+    ]
+    assert list(get_rule_pack("go").category_patterns) == list(SHARED_CATEGORY_PATTERNS)
+
+
+def test_all_pack_matches_previous_rules():
+    """Without a language every pattern is scanned, once"""
+    runtime = CATEGORY_PATTERNS["Runtime Error"]
+    assert len(runtime) == len(set(runtime)) == 11
+    text = "typeerror: x is not defined, nullpointerexception, keyerror"
+    assert score_categories(text)["Runtime Error"] == 4
+    assert score_categories(text, "python")["Runtime Error"] == 3
+    assert score_categories(text, "java")["Runtime Error"] == 3
+    assert classify_category("keyerror in handler", language="go") == "Logic Error"
+
+
+def test_languages_without_a_pack_keep_shared_runtime_patterns():
+    """Go, Ruby, Rust, PHP and C# bugs still match the language-neutral runtime patterns"""
+    for language in ("go", "ruby", "rust", "php", "csharp"):
+        assert classify_category("RuntimeException thrown in handler", language=language) == "Runtime Error"
+
+
+def test_refresh_swaps_in_newer_rule_set(monkeypatch):
+    """A stored version is compiled and swapped in; readers keep their old reference"""
+    manager = RuleSetManager(refresh_seconds=3600)
+    old = manager.active
+    packs = builtin_rule_packs()
+    packs["go"] = {"categories": {"Runtime Error": [r"nil pointer dereference"]}, "types": {}}
+    document = {"version": 3, "packs": packs, "languages": {**LANGUAGE_RULE_PACKS, "go": "go"}}
+    monkeypatch.setattr("src.engines.rule_packs.get_newer_rule_set", lambda version: document)
+
+    assert manager.refresh()
+    assert manager.active.version == 3
+    assert manager.active.resolve_pack_name("go") == "go"
+    assert score_categories("nil pointer dereference", rule_pack=manager.active.pack_for("go"))["Runtime Error"] == 1
+    assert old.resolve_pack_name("go") == "shared"
+    status = manager.status()
+    assert status["version"] == 3 and status["source"] == "database" and "go" in status["packs"]
+
+
+def test_invalid_rule_set_keeps_active(monkeypatch):
+    """A pattern that fails to compile leaves the active rule set in place"""
+    manager = RuleSetManager(refresh_seconds=3600)
+    document = {"version": 4, "packs": {"shared": {"categories": {"Security": ["(unclosed"]}, "types": {}}}}
+    monkeypatch.setattr("src.engines.rule_packs.get_newer_rule_set", lambda version: document)
+
+    assert not manager.refresh()
+    assert manager.active.version == 0
+    assert manager.status()["last_error"].startswith("Rule set failed to compile")
@@ -0,0 +1,94 @@
+"""Tests for similar resolved bug retrieval"""
+
+from unittest.mock import patch
+
+import numpy as np
+
+from src.engines.fix_suggestion import suggest_fix
+from src.engines.similar_bugs import (
+    SimilarBug,
+    build_similar_bug_index,
+    embed_bugs,
+    find_similar_bugs_batch,
+    load_similar_bug_index,
+    quantize,
+    similar_resolver_weights,
+)
+
+HISTORY = [
+    ("H-1", {"title": "Checkout crashes with NullPointerException", "description": "cart total is null on checkout"}, "dev-01"),
+    ("H-2", {"title": "Report export query slow", "description": "export latency grows with rows"}, "dev-02"),
+    ("H-3", {"title": "Login token rejected", "description": "oauth token expired unauthorized"}, "dev-03"),
+    ("H-4", {"title": "Navbar layout broken on mobile", "description": "logo overlaps menu"}, None),
+]
+
+
+def build_index(directory, n_lists=None):
+    codes, scales = quantize(embed_bugs([bug for _, bug, _ in HISTORY]))
+    build_similar_bug_index(
+        directory, codes, scales,
+        [bug_id for bug_id, _, _ in HISTORY], [member for _, _, member in HISTORY],
+        n_lists=n_lists
+    )
+    return load_similar_bug_index(directory)
+
+
+def test_embeddings_are_unit_vectors_close_for_similar_text():
+    """Near-duplicate reports embed close together; empty text is a zero row"""
+    vectors = embed_bugs([
+        {"title": "Checkout crashes with NullPointerException", "description": "cart total is null"},
+        {"title": "Checkout crashes with NullPointerException", "description": "cart total is null at checkout"},
+        {"title": "Navbar layout broken on mobile"},
+        {"title": ""},
+    ])
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0)
+    assert not vectors[3].any()
+    assert vectors[0] @ vectors[1] > 0.8 > vectors[0] @ vectors[2]
+
+
+def test_quantized_search_finds_nearest_resolved_bug(tmp_path):
+    """Brute-force and inverted-list indexes return the matching bug first"""
+    for n_lists in (1, 2):
+        index = build_index(tmp_path / str(n_lists), n_lists)
+        assert index.vectors.dtype == np.int8 and index.vectors.filename is not None
+        query = embed_bugs([{"title": "Report export query is slow", "description": "latency grows"}])
+        row, similarity = index.search(query, 2, nprobe=n_lists)[0][0]
+        assert str(index.bug_ids[row]) == "H-2" and index.resolved_by(row) == "dev-02"
+        assert similarity > 0.5
+
+
+def test_rebuild_publishes_a_new_array_directory(tmp_path):
+    """A loader keeps reading the build named in meta.json while a newer one is written"""
+    first = build_index(tmp_path)
+    codes, scales = quantize(embed_bugs([bug for _, bug, _ in HISTORY[:2]]))
+    build_similar_bug_index(tmp_path, codes, scales, ["N-1", "N-2"], ["dev-09", None])
+    assert [str(bug_id) for bug_id in first.bug_ids] == [bug_id for bug_id, _, _ in HISTORY]
+
+    second = load_similar_bug_index(tmp_path)
+    assert second.version != first.version
+    assert sorted(str(bug_id) for bug_id in second.bug_ids) == ["N-1", "N-2"]
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_dir()) == [first.version, second.version]
+
+
+def test_batch_search_attaches_known_fixes(tmp_path):
+    """Neighbours above the threshold carry resolver and resolution"""
+    index = build_index(tmp_path)
+    with patch("src.engines.similar_bugs.get_similar_bug_index", return_value=index), \
+            patch("src.engines.similar_bugs.get_bug_resolutions", return_value={"H-1": "Default the cart total to zero."}) as resolutions:
+        similar = find_similar_bugs_batch([HISTORY[0][1], {"title": "unrelated words entirely"}], min_similarity=0.9)
+    assert resolutions.call_count == 1
+    assert similar[0][0] == SimilarBug("H-1", similar[0][0].similarity, "dev-01", "Default the cart total to zero.")
+    assert similar[1] == []
+
+    fix = suggest_fix(HISTORY[0][1], {"category": "Runtime Error", "type": "NullPointerException"}, None, similar[0])
+    assert fix["approach"].startswith("Similar resolved bug H-1 (100% match) was fixed by: Default the cart total to zero. ")
+
+
+def test_resolver_weights_share_similarity():
+    """Each resolver gets its similarity-weighted share of the neighbours"""
+    weights = similar_resolver_weights([
+        SimilarBug("H-1", 0.9, "dev-01"), SimilarBug("H-2", 0.6, "dev-02"), SimilarBug("H-3", 0.5, None)
+    ])
+    assert weights == {"dev-01": 0.9 / 2.0, "dev-02": 0.6 / 2.0}
+    assert similar_resolver_weights([]) == {}
+    assert find_similar_bugs_batch([]) == []
@@ -0,0 +1,185 @@
+"""Tests for stack trace parsing and frame-to-module attribution"""
+
+import numpy as np
+
+from src.utils.module_resolver import build_module_resolver, get_module_resolver
+from src.utils.stack_trace_parser import (
+    compress_repeated_frames,
+    frame_path,
+    get_module_votes,
+    parse_stack_trace,
+    stack_fingerprint,
+)
+from src.engines.assignment import calculate_assignment_score, extract_bug_module
+from src.engines.batch_assignment import build_score_matrix
+
+
+JAVA_TRACE = """java.lang.NullPointerException: token was null
+\tat com.acme.auth.TokenService.validate(TokenService.java:42)
+\tat com.acme.api.LoginController.login(LoginController.java:17)
+\tat sun.reflect.NativeMethodAccessorImpl.invoke0(Native Method)"""
+
+PYTHON_TRACE = """Traceback (most recent call last):
+  File "/srv/app/payment/charge.py", line 88, in charge
+    gateway.submit(order)
+  File "/srv/app/db/session.py", line 12, in submit
+KeyError: 'amount'"""
+
+JS_TRACE = """TypeError: Cannot read properties of undefined (reading 'id')
+    at renderProfile (webpack:///src/ui/Profile.tsx:31:12)
+    at /srv/app/user/loader.js:9:3"""
+
+GO_TRACE = """panic: runtime error: invalid memory address
+goroutine 1 [running]:
+main.handler(0x0)
+\t/go/src/github.com/acme/api/handler.go:55 +0x1d"""
+
+DOTNET_TRACE = """System.NullReferenceException: Object reference not set
+   at Acme.Payment.Gateway.Charge(Order order) in C:\\src\\Payment\\Gateway.cs:line 27
+   at Acme.Auth.Session.Refresh()"""
+
+
+def test_parses_each_language():
+    """Frames are recognised for every supported runtime"""
+    java = parse_stack_trace(JAVA_TRACE)
+    assert [frame.language for frame in java] == ["java", "java", "java"]
+    assert java[0].symbol == "com.acme.auth.TokenService.validate"
+    assert java[0].file == "TokenService.java" and java[0].line == 42
+    assert java[2].line is None
+
+    python = parse_stack_trace(PYTHON_TRACE)
+    assert [(frame.file, frame.line, frame.symbol) for frame in python] == [
+        ("/srv/app/payment/charge.py", 88, "charge"),
+        ("/srv/app/db/session.py", 12, "submit"),
+    ]
+
+    js = parse_stack_trace(JS_TRACE)
+    assert [frame.language for frame in js] == ["javascript", "javascript"]
+    assert js[0].symbol == "renderProfile" and js[0].line == 31
+    assert js[1].symbol is None and js[1].file == "/srv/app/user/loader.js"
+
+    go = parse_stack_trace(GO_TRACE)
+    assert [(frame.language, frame.line) for frame in go] == [("go", 55)]
+
+    dotnet = parse_stack_trace(DOTNET_TRACE)
+    assert [frame.language for frame in dotnet] == ["dotnet", "dotnet"]
+    assert dotnet[0].file == "C:\\src\\Payment\\Gateway.cs" and dotnet[0].line == 27
+    assert dotnet[1].file is None
+
+
+def test_frame_paths_use_packages_and_strip_urls():
+    """Java packages become directories and URL prefixes are dropped"""
+    java = parse_stack_trace(JAVA_TRACE)
+    assert frame_path(java[0]) == "com/acme/auth/TokenService"
+    assert frame_path(parse_stack_trace(JS_TRACE)[0]) == "src/ui/Profile.tsx"
+    assert frame_path(parse_stack_trace(DOTNET_TRACE)[1]) == "Acme/Auth/Session"
+
+
+def test_votes_favour_top_frames():
+    """Frames near the top of the trace carry the most weight"""
+    resolver = get_module_resolver(use_database=False)
+    votes = get_module_votes(JAVA_TRACE, resolver)
+    assert list(votes) == ["auth", "api"]
+    assert abs(sum(votes.values()) - 1.0) < 1e-9
+    assert votes["auth"] == 2 * votes["api"]
+
+    # Python tracebacks end with the innermost frame
+    assert list(get_module_votes(PYTHON_TRACE, resolver)) == ["database", "payment"]
+    assert get_module_votes("no frames here", resolver) == {}
+    assert get_module_votes(None, resolver) == {}
+
+
+def test_python_votes_favour_the_crashing_module():
+    """The module that raised wins over the modules that called it"""
+    trace = """Traceback (most recent call last):
+  File "/srv/app/api/routes.py", line 20, in create_order
+    return checkout(order)
+  File "/srv/app/api/handlers.py", line 41, in checkout
+    charge(order)
+  File "/srv/app/payment/charge.py", line 88, in charge
+    raise ValueError("amount")
+ValueError: amount"""
+    votes = get_module_votes(trace, get_module_resolver(use_database=False))
+    assert list(votes) == ["payment", "api"]
+    assert votes["payment"] > 0.5
+    assert extract_bug_module({"stack_trace": trace}, use_database=False) == "payment"
+
+
+def test_votes_follow_resolver_version():
+    """Cached votes are keyed by resolver version"""
+    default = get_module_resolver(use_database=False)
+    custom = build_module_resolver([
+        {"module_name": "identity", "path_patterns": ["com/acme/auth/"], "owners": []},
+    ])
+    assert next(iter(get_module_votes(JAVA_TRACE, default))) == "auth"
+    assert next(iter(get_module_votes(JAVA_TRACE, custom))) == "identity"
+
+
+def test_stack_trace_module_used_without_file_path():
+    """Assignment falls back to the stack trace when there is no file path"""
+    bug = {"title": "NPE", "description": "crash", "stack_trace": JAVA_TRACE}
+    assert extract_bug_module(bug, use_database=False) == "auth"
+
+    bug["code_context"] = {"file_path": "src/payment/refund.py"}
+    assert extract_bug_module(bug, use_database=False) == "payment"
+
+    profiles = [
+        {"member_id": "dev-1", "name": "A", "skills": {"languages": []}, "modules_owned": ["auth"]},
+        {"member_id": "dev-2", "name": "B", "skills": {"languages": []}, "modules_owned": ["api"]},
+    ]
+    trace_only = {"title": "NPE", "description": "crash", "stack_trace": JAVA_TRACE}
+    scalar = [
+        calculate_assignment_score(trace_only, profile, None, "auth", False) for profile in profiles
+    ]
+    matrix = build_score_matrix([trace_only], profiles, db_available=False)
+    assert scalar[0] > scalar[1]
+    np.testing.assert_array_equal(matrix[0], np.array(scalar))
+
+
+def test_compresses_repeated_frames():
+    """A frame repeated thousands of times collapses to one line"""
+    trace = "java.lang.StackOverflowError\n" + "\tat com.acme.auth.Tree.walk(Tree.java:10)\n" * 5000 + "\tat com.acme.auth.Main.run(Main.java:3)"
+    compressed = compress_repeated_frames(trace)
+    assert compressed.splitlines() == [
+        "java.lang.StackOverflowError",
+        "\tat com.acme.auth.Tree.walk(Tree.java:10) × 5000",
+        "\tat com.acme.auth.Main.run(Main.java:3)",
+    ]
+    frames = parse_stack_trace(compressed)
+    assert [frame.line for frame in frames] == [10, 3]
+
+
+def test_compresses_frame_cycles():
+    """Cycles such as Python frames with their source line collapse once"""
+    cycle = '  File "/srv/app/user/tree.py", line 5, in walk\n    return walk(node.parent)\n'
+    trace = "Traceback (most recent call last):\n" + cycle * 996 + "RecursionError: maximum recursion depth exceeded"
+    compressed = compress_repeated_frames(trace)
+    assert compressed.splitlines() == [
+        "Traceback (most recent call last):",
+        '  File "/srv/app/user/tree.py", line 5, in walk',
+        "    return walk(node.parent)",
+        "  [previous 2 lines × 996]",
+        "RecursionError: maximum recursion depth exceeded",
+    ]
+
+
+def test_short_repeats_are_kept():
+    """Traces without long runs are returned unchanged"""
+    assert compress_repeated_frames(JAVA_TRACE) is JAVA_TRACE
+    assert compress_repeated_frames("a\na\nb") == "a\na\nb"
+    assert compress_repeated_frames(None) is None
+
+
+def test_fingerprint_ignores_line_numbers_paths_and_library_frames():
+    """The same crash in another build or deployment keeps its fingerprint"""
+    fingerprint = stack_fingerprint(JAVA_TRACE)
+    assert len(fingerprint) == 16
+    assert stack_fingerprint(JAVA_TRACE.replace(":42)", ":57)").replace("invoke0", "invoke1")) == fingerprint
+    assert stack_fingerprint(JAVA_TRACE.replace("NullPointerException", "IllegalStateException")) != fingerprint
+    assert stack_fingerprint(JAVA_TRACE.replace("validate", "refresh")) != fingerprint
+
+    moved = PYTHON_TRACE.replace("/srv/app/", "/opt/releases/42/app/").replace("line 88", "line 90")
+    assert stack_fingerprint(moved) == stack_fingerprint(PYTHON_TRACE)
+    lambda_trace = "java.lang.IllegalStateException\n\tat com.acme.jobs.Runner.lambda$run$0(Runner.java:12)"
+    assert stack_fingerprint(lambda_trace) == stack_fingerprint(lambda_trace.replace("$0", "$3"))
+    assert stack_fingerprint("no frames here") is None
@@ -0,0 +1,88 @@
+"""Tests for field byte budgets and windowed pattern scanning"""
+
+import re
+
+from src.utils.text_scanner import apply_byte_budget, count_matches
+from src.handlers.triage_handler import process_triage_request
+
+
+def test_budget_keeps_head_and_tail():
+    """Oversized text keeps both ends and reports the removed bytes"""
+    text = "HEAD" + "x" * 10000 + "TAIL"
+    budgeted, omitted = apply_byte_budget(text, 1000)
+    assert budgeted.startswith("HEAD") and budgeted.endswith("TAIL")
+    assert omitted == len(text) - 1000
+    assert "[9008 bytes truncated]" in budgeted
+
+    assert apply_byte_budget("short", 1000) == ("short", 0)
+    assert apply_byte_budget(None, 1000) == (None, 0)
+    assert apply_byte_budget(text, 0) == (text, 0)
+
+
+def test_budget_never_splits_characters():
+    """Multi-byte characters cut at the boundaries are dropped, not mangled"""
+    budgeted, omitted = apply_byte_budget("é" * 2000, 1001)
+    assert omitted > 0
+    budgeted.encode("utf-8")
+    assert set(budgeted.replace(f"\n... [{omitted} bytes truncated] ...\n", "")) == {"é"}
+
+
+def test_windowed_count_matches_findall():
+    """Windowed counts equal a whole-text scan, including matches across window boundaries"""
+    text = ("request timed out; " * 37 + "SQL query injection\n") * 50
+    for pattern in [r"timeout|timed out", r"SQL.*injection", r"request timed", r"q"]:
+        expected = len(re.findall(pattern, text, re.IGNORECASE))
+        assert count_matches(pattern, text, window=97, overlap=64) == expected
+        assert count_matches(pattern, text) == expected
+
+
+def test_truncation_reported_as_warning(monkeypatch):
+    """Truncated fields show up in the response warnings"""
+    monkeypatch.setattr("src.handlers.triage_handler.MAX_LOGS_BYTES", 64)
+    monkeypatch.setattr("src.handlers.triage_handler.save_triage_history", lambda *args, **kwargs: None)
+    request = {
+        "message_id": "msg-budget",
+        "sender": "supervisor",
+        "recipient": "bug_triage_agent",
+        "type": "task_assignment",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "task": {
+            "bugs": [{
+                "bug_id": "BUG-1",
+                "title": "Timeout on login",
+                "description": "Login request times out",
+                "logs": "ERROR timeout\n" * 100,
+            }],
+            "team_profiles": [{"member_id": "dev-1", "name": "Dev", "skills": {"languages": ["Python"]}}],
+        },
+    }
+    response = process_triage_request(request)
+    assert response["status"] == "completed"
+    assert any("BUG-1: logs exceeded 64 bytes" in warning for warning in response["warnings"])
+
+
+def test_repeated_frames_compressed_before_budget(monkeypatch):
+    """A deep recursion that fits once its frames are collapsed is not truncated"""
+    monkeypatch.setattr("src.handlers.triage_handler.MAX_STACK_TRACE_BYTES", 1024)
+    monkeypatch.setattr("src.handlers.triage_handler.save_triage_history", lambda *args, **kwargs: None)
+    frame = '  File "/srv/app/parser/tree.py", line 12, in walk\n    return walk(node.child)\n'
+    request = {
+        "message_id": "msg-recursion",
+        "sender": "supervisor",
+        "recipient": "bug_triage_agent",
+        "type": "task_assignment",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "task": {
+            "bugs": [{
+                "bug_id": "BUG-2",
+                "title": "Parser crashes on nested input",
+                "description": "RecursionError while walking the tree",
+                "stack_trace": "Traceback (most recent call last):\n" + frame * 500
+                + "RecursionError: maximum recursion depth exceeded",
+            }],
+            "team_profiles": [{"member_id": "dev-1", "name": "Dev", "skills": {"languages": ["Python"]}}],
+        },
+    }
+    response = process_triage_request(request)
+    assert response["status"] == "completed"
+    assert not any("stack_trace exceeded" in warning for warning in response["warnings"])
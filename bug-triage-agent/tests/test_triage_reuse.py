@@ -0,0 +1,133 @@
+"""Tests for Bloom-filtered reuse of stored triage results"""
+
+from types import SimpleNamespace
+
+from src.engines.crash_groups import crash_group_index
+from src.engines.triage_reuse import bug_content_hash, rules_version, triage_reuse_index
+from src.handlers.triage_handler import process_triage_request
+from src.utils.bloom_filter import BloomFilter
+
+
+TRACE = """java.lang.IllegalStateException: session pool exhausted
+\tat com.acme.auth.SessionPool.acquire(SessionPool.java:88)
+\tat com.acme.auth.LoginService.login(LoginService.java:31)"""
+
+
+def make_request(description="Login request times out", bug_id="BUG-7", stack_trace=None):
+    return {
+        "message_id": "msg-reuse",
+        "sender": "supervisor",
+        "recipient": "bug_triage_agent",
+        "type": "task_assignment",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "task": {
+            "bugs": [{"bug_id": bug_id, "title": "Timeout on login", "description": description, "stack_trace": stack_trace}],
+            "team_profiles": [{"member_id": "dev-1", "name": "Dev", "skills": {"languages": ["Python"]}}],
+        },
+    }
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Every added key is found; absent keys are rarely reported present"""
+    bloom = BloomFilter(1000, 0.01)
+    for i in range(1000):
+        bloom.add(f"bug-{i}")
+    assert all(f"bug-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_content_hash_ignores_bug_id():
+    """Only bug content is hashed"""
+    bug = {"bug_id": "A", "title": "t", "logs": None}
+    assert bug_content_hash(bug) == bug_content_hash({**bug, "bug_id": "B"})
+    assert bug_content_hash(bug) != bug_content_hash({**bug, "title": "u"})
+
+
+def fake_history(monkeypatch):
+    """Serve stored results from an in-memory triage history and count classifications"""
+    history = []
+
+    def save(bug, *args, **kwargs):
+        history.append({"bug_id": bug["bug_id"], **kwargs})
+        return True
+
+    def find(bug_id, content_hash, versions, max_age_hours):
+        for doc in reversed(history):
+            if (doc["bug_id"], doc["content_hash"], doc["versions"]) == (bug_id, content_hash, versions):
+                return doc["raw_output"]
+        return None
+
+    classified = []
+    monkeypatch.setattr("src.handlers.triage_handler.save_triage_history", save)
+    monkeypatch.setattr(
+        "src.handlers.triage_handler.classify_bug",
+        lambda bug, code_context, prediction=None: classified.append(bug["bug_id"]) or {
+            "category": "Performance", "type": "Timeout", "root_cause": None, "confidence": 0.5, "tier": "summary"
+        }
+    )
+    monkeypatch.setattr("src.engines.triage_reuse.iter_triage_keys", lambda: iter(()))
+    monkeypatch.setattr("src.engines.triage_reuse.find_reusable_triage", find)
+    # A duplicate indexed by another test would have its assignment copied instead
+    monkeypatch.setattr("src.handlers.triage_handler.DUPLICATE_DETECTION_ENABLED", False)
+    triage_reuse_index.reset()
+    return history, classified
+
+
+def test_unchanged_retriage_reuses_stored_result(monkeypatch):
+    """A repeat retriage returns the stored result without running engines or writing history"""
+    history, classified = fake_history(monkeypatch)
+
+    first = process_triage_request(make_request())
+    second = process_triage_request(make_request())
+    assert second["results"] == first["results"]
+    assert len(history) == 1 and classified == ["BUG-7"]
+
+    process_triage_request(make_request("Login request times out after 30s"))
+    assert len(history) == 2 and len(classified) == 2
+    stats = triage_reuse_index.stats()
+    assert stats["reused"] == 1 and stats["filter_negatives"] == 2
+    triage_reuse_index.reset()
+
+
+def test_reused_result_recounts_its_crash(monkeypatch):
+    """A reused result still counts its crash and reports the current group and priority"""
+    history, classified = fake_history(monkeypatch)
+    monkeypatch.setattr("src.engines.crash_groups.iter_crash_fingerprints", lambda since: iter(()))
+    monkeypatch.setattr("src.engines.crash_groups.bulk_record_crash_occurrences", lambda docs: len(docs))
+    monkeypatch.setattr("src.engines.priority.CRASH_ESCALATION_OCCURRENCES", [2])
+    crash_group_index.reset()
+
+    first = process_triage_request(make_request(stack_trace=TRACE))["results"]["triage"][0]
+    process_triage_request(make_request("Login fails for SSO users", "BUG-8", TRACE))
+    reused = process_triage_request(make_request(stack_trace=TRACE))["results"]["triage"][0]
+
+    assert len(history) == 2 and classified == ["BUG-7", "BUG-8"]
+    assert reused["classification"] == first["classification"] and reused["assignment"] == first["assignment"]
+    assert first["crash_group"]["occurrences"] == 1
+    assert reused["crash_group"]["occurrences"] == 3 and reused["crash_group"]["previous_bug_id"] == "BUG-8"
+    assert reused["priority"] != first["priority"]
+    crash_group_index.reset()
+    triage_reuse_index.reset()
+
+
+def test_rules_version_tracks_learned_artifacts(monkeypatch):
+    """A retrained or rebuilt artifact invalidates stored results"""
+    artifacts = {
+        "src.engines.triage_reuse.get_bug_model": "model-1",
+        "src.engines.triage_reuse.get_similar_bug_index": "index-1",
+        "src.engines.triage_reuse.get_expertise_matrix": "matrix-1",
+    }
+    for target, version in artifacts.items():
+        monkeypatch.setattr(target, lambda version=version: SimpleNamespace(version=version))
+    before = rules_version([])
+    for target in artifacts:
+        assert rules_version([]) == before
+        monkeypatch.setattr(target, lambda: SimpleNamespace(version="rebuilt"))
+        after = rules_version([])
+        assert after != before
+        before = after
+
+    # Newly fetched resolution times move the effort watermark
+    monkeypatch.setattr("src.engines.triage_reuse.effort_index", SimpleNamespace(version="2026-01-05T00:00:00"))
+    assert rules_version([]) != before